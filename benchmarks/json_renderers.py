@@ -0,0 +1,176 @@
+"""
+Benchmark DRF's stock JSON renderer/parser against the orjson-based ones.
+
+Payloads are built from our real serializers: a ``LargeResultsPagination``
+page of ``UserAccountSerializer`` rows, plus raw rows carrying datetimes,
+UUIDs and Decimals. Every renderer's output is checked byte for byte against
+the stock renderer before it is timed.
+
+Usage:
+    uv run python benchmarks/json_renderers.py --rows 500
+"""
+
+import argparse
+import decimal
+import os
+import sys
+import timeit
+import uuid
+from datetime import UTC, datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework import serializers  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from common.pagination import PaginationSerializer  # noqa: E402
+from common.parsers import ORJSONParser  # noqa: E402
+from common.renderers import (  # noqa: E402
+    CamelCaseORJSONRenderer,
+    ORJSONRenderer,
+    camelize,
+)
+from users.models import UserAccount  # noqa: E402
+from users.serializers import UserAccountSerializer  # noqa: E402
+
+
+class PlainUserAccountSerializer(serializers.ModelSerializer):
+    """``UserAccountSerializer`` without ``CamelSnakeMixin``."""
+
+    class Meta:
+        model = UserAccount
+        fields = UserAccountSerializer.Meta.fields
+
+
+def users(rows):
+    return [
+        UserAccount(
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"user{i}@example.com",
+            is_superuser=i % 50 == 0,
+        )
+        for i in range(rows)
+    ]
+
+
+def user_page(results):
+    rows = len(results)
+    return PaginationSerializer(
+        {
+            "count": rows * 20,
+            "page": 2,
+            "page_size": rows,
+            "total_pages": 20,
+            "total_items": rows * 20,
+            "has_next": True,
+            "has_previous": True,
+            "next": "https://api.example.com/api/v1/users/?page=3&limit=500",
+            "previous": "https://api.example.com/api/v1/users/?page=1&limit=500",
+            "results": results,
+        }
+    ).data
+
+
+def raw_rows(rows):
+    now = datetime(2025, 11, 24, 11, 59, 0, 123456, tzinfo=UTC)
+    return {
+        "results": [
+            {
+                "id": uuid.UUID(int=i),
+                "created_at": now - timedelta(minutes=i),
+                "balance": decimal.Decimal("1234.5") + i,
+                "email": f"user{i}@example.com",
+                "is_active": bool(i % 2),
+                "tags": ["alpha", "beta"],
+            }
+            for i in range(rows)
+        ]
+    }
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e3:>10.3f} ms")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    stock, fast, camel = JSONRenderer(), ORJSONRenderer(), CamelCaseORJSONRenderer()
+    instances = users(args.rows)
+    payloads = {
+        "user page": user_page(UserAccountSerializer(instances, many=True).data),
+        "raw rows": raw_rows(args.rows),
+    }
+    for name, data in payloads.items():
+        expected = stock.render(data)
+        assert fast.render(data) == expected, f"{name}: output differs"
+        assert camel.render(data) == stock.render(camelize(data)), name
+        print(f"render {name} ({args.rows} rows, {len(expected):,} bytes)")
+        base = bench("JSONRenderer", lambda d=data: stock.render(d), args.number)
+        for label, renderer in (
+            ("ORJSONRenderer", fast),
+            ("CamelCaseORJSONRenderer", camel),
+        ):
+            seconds = bench(label, lambda d=data, r=renderer: r.render(d), args.number)
+            print(f"  {'':<28}{base / seconds:>10.1f}x")
+
+        print(f"parse {name}")
+        base = bench(
+            "JSONParser",
+            lambda b=expected: JSONParser().parse(BytesIO(b)),
+            args.number,
+        )
+        seconds = bench(
+            "ORJSONParser",
+            lambda b=expected: ORJSONParser().parse(BytesIO(b)),
+            args.number,
+        )
+        print(f"  {'':<28}{base / seconds:>10.1f}x")
+
+    # Camel-casing in the renderer replaces CamelSnakeMixin on the serializer,
+    # so compare serialize + render end to end.
+    print(f"serialize + render user page ({args.rows} rows)")
+    mixin_output = stock.render(
+        user_page(UserAccountSerializer(instances, many=True).data)
+    )
+    assert (
+        camel.render(user_page(PlainUserAccountSerializer(instances, many=True).data))
+        == mixin_output
+    ), "camel-cased output differs"
+    base = bench(
+        "CamelSnakeMixin + JSON",
+        lambda: stock.render(
+            user_page(UserAccountSerializer(instances, many=True).data)
+        ),
+        args.number,
+    )
+    for label, serializer_class, renderer in (
+        ("CamelSnakeMixin + ORJSON", UserAccountSerializer, fast),
+        ("CamelCaseORJSONRenderer", PlainUserAccountSerializer, camel),
+    ):
+        seconds = bench(
+            label,
+            lambda s=serializer_class, r=renderer: r.render(
+                user_page(s(instances, many=True).data)
+            ),
+            args.number,
+        )
+        print(f"  {'':<28}{base / seconds:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark the per-request cost of the middleware skipped for API routes.
+
+Compares the full middleware stack (what ``MIDDLEWARE`` used to apply to
+every request) with the lean ``api/`` scope of ``SCOPED_MIDDLEWARE``:
+
+- chains only: each chain around a no-op view, so only middleware is timed
+- end to end: a Django test client request to a cheap API endpoint, through
+  the whole handler, with ``MIDDLEWARE`` flat vs scoped
+
+Usage:
+    uv run python benchmarks/middleware.py --number 2000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.test import Client, RequestFactory, override_settings  # noqa: E402
+
+from common.middleware import MiddlewareChain  # noqa: E402
+
+API_PATH = "/api/v1/auth/.well-known/jwks.json"
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e6:>10.1f} us")
+    return seconds
+
+
+def run_chain(chain, request):
+    response = chain.handler(request)
+    for process_view in chain.view_middleware:
+        process_view(request, None, (), {})
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    full = settings.SCOPED_MIDDLEWARE[""]
+    lean = settings.SCOPED_MIDDLEWARE["api/"]
+    factory = RequestFactory()
+
+    def view(request):
+        return HttpResponse(b"{}", content_type="application/json")
+
+    print(f"chains only ({len(full)} vs {len(lean)} middleware)")
+    base = 0.0
+    for label, paths in (("full stack", full), ("api/ scope", lean)):
+        chain = MiddlewareChain(paths, view)
+        seconds = bench(
+            label,
+            lambda c=chain: run_chain(c, factory.get(API_PATH)),
+            args.number,
+        )
+        if base:
+            print(f"  {'saved per request':<28}{(base - seconds) * 1e6:>10.1f} us")
+        base = base or seconds
+
+    global_middleware = [
+        path
+        for path in settings.MIDDLEWARE
+        if path != "common.middleware.ScopedMiddleware"
+    ]
+    print(f"end to end (GET {API_PATH})")
+    clients = {}
+    for label, middleware in (
+        ("flat MIDDLEWARE", global_middleware + full),
+        ("ScopedMiddleware", settings.MIDDLEWARE),
+    ):
+        # The handler loads MIDDLEWARE on its first request and keeps it
+        with override_settings(MIDDLEWARE=middleware):
+            clients[label] = Client()
+            assert clients[label].get(API_PATH).status_code == 200
+    # Alternate between the two, so drift over the run affects both alike
+    timings = {label: [] for label in clients}
+    for _ in range(5):
+        for label, client in clients.items():
+            timings[label].append(
+                timeit.timeit(lambda c=client: c.get(API_PATH), number=args.number)
+            )
+    base = 0.0
+    for label, runs in timings.items():
+        seconds = min(runs) / args.number
+        print(f"  {label:<28}{seconds * 1e6:>10.1f} us")
+        if base:
+            print(f"  {'saved per request':<28}{(base - seconds) * 1e6:>10.1f} us")
+        base = base or seconds
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark random UUIDv4 against time-ordered UUIDv7 primary keys.
+
+Creates one table per key type shaped like a ``TimeStampModel`` subclass,
+bulk loads it in batches through ``COPY`` and reports insert throughput,
+primary-key index size and how well ``id`` order matches ``created_at``
+order. Batches are timed individually, so the slowdown of random keys as the
+index outgrows memory is visible in the per-batch output.
+
+Usage:
+    uv run python benchmarks/uuid_primary_keys.py --rows 20000000
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from common.utils import uuid7  # noqa: E402
+
+GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+def create_table(cursor, table):
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(
+        f"""
+        CREATE TABLE {table} (
+            id uuid PRIMARY KEY,
+            created_at timestamptz NOT NULL,
+            updated_at timestamptz NOT NULL,
+            email varchar(255) NOT NULL
+        )
+        """
+    )
+
+
+def load(cursor, table, generate, rows, batch_size, report_every):
+    inserted = 0
+    started = time.perf_counter()
+    window_started = started
+    while inserted < rows:
+        count = min(batch_size, rows - inserted)
+        buffer = io.StringIO()
+        for i in range(inserted, inserted + count):
+            now = datetime.now(UTC).isoformat()
+            buffer.write(f"{generate()}\t{now}\t{now}\tuser{i}@example.com\n")
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {table} (id, created_at, updated_at, email) FROM STDIN", buffer
+        )
+        connection.commit()
+        inserted += count
+        if inserted % report_every < batch_size:
+            elapsed = time.perf_counter() - window_started
+            window_started = time.perf_counter()
+            print(
+                f"  {inserted:>12,} rows  "
+                f"{report_every / elapsed if elapsed else 0:>12,.0f} rows/s (window)"
+            )
+    return time.perf_counter() - started
+
+
+def report(cursor, table):
+    cursor.execute(f"ANALYZE {table}")
+    cursor.execute(
+        "SELECT pg_relation_size(%s), pg_relation_size(%s)",
+        [f"{table}_pkey", table],
+    )
+    index_size, table_size = cursor.fetchone()
+    cursor.execute(
+        "SELECT correlation FROM pg_stats WHERE tablename = %s AND attname = 'id'",
+        [table],
+    )
+    row = cursor.fetchone()
+    return index_size, table_size, row[0] if row else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the benchmark tables afterwards."
+    )
+    args = parser.parse_args()
+
+    connection.ensure_connection()
+    connection.set_autocommit(False)
+    results = {}
+    with connection.connection.cursor() as cursor:
+        for name, generate in GENERATORS.items():
+            table = f"bench_pk_{name}"
+            print(f"{name}: loading {args.rows:,} rows into {table}")
+            create_table(cursor, table)
+            connection.commit()
+            elapsed = load(
+                cursor, table, generate, args.rows, args.batch_size, args.report_every
+            )
+            results[name] = (elapsed, *report(cursor, table))
+            connection.commit()
+            if not args.keep:
+                cursor.execute(f"DROP TABLE {table}")
+                connection.commit()
+
+    print()
+    print(f"{'key':<8}{'rows/s':>14}{'pk index MB':>14}{'table MB':>12}{'corr':>8}")
+    for name, (elapsed, index_size, table_size, correlation) in results.items():
+        print(
+            f"{name:<8}{args.rows / elapsed:>14,.0f}"
+            f"{index_size / 2**20:>14,.1f}{table_size / 2**20:>12,.1f}"
+            f"{correlation if correlation is not None else float('nan'):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
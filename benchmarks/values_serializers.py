@@ -0,0 +1,104 @@
+"""
+Benchmark ``ValuesSerializer`` against a ``CamelSnakeMixin`` ``ModelSerializer``.
+
+Inserts ``--rows`` users inside a transaction that is rolled back afterwards,
+serializes them with both serializers, checks that the rendered JSON is
+byte-identical and reports time and peak memory per row.
+
+Usage:
+    uv run python benchmarks/values_serializers.py --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+
+from common.mixin import CamelSnakeMixin  # noqa: E402
+from common.renderers import ORJSONRenderer  # noqa: E402
+from users.models import UserAccount  # noqa: E402
+from users.serializers import UserAccountSerializer  # noqa: E402
+
+
+class ModelUserAccountSerializer(CamelSnakeMixin, serializers.ModelSerializer):
+    """``UserAccountSerializer`` as a plain ``ModelSerializer``."""
+
+    class Meta:
+        model = UserAccount
+        fields = UserAccountSerializer.Meta.fields
+
+
+class Rollback(Exception):
+    pass
+
+
+def measure(serializer_class, queryset):
+    tracemalloc.start()
+    started = time.perf_counter()
+    data = serializer_class(queryset.all(), many=True).data
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return data, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    renderer = ORJSONRenderer()
+    try:
+        with transaction.atomic():
+            UserAccount.objects.bulk_create(
+                UserAccount(
+                    email=f"bench{i}@example.com",
+                    username=f"bench{i}",
+                    first_name=f"First{i}",
+                    last_name=f"Last{i}",
+                    is_superuser=i % 50 == 0,
+                    password="!",
+                )
+                for i in range(args.rows)
+            )
+            queryset = UserAccount.objects.filter(email__startswith="bench").order_by(
+                "email"
+            )
+
+            results = {}
+            for label, serializer_class in (
+                ("ModelSerializer", ModelUserAccountSerializer),
+                ("ValuesSerializer", UserAccountSerializer),
+            ):
+                measure(serializer_class, queryset)  # warm up
+                results[label] = measure(serializer_class, queryset)
+
+            expected = renderer.render(results["ModelSerializer"][0])
+            assert renderer.render(results["ValuesSerializer"][0]) == expected
+
+            print(f"{args.rows:,} rows, {len(expected):,} bytes of JSON")
+            print(f"{'serializer':<20}{'us/row':>10}{'peak KB':>12}")
+            for label, (_, elapsed, peak) in results.items():
+                print(
+                    f"{label:<20}{elapsed / args.rows * 1e6:>10.2f}"
+                    f"{peak / 1024:>12,.0f}"
+                )
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
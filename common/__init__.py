@@ -1,5 +1,13 @@
-from .models import TimeStampModel
-
 __all__ = [
     "TimeStampModel",
 ]
+
+
+def __getattr__(name):
+    # Lazy, so modules like common.logging can be imported before the app
+    # registry is ready (e.g. from LOGGING, which Django configures first)
+    if name == "TimeStampModel":
+        from .models import TimeStampModel
+
+        return TimeStampModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
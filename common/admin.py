@@ -0,0 +1,240 @@
+import base64
+import json
+import pickle
+from collections import namedtuple
+
+from django.contrib import admin, messages
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+
+from common.models import OutboxMessage
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for large tables that avoids ``COUNT(*)`` over the whole table.
+
+    - Unfiltered querysets use the planner's row estimate from ``pg_class``.
+    - Filtered querysets are counted exactly up to ``exact_count_limit`` rows
+      (``COUNT(*)`` over a ``LIMIT`` subquery). Beyond that the ``EXPLAIN``
+      row estimate is used.
+    """
+
+    exact_count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return len(queryset)
+
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return queryset.count()
+
+        if not queryset.query.where:
+            estimate = self._table_estimate(queryset, connection)
+            if estimate > self.exact_count_limit:
+                return estimate
+
+        count = queryset.order_by().values("pk")[: self.exact_count_limit + 1].count()
+        if count <= self.exact_count_limit:
+            return count
+        return max(count, self._plan_estimate(queryset))
+
+    @staticmethod
+    def _table_estimate(queryset, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for tables that were never vacuumed or analyzed
+        return row[0] if row else -1
+
+    @staticmethod
+    def _plan_estimate(queryset):
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class LargeTableAdminMixin:
+    """
+    ``ModelAdmin`` mixin for changelists over tables with millions of rows.
+
+    Uses ``EstimatedCountPaginator`` and skips the extra unfiltered count
+    Django runs to show "N results (M total)" while searching or filtering.
+    Pair it with trigram indexes on the ``search_fields`` (see ``users``
+    migrations) so ``icontains`` searches do not scan the table.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+# An admin action setting ``values`` on the selected rows matching ``filter``
+BulkUpdate = namedtuple(
+    "BulkUpdate", ["description", "values", "filter"], defaults=(None,)
+)
+
+
+def update_in_chunks(queryset, values, chunk_size=1000, progress=None):
+    """
+    ``queryset.update(**values)`` in primary key order, ``chunk_size`` rows
+    per transaction, so rows are locked briefly and only a chunk of primary
+    keys is held in memory. ``auto_now`` fields are set like ``save()``
+    would. Calls ``progress(updated)`` after each chunk.
+    """
+    model = queryset.model
+    queryset = queryset.order_by("pk")
+    auto_now = [
+        field.name
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+    ]
+    updated = 0
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return updated
+        now = dict.fromkeys(auto_now, timezone.now())
+        with transaction.atomic(using=queryset.db):
+            updated += (
+                model._default_manager.using(queryset.db)
+                .filter(pk__in=pks)
+                .update(**{**now, **values})
+            )
+        last_pk = pks[-1]
+        if progress is not None:
+            progress(updated)
+
+
+_query_signer = signing.Signer(salt="common.admin.bulk_update")
+
+
+def dumps_query(queryset):
+    """``queryset.query``, signed, for a task to rebuild the queryset from."""
+    return _query_signer.sign(base64.b64encode(pickle.dumps(queryset.query)).decode())
+
+
+def loads_query(model, data):
+    queryset = model._default_manager.all()
+    queryset.query = pickle.loads(base64.b64decode(_query_signer.unsign(data)))
+    return queryset
+
+
+class BulkUpdateActionsMixin:
+    """
+    ``ModelAdmin`` mixin adding an action per ``bulk_updates`` entry::
+
+        bulk_updates = {
+            "activate": BulkUpdate("Activate selected users", {"is_active": True}),
+        }
+
+    Updates run through ``update_in_chunks``, also with "select all" across
+    pages, without loading the rows. Selections over
+    ``bulk_update_sync_limit`` rows are handed to the ``run_bulk_update``
+    Celery task, which reports its progress in the task result.
+    """
+
+    bulk_updates = {}
+    bulk_update_chunk_size = 1000
+    bulk_update_sync_limit = 5000
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if self.bulk_updates and self.has_change_permission(request):
+            for name, update in self.bulk_updates.items():
+                actions[name] = (
+                    self._bulk_update_action(name),
+                    name,
+                    update.description,
+                )
+        return actions
+
+    def _bulk_update_action(self, name):
+        def action(model_admin, request, queryset):
+            return model_admin.run_bulk_update(request, queryset, name)
+
+        action.__name__ = name
+        return action
+
+    def run_bulk_update(self, request, queryset, name):
+        update = self.bulk_updates[name]
+        if update.filter is not None:
+            queryset = queryset.filter(update.filter)
+        # Only counted up to the limit, which is all that is needed here
+        selected = queryset.order_by().values("pk")[: self.bulk_update_sync_limit + 1]
+        if selected.count() <= self.bulk_update_sync_limit:
+            updated = update_in_chunks(
+                queryset, update.values, self.bulk_update_chunk_size
+            )
+            self.message_user(
+                request,
+                f"{update.description}: {updated} updated.",
+                messages.SUCCESS,
+            )
+            return
+
+        from common.tasks import run_bulk_update
+
+        result = run_bulk_update.delay(
+            self.model._meta.label,
+            name,
+            dumps_query(queryset),
+            self.bulk_update_chunk_size,
+        )
+        url = reverse("admin:django_celery_results_taskresult_changelist")
+        self.message_user(
+            request,
+            format_html(
+                "{}: more than {} rows, running in the background as "
+                '<a href="{}?task_id={}">task {}</a>.',
+                update.description,
+                self.bulk_update_sync_limit,
+                url,
+                result.id,
+                result.id,
+            ),
+            messages.INFO,
+        )
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Pending and failed outbox messages (see ``common.outbox``)."""
+
+    list_display = [
+        "id",
+        "task",
+        "ordering_key",
+        "created_at",
+        "available_at",
+        "attempts",
+        "failed_at",
+    ]
+    list_filter = [("failed_at", admin.EmptyFieldListFilter), "task"]
+    search_fields = ["ordering_key", "correlation_id"]
+    readonly_fields = [
+        "created_at",
+        "correlation_id",
+        "attempts",
+        "last_error",
+        "failed_at",
+    ]
+    actions = ["retry"]
+
+    @admin.action(description="Retry selected messages now")
+    def retry(self, request, queryset):
+        updated = queryset.update(
+            attempts=0, failed_at=None, last_error="", available_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} message(s) queued for retry.")
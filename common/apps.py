@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "common"
+
+    def ready(self):
+        from django.core import checks
+
+        from common.middleware import check_admin_scope
+
+        checks.register(check_admin_scope, checks.Tags.admin)
@@ -0,0 +1,215 @@
+"""
+Response compression.
+
+``CompressionMiddleware`` compresses text-like responses (JSON, HTML, YAML,
+...) with the encoding the client gives the highest q-value, ties going to
+brotli, then zstd (when ``zstandard`` is installed), then gzip. Unlike
+Django's ``GZipMiddleware``:
+
+- streaming responses are compressed chunk by chunk, each chunk flushed so
+  the client still receives them as they are produced
+- bodies under ``COMPRESSION_MIN_SIZE`` bytes are sent as they are, since
+  the encoding overhead outweighs the savings
+- responses setting any of ``COMPRESSION_EXCLUDE_COOKIES`` (the auth
+  cookies set by sign-in and token refresh, the session and CSRF cookies)
+  are never compressed: their bodies carry the same secrets, which
+  compression would expose to BREACH-style length attacks
+
+Responses that already have a ``Content-Encoding`` (e.g. the precomputed
+schema of ``common.schema`` and WhiteNoise's compressed static files), or
+that are partial (``Content-Range``), are left alone.
+"""
+
+import re
+import zlib
+
+import brotli
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Chosen for dynamic content: most of the size reduction at a fraction of
+# the CPU of the maximum levels
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 6
+
+
+class BrotliEncoder:
+    @staticmethod
+    def compress(data):
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def chunk(self, data):
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class ZstdEncoder:
+    @staticmethod
+    def compress(data):
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+    def __init__(self):
+        self.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def chunk(self, data):
+        return self.compressor.compress(data) + self.compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class GzipEncoder:
+    @staticmethod
+    def compress(data):
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def __init__(self):
+        self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+# Preferred first
+ENCODERS = {"br": BrotliEncoder}
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+ENCODERS["gzip"] = GzipEncoder
+
+COMPRESSIBLE_TYPES = re.compile(
+    r"^(text/|application/(json|javascript|xml|yaml|x-yaml|vnd\.oai\.openapi)"
+    r"|[^;]*\+(json|xml)\b)"
+)
+
+
+def accepted_encodings(request):
+    """``Accept-Encoding`` as ``{coding: q-value}``, ``q=0`` meaning refused."""
+    accepted = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = "1"
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                quality = value.strip()
+        try:
+            accepted[coding] = min(max(float(quality), 0.0), 1.0)
+        except ValueError:
+            continue
+    return accepted
+
+
+def negotiate(request, encodings):
+    """
+    The one of ``encodings`` the client prefers (highest q-value, ties going
+    to the order of ``encodings``), or None. Codings the client names take
+    precedence over ``*``, so ``br;q=0, *`` never picks brotli.
+    """
+    accepted = accepted_encodings(request)
+    default = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, default)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_sequence(encoder, sequence):
+    for data in sequence:
+        if data:
+            yield encoder.chunk(data)
+    yield encoder.finish()
+
+
+async def compress_async_sequence(encoder, sequence):
+    async for data in sequence:
+        if data:
+            yield encoder.chunk(data)
+    yield encoder.finish()
+
+
+class CompressionMiddleware:
+    """Compresses responses; see the module docstring."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 860)
+        self.exclude_cookies = set(
+            getattr(
+                settings,
+                "COMPRESSION_EXCLUDE_COOKIES",
+                [settings.SESSION_COOKIE_NAME, settings.CSRF_COOKIE_NAME],
+            )
+        )
+
+    def __call__(self, request):
+        return self.process_response(request, self.get_response(request))
+
+    def should_compress(self, response):
+        if response.has_header("Content-Encoding") or response.has_header(
+            "Content-Range"
+        ):
+            return False
+        if not COMPRESSIBLE_TYPES.match(response.get("Content-Type", "")):
+            return False
+        if not response.streaming and len(response.content) < self.min_size:
+            return False
+        # Secrets in both cookies and body, see BREACH
+        return not self.exclude_cookies.intersection(response.cookies)
+
+    def process_response(self, request, response):
+        if not self.should_compress(response):
+            return response
+        # The response depends on Accept-Encoding from here on, compressed
+        # or not
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request, ENCODERS)
+        if encoding is None:
+            return response
+        encoder = ENCODERS[encoding]
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_sequence(
+                    encoder(), response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_sequence(
+                    encoder(), response.streaming_content
+                )
+            # The compressed length is unknown
+            del response.headers["Content-Length"]
+        else:
+            compressed = encoder.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The body is no longer byte for byte what a strong ETag promises
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,73 @@
+import hashlib
+from functools import wraps
+
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+
+def updated_at_etag(instance, *extra):
+    """
+    Build a cheap validator from an instance's primary key and ``updated_at``.
+
+    ``extra`` lets a view mix in anything else the payload depends on, e.g. the
+    serializer class, so a change in representation also changes the ETag.
+    """
+    value = ":".join(
+        str(part) for part in (instance.pk, instance.updated_at.isoformat(), *extra)
+    )
+    return hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_get(etag_func=None, last_modified_func=None):
+    """
+    Decorator for ``APIView`` read handlers that answers conditional requests.
+
+    ``etag_func`` and ``last_modified_func`` are called as
+    ``func(view, request, *args, **kwargs)`` after authentication and
+    permission checks. They should be cheap (a loaded row's ``updated_at`` or
+    a single ``Max("updated_at")`` aggregate), because when the client's
+    ``If-None-Match``/``If-Modified-Since`` still matches, a ``304`` is returned
+    without calling the handler or running its serializer.
+
+    Responses are marked ``private, no-cache`` so browsers keep them but
+    always revalidate.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def inner(view, request, *args, **kwargs):
+            etag = None
+            if etag_func is not None:
+                etag = etag_func(view, request, *args, **kwargs)
+                if etag:
+                    # Weak, since compression may change the bytes on the wire
+                    etag = "W/" + quote_etag(etag).removeprefix("W/")
+
+            last_modified = None
+            if last_modified_func is not None:
+                modified_at = last_modified_func(view, request, *args, **kwargs)
+                if modified_at:
+                    last_modified = int(modified_at.timestamp())
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD") and 200 <= response.status_code < 400:
+                if etag and not response.has_header("ETag"):
+                    response.headers["ETag"] = etag
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                patch_cache_control(response, private=True, no_cache=True)
+                patch_vary_headers(response, ("Authorization", "Cookie"))
+            return response
+
+        return inner
+
+    return decorator
@@ -0,0 +1,100 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+# Bounding boxes (px) the derivatives are resized to fit in
+DERIVATIVE_SIZES = (64, 128, 256, 512)
+
+# Extension -> (Pillow format, save options)
+DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def derivative_name(name, size, extension):
+    """``avatars/me.png`` -> ``avatars/me_128.webp``, next to the original."""
+    root, _ = os.path.splitext(name)
+    return f"{root}_{size}.{extension}"
+
+
+def _flatten(image):
+    """Composite transparency onto white for formats without alpha."""
+    from PIL import Image
+
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def create_derivatives(field_file, sizes=DERIVATIVE_SIZES, formats=None):
+    """
+    Generate resized, compressed copies of an image and store them next to it.
+
+    Images are never upscaled: sizes larger than the original are skipped,
+    except the smallest one. Returns a list of dicts (``size``, ``width``,
+    ``height``, ``format`` and storage ``name``) suitable for a ``JSONField``.
+    """
+    # Pillow is only needed by the worker generating derivatives
+    from PIL import Image, ImageOps
+
+    formats = formats or DERIVATIVE_FORMATS
+    sizes = sorted(sizes)
+    with field_file.open("rb") as file:
+        image = Image.open(file)
+        # Let the JPEG decoder downscale while decoding instead of afterwards
+        image.draft("RGB", (sizes[-1], sizes[-1]))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    largest = max(image.size)
+    sizes = [size for size in sizes if size < largest] or sizes[:1]
+
+    derivatives = []
+    # Resize from the largest size down, each step from the previous result
+    source = image
+    for size in reversed(sizes):
+        resized = source.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        for extension, (image_format, options) in formats.items():
+            output = resized if image_format != "JPEG" else _flatten(resized)
+            buffer = BytesIO()
+            output.save(buffer, format=image_format, **options)
+            name = field_file.storage.save(
+                derivative_name(field_file.name, size, extension),
+                ContentFile(buffer.getvalue()),
+            )
+            derivatives.append(
+                {
+                    "size": size,
+                    "width": resized.width,
+                    "height": resized.height,
+                    "format": extension,
+                    "name": name,
+                }
+            )
+        source = resized
+    return sorted(derivatives, key=lambda item: (item["size"], item["format"]))
+
+
+def pick_derivative(derivatives, size=None, extension="webp"):
+    """
+    Return the smallest derivative in ``extension`` that covers ``size``.
+
+    Falls back to the largest one available, or ``None`` when there are no
+    derivatives in that format (yet).
+    """
+    candidates = [item for item in derivatives or () if item["format"] == extension]
+    if not candidates:
+        return None
+    if size is not None:
+        for item in candidates:
+            if item["size"] >= size:
+                return item
+    return candidates[-1]
@@ -0,0 +1,114 @@
+"""
+Standalone verifier for the API's JWTs.
+
+Needs only PyJWT and ``cryptography``, not Django, so sidecars, other
+services and edge proxies can check ``access`` tokens (the ``Authorization:
+JWT <token>`` header or the ``access`` cookie) locally instead of calling the
+API. Copy this file or import it from the project::
+
+    verifier = TokenVerifier(jwks_url="https://api.example.com/api/v1/auth/.well-known/jwks.json")
+    claims = verifier.verify(token)  # raises jwt.InvalidTokenError
+    user_id = claims["user_id"]
+
+The key set is fetched once and cached. A token signed with a key the cache
+does not know yet (a key rotation) triggers a refetch, at most one every 30
+seconds however many unknown key IDs are sent. Only asymmetric keys
+are accepted, and the algorithm comes from the key, never from the token.
+"""
+
+from http.cookies import CookieError, SimpleCookie
+
+import jwt
+
+ASYMMETRIC_KEY_TYPES = {"RSA", "EC", "OKP"}
+
+
+class TokenVerifier:
+    """
+    Verifies tokens against a JWKS, given as a URL or as a dict.
+
+    ``token_type`` is the expected ``token_type`` claim (``None`` skips the
+    check). It defaults to ``"access"``, so refresh tokens are not accepted
+    as credentials.
+    """
+
+    def __init__(
+        self,
+        jwks_url=None,
+        jwks=None,
+        token_type="access",
+        audience=None,
+        issuer=None,
+        leeway=0,
+        cache_lifespan=300,
+        timeout=5,
+    ):
+        if (jwks_url is None) == (jwks is None):
+            raise ValueError("Pass exactly one of jwks_url and jwks")
+        self.token_type = token_type
+        self.audience = audience
+        self.issuer = issuer
+        self.leeway = leeway
+        self.client = None
+        self.keys = {}
+        if jwks_url is not None:
+            self.client = jwt.PyJWKClient(
+                jwks_url, cache_keys=True, lifespan=cache_lifespan, timeout=timeout
+            )
+        else:
+            try:
+                keys = jwt.PyJWKSet.from_dict(jwks).keys
+            except jwt.PyJWKSetError:
+                # No usable keys (e.g. the API signs with HS256): every token
+                # is rejected as signed with an unknown key
+                keys = []
+            self.keys = {
+                key.key_id: key for key in keys if key.key_type in ASYMMETRIC_KEY_TYPES
+            }
+
+    def get_key(self, token):
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            raise jwt.InvalidTokenError("Token has no key ID")
+        if self.client is not None:
+            try:
+                key = self.client.get_signing_key(kid)
+            except (jwt.PyJWKClientError, jwt.PyJWKSetError) as e:
+                raise jwt.InvalidTokenError(str(e)) from e
+        else:
+            key = self.keys.get(kid)
+        if key is None or key.key_type not in ASYMMETRIC_KEY_TYPES:
+            raise jwt.InvalidTokenError("Unknown signing key")
+        return key
+
+    def verify(self, token, verify_signature=True):
+        """Return the claims of a valid token; raise ``jwt.InvalidTokenError``."""
+        if not verify_signature:
+            return jwt.decode(token, options={"verify_signature": False})
+
+        key = self.get_key(token)
+        claims = jwt.decode(
+            token,
+            key.key,
+            algorithms=[key.algorithm_name],
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={
+                "verify_aud": self.audience is not None,
+                "require": ["exp"],
+            },
+        )
+        if self.token_type is not None and claims.get("token_type") != self.token_type:
+            raise jwt.InvalidTokenError("Wrong token type")
+        return claims
+
+    def verify_cookie(self, cookie_header, name="access"):
+        """Verify the token in a raw ``Cookie`` header."""
+        try:
+            morsel = SimpleCookie(cookie_header).get(name)
+        except CookieError as e:
+            raise jwt.InvalidTokenError("Malformed cookie header") from e
+        if morsel is None:
+            raise jwt.InvalidTokenError(f"No {name} cookie")
+        return self.verify(morsel.value)
@@ -1,3 +1,233 @@
-from logging import getLogger
+"""
+Non-blocking, structured logging.
 
-logger = getLogger(__name__)
+- ``QueueHandler`` hands records to a background listener thread, which
+  writes them with the real handlers. When the queue is full, records are
+  dropped instead of blocking the caller. Drops are counted
+  (``dropped_records()``) and reported in the log once there is room again.
+- ``JSONFormatter`` writes one JSON object per line, including the
+  correlation ID of the request or Celery task that logged it.
+- ``CorrelationIdMiddleware`` takes the ID from ``X-Request-ID`` (or makes
+  one) and returns it in the response. Celery tasks inherit the ID of
+  whatever queued them (see ``config/extensions/celery.py``).
+- ``SamplingFilter`` keeps only a fraction of a noisy logger's records
+  below a given level.
+
+See ``LOGGING`` in ``config/settings/deploy.py``.
+"""
+
+import atexit
+import contextvars
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import threading
+import uuid
+from collections import Counter
+from datetime import UTC, datetime
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_correlation_id = contextvars.ContextVar("correlation_id", default=None)
+
+# Accepted incoming X-Request-ID values
+_CORRELATION_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# LogRecord attributes that are not "extra" fields
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "correlation_id",
+}
+
+_dropped = Counter()
+_dropped_lock = threading.Lock()
+
+
+def get_correlation_id():
+    return _correlation_id.get()
+
+
+def set_correlation_id(value):
+    """Set the current correlation ID; returns a token for ``reset_correlation_id``."""
+    return _correlation_id.set(value)
+
+
+def reset_correlation_id(token):
+    _correlation_id.reset(token)
+
+
+def new_correlation_id():
+    return uuid.uuid4().hex
+
+
+def dropped_records():
+    """Records dropped because the log queue was full, by logger name."""
+    with _dropped_lock:
+        return dict(_dropped)
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    ``QueueHandler`` that never blocks and survives ``fork()``.
+
+    Configure it through ``dictConfig`` with ``handlers`` (the handlers the
+    background thread writes to) and a bounded ``queue``, e.g.
+    ``{"()": "queue.Queue", "maxsize": 10000}``. The listener thread starts
+    with the first record logged in each process, so a gunicorn master that
+    forks after configuring logging hands every worker a working handler.
+
+    ``self.listener`` (built by ``dictConfig``) is only used for its
+    handlers: each process starts a ``QueueListener`` of its own on its own
+    queue, and stops it at exit.
+    """
+
+    def __init__(self, queue, *args, **kwargs):
+        super().__init__(queue, *args, **kwargs)
+        self._pid = None
+        self._process_listener = None
+        self._start_lock = threading.Lock()
+        self._unreported_drops = 0
+        os.register_at_fork(after_in_child=self._after_fork)
+        atexit.register(self._stop_listener)
+
+    def _after_fork(self):
+        # The parent's listener thread does not exist in the child, and its
+        # queue may hold records the parent will write itself
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._process_listener = None
+        self._unreported_drops = 0
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid() or self.listener is None:
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                listener = logging.handlers.QueueListener(
+                    self.queue,
+                    *self.listener.handlers,
+                    respect_handler_level=self.listener.respect_handler_level,
+                )
+                listener.start()
+                self._process_listener = listener
+                self._pid = os.getpid()
+
+    def _stop_listener(self):
+        """Write the queued records and stop this process's listener."""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                self._process_listener.stop()
+                self._process_listener = None
+                self._pid = None
+
+    def prepare(self, record):
+        # Runs in the logging thread: capture everything that depends on it
+        record = copy.copy(record)
+        record.correlation_id = get_correlation_id()
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._unreported_drops += 1
+            with _dropped_lock:
+                _dropped[record.name] += 1
+            return
+
+        if self._unreported_drops:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+            report = logging.makeLogRecord(
+                {
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"Dropped {dropped} log records, the log queue was full",
+                    "correlation_id": None,
+                    "dropped_records": dropped,
+                }
+            )
+            try:
+                self.queue.put_nowait(report)
+            except queue.Full:
+                self._unreported_drops += dropped
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record; ``extra={...}`` fields are included."""
+
+    def format(self, record):
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            # Set by QueueHandler when the record was logged; formatted
+            # in the logging thread otherwise
+            "correlation_id": getattr(record, "correlation_id", get_correlation_id()),
+            "process": record.process,
+            "thread": record.threadName,
+            "location": f"{record.module}:{record.funcName}:{record.lineno}",
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = record.stack_info
+        return orjson.dumps(data, default=str, option=orjson.OPT_UTC_Z).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a ``rate`` fraction of records below ``level``; keep the rest.
+
+    Attach it to a noisy logger (e.g. ``django.request``, which logs every
+    4xx as a warning) to cut volume without losing errors.
+    """
+
+    def __init__(self, rate=0.1, level="ERROR", name=""):
+        super().__init__(name)
+        self.rate = rate
+        self.level = logging._checkLevel(level)
+
+    def filter(self, record):
+        return record.levelno >= self.level or random.random() < self.rate
+
+
+class CorrelationIdMiddleware:
+    """Tag every log record of a request with its ``X-Request-ID``."""
+
+    header = "X-Request-ID"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        value = request.headers.get(self.header, "")
+        if not _CORRELATION_ID_RE.match(value):
+            value = new_correlation_id()
+        token = set_correlation_id(value)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_correlation_id(token)
+        response.headers[self.header] = value
+        return response
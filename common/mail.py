@@ -0,0 +1,209 @@
+"""
+Concurrent email sending on an event loop.
+
+Sending an email is mostly waiting on the SMTP server, so a prefork worker
+holds one process per email in flight. ``AsyncSMTPEmailBackend`` hands
+messages to a process-wide ``EmailSender`` instead: one asyncio event loop,
+in its own thread, sending through a bounded pool of SMTP connections
+(aiosmtplib). A Celery worker with a thread pool then keeps hundreds of
+sends in flight from a single process, over a few connections::
+
+    DJANGO_EMAIL_BACKEND=common.mail.AsyncSMTPEmailBackend \\
+        celery -A config.extensions worker -Q emails --pool=threads -c 200
+
+Tasks on such a worker should set ``ignore_result=True``: with the
+``django-db`` result backend, every thread storing a result holds a database
+connection of its own.
+
+Throughput and backpressure are set by:
+
+- ``EMAIL_ASYNC_MAX_CONNECTIONS``: SMTP connections, i.e. concurrent sends
+- ``EMAIL_ASYNC_MAX_IN_FLIGHT``: messages queued or being sent; callers
+  block beyond it, so a worker stops taking tasks the server can't keep up
+  with
+- ``EMAIL_ASYNC_RATE_LIMIT``: messages per second, 0 for no limit
+
+Callers still wait for their own messages, so tasks fail and retry as they
+would with Django's SMTP backend. ``manage.py smtp_sink`` runs a local SMTP
+server to try it against.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import aiosmtplib
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.message import sanitize_address
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPool:
+    """Up to ``max_connections`` SMTP connections, reused between messages."""
+
+    def __init__(self, max_connections, **options):
+        self.options = options
+        self.slots = asyncio.Semaphore(max_connections)
+        self.idle = deque()
+
+    async def connect(self):
+        options = dict(self.options)
+        username = options.pop("username", None)
+        password = options.pop("password", None)
+        smtp = aiosmtplib.SMTP(**options)
+        await smtp.connect()
+        if username and password:
+            await smtp.login(username, password)
+        return smtp
+
+    async def send(self, from_email, recipients, data):
+        async with self.slots:
+            smtp = self.idle.pop() if self.idle else None
+            try:
+                if smtp is None or not smtp.is_connected:
+                    smtp = await self.connect()
+                    await smtp.sendmail(from_email, recipients, data)
+                else:
+                    try:
+                        await smtp.sendmail(from_email, recipients, data)
+                    except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+                        # Idle connections get closed by the server, retry
+                        # once on a new one
+                        smtp.close()
+                        smtp = await self.connect()
+                        await smtp.sendmail(from_email, recipients, data)
+            except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused):
+                # The server refused this message only, and aiosmtplib reset
+                # the envelope: the connection can still be reused
+                self.idle.append(smtp)
+                raise
+            except BaseException:
+                if smtp is not None:
+                    smtp.close()
+                raise
+            self.idle.append(smtp)
+
+    async def close(self):
+        while self.idle:
+            smtp = self.idle.pop()
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+
+
+class EmailSender:
+    """An event loop thread sending Django ``EmailMessage``s concurrently."""
+
+    def __init__(
+        self, max_connections=10, max_in_flight=500, rate_limit=0, **smtp_options
+    ):
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.interval = 1 / rate_limit if rate_limit else 0
+        self.next_send_at = 0.0
+        self.loop = asyncio.new_event_loop()
+        self.pool = SMTPPool(max_connections, **smtp_options)
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="email-sender", daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, message):
+        """
+        Queue ``message`` for sending; returns a ``concurrent.futures.Future``.
+        Blocks while ``max_in_flight`` messages are pending.
+        """
+        # Built here rather than on the loop, it's CPU work
+        encoding = message.encoding or settings.DEFAULT_CHARSET
+        from_email = sanitize_address(message.from_email, encoding)
+        recipients = [sanitize_address(a, encoding) for a in message.recipients()]
+        data = message.message().as_bytes(linesep="\r\n")
+
+        self.in_flight.acquire()
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self.send(from_email, recipients, data), self.loop
+            )
+        except BaseException:
+            self.in_flight.release()
+            raise
+        future.add_done_callback(lambda _: self.in_flight.release())
+        return future
+
+    async def send(self, from_email, recipients, data):
+        if self.interval:
+            now = time.monotonic()
+            send_at = max(now, self.next_send_at)
+            self.next_send_at = send_at + self.interval
+            await asyncio.sleep(send_at - now)
+        await self.pool.send(from_email, recipients, data)
+
+    def close(self, timeout=10):
+        if not self.loop.is_running():
+            return
+        future = asyncio.run_coroutine_threadsafe(self.pool.close(), self.loop)
+        try:
+            future.result(timeout)
+        except Exception:
+            logger.exception("Could not close SMTP connections")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+
+_sender = None
+_sender_pid = None
+_sender_lock = threading.Lock()
+
+
+def get_sender():
+    """The process-wide ``EmailSender``, configured from settings."""
+    global _sender, _sender_pid
+    # A forked child doesn't inherit the loop thread, so it needs its own
+    if _sender is None or _sender_pid != os.getpid():
+        with _sender_lock:
+            if _sender is None or _sender_pid != os.getpid():
+                _sender = EmailSender(
+                    max_connections=getattr(
+                        settings, "EMAIL_ASYNC_MAX_CONNECTIONS", 10
+                    ),
+                    max_in_flight=getattr(settings, "EMAIL_ASYNC_MAX_IN_FLIGHT", 500),
+                    rate_limit=getattr(settings, "EMAIL_ASYNC_RATE_LIMIT", 0),
+                    hostname=settings.EMAIL_HOST,
+                    port=int(settings.EMAIL_PORT),
+                    username=settings.EMAIL_HOST_USER or None,
+                    password=settings.EMAIL_HOST_PASSWORD or None,
+                    use_tls=settings.EMAIL_USE_SSL,
+                    start_tls=settings.EMAIL_USE_TLS,
+                    timeout=settings.EMAIL_TIMEOUT or 60,
+                )
+                _sender_pid = os.getpid()
+                atexit.register(_sender.close)
+    return _sender
+
+
+class AsyncSMTPEmailBackend(BaseEmailBackend):
+    """
+    SMTP email backend sending through the process-wide ``EmailSender``.
+    ``send_messages()`` returns once its own messages are sent.
+    """
+
+    def send_messages(self, email_messages):
+        sender = get_sender()
+        futures = [
+            sender.submit(message) for message in email_messages if message.recipients()
+        ]
+        sent = 0
+        for future in futures:
+            try:
+                future.result()
+                sent += 1
+            except Exception:
+                if not self.fail_silently:
+                    raise
+        return sent
@@ -0,0 +1,61 @@
+import difflib
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from common.schema import generate_schema, render_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI schema served by api/v1/schema/ to "
+        "OPENAPI_SCHEMA_FILE, or check that the stored one matches the code."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the stored schema is missing or out of date.",
+        )
+        parser.add_argument(
+            "--file",
+            default=None,
+            help="Schema file (default: OPENAPI_SCHEMA_FILE).",
+        )
+
+    def handle(self, *args, check=False, file=None, **options):
+        path = file or settings.OPENAPI_SCHEMA_FILE
+        body = render_schema(generate_schema())
+
+        if check:
+            try:
+                with open(path, "rb") as f:
+                    stored = json.load(f)
+            except FileNotFoundError:
+                raise CommandError(
+                    f"{path} does not exist, run manage.py openapi_schema"
+                ) from None
+            generated = json.loads(body)
+            if stored != generated:
+                diff = difflib.unified_diff(
+                    json.dumps(stored, indent=2).splitlines(),
+                    json.dumps(generated, indent=2).splitlines(),
+                    "stored",
+                    "code",
+                    lineterm="",
+                )
+                self.stderr.write("\n".join(list(diff)[:100]))
+                raise CommandError(
+                    f"{path} is out of date, run manage.py openapi_schema"
+                )
+            self.stdout.write(f"{path} is up to date")
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(body)
+        os.replace(f"{path}.tmp", path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
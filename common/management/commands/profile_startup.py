@@ -0,0 +1,139 @@
+"""
+Profile process startup: wall time and import time per module.
+
+Each target is booted in a fresh interpreter with ``python -X importtime``:
+
+- ``web``: ``config.wsgi`` plus the URLconf, i.e. what a gunicorn worker
+  loads before serving its first request.
+- ``worker``: the Celery app with every task module imported.
+- ``manage``: ``django.setup()`` alone, the floor for management commands.
+
+The report lists the slowest top-level packages (cumulative), the slowest
+individual modules (self time) and, for the slowest packages, the import
+chain that first pulled them in.
+
+Usage:
+    uv run python manage.py profile_startup web worker --top 25
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.env import BASE_DIR
+
+TARGETS = {
+    "web": (
+        "import config.wsgi\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().reverse_dict\n"
+    ),
+    "worker": (
+        "import django\n"
+        "django.setup()\n"
+        "from config.extensions.celery import app\n"
+        "app.loader.import_default_modules()\n"
+    ),
+    "manage": "import django\ndjango.setup()\n",
+}
+
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def boot(code):
+    """Run ``code`` in a new interpreter; return (wall seconds, importtime rows)."""
+    # Same settings module as this process
+    env = dict(os.environ)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode:
+        raise CommandError(result.stderr)
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return elapsed, rows
+
+
+def importer_chain(rows, index):
+    """Modules that (transitively) imported ``rows[index]``, innermost first."""
+    # importtime prints children before their parent, one level less indented
+    chain, depth = [], rows[index][3]
+    for module, _, _, row_depth in rows[index + 1 :]:
+        if row_depth < depth:
+            chain.append(module)
+            depth = row_depth
+    return chain
+
+
+class Command(BaseCommand):
+    help = __doc__.strip().splitlines()[0]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="*",
+            default=["web", "worker"],
+            help=", ".join(TARGETS),
+        )
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Boots per target for the wall time."
+        )
+
+    def handle(self, *args, targets, top, repeat, **options):
+        for name in targets:
+            if name not in TARGETS:
+                raise CommandError(
+                    f"unknown target {name!r}, choose from {', '.join(TARGETS)}"
+                )
+
+        for name in targets:
+            runs = [boot(TARGETS[name]) for _ in range(repeat)]
+            self.report(name, runs, top)
+
+    def report(self, name, runs, top):
+        wall = [elapsed for elapsed, _ in runs]
+        rows = runs[-1][1]
+        imports = sum(self_us for _, self_us, _, _ in rows) / 1e3
+        self.stdout.write(
+            f"{name}: {statistics.median(wall) * 1e3:.0f} ms wall (median of "
+            f"{len(runs)}), {imports:.0f} ms in {len(rows)} imports"
+        )
+
+        packages = Counter()
+        first_seen = {}
+        for index, (module, self_us, _, _) in enumerate(rows):
+            package = module.split(".")[0]
+            packages[package] += self_us
+            first_seen.setdefault(package, index)
+
+        self.stdout.write(f"\n  {'package':<32}{'ms':>8}  first imported by")
+        for package, self_us in packages.most_common(top):
+            chain = importer_chain(rows, first_seen[package])
+            outside = [module for module in chain if module.split(".")[0] != package]
+            via = " <- ".join(outside[:3]) or "-"
+            self.stdout.write(f"  {package:<32}{self_us / 1e3:>8.1f}  {via}")
+
+        self.stdout.write(f"\n  {'module':<48}{'self ms':>9}{'cumul. ms':>11}")
+        slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+        for module, self_us, cumulative_us, _ in slowest:
+            self.stdout.write(
+                f"  {module:<48}{self_us / 1e3:>9.1f}{cumulative_us / 1e3:>11.1f}"
+            )
+        self.stdout.write("")
@@ -0,0 +1,152 @@
+import logging
+import select
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, router
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from common.logging import reset_correlation_id, set_correlation_id
+from common.models import OutboxMessage
+from common.outbox import CHANNEL, relay_batch
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED = Counter(
+    "outbox_messages_published_total", "Outbox messages published.", ["task"]
+)
+PUBLISH_FAILURES = Counter(
+    "outbox_publish_failures_total", "Failed attempts to publish.", ["task"]
+)
+DISPATCH_LAG = Histogram(
+    "outbox_dispatch_lag_seconds",
+    "Time from dispatch() to publish, including the wait for the commit.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900),
+)
+PENDING = Gauge("outbox_pending_messages", "Messages waiting to be published.")
+OLDEST_PENDING_AGE = Gauge(
+    "outbox_oldest_pending_age_seconds", "Age of the oldest pending message."
+)
+FAILED = Gauge("outbox_failed_messages", "Messages that ran out of attempts.")
+
+
+class Command(BaseCommand):
+    help = "Publish outbox messages (see common.outbox) to the Celery broker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Publish what is pending and exit."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=getattr(settings, "OUTBOX_POLL_INTERVAL", 1.0),
+            help="Seconds between polls when idle. New messages wake the relay "
+            "up right away on PostgreSQL.",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=getattr(settings, "OUTBOX_METRICS_PORT", None),
+            help="Serve Prometheus metrics on this port.",
+        )
+
+    def handle(self, *args, once=False, interval=1.0, metrics_port=None, **options):
+        from config.extensions.celery import app
+
+        # Register every task, so messages can be published by name
+        app.loader.import_default_modules()
+        self.app = app
+        self.connection = connections[router.db_for_write(OutboxMessage)]
+        self.listening_on = None
+        self.stopping = False
+        if metrics_port:
+            start_http_server(metrics_port)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        stats_updated = 0.0
+        while not self.stopping:
+            try:
+                published, failed = relay_batch(self.publish)
+            except Exception:
+                logger.exception("Outbox relay failed")
+                self.connection.close_if_unusable_or_obsolete()
+                published, failed = [], []
+                time.sleep(interval)
+
+            for message in published:
+                PUBLISHED.labels(message.task).inc()
+                DISPATCH_LAG.observe(
+                    (timezone.now() - message.created_at).total_seconds()
+                )
+            for message in failed:
+                PUBLISH_FAILURES.labels(message.task).inc()
+                logger.warning(
+                    "Could not publish %s (attempt %s): %s",
+                    message,
+                    message.attempts,
+                    message.last_error,
+                )
+
+            if time.monotonic() - stats_updated >= interval:
+                self.update_stats()
+                stats_updated = time.monotonic()
+
+            if once and not published:
+                break
+            if not published or failed:
+                self.wait(interval)
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def publish(self, message):
+        task = self.app.tasks[message.task]
+        # Published with the dispatching request's correlation ID, which
+        # config.extensions.celery adds to the message
+        token = set_correlation_id(message.correlation_id or None)
+        try:
+            task.apply_async(message.args, message.kwargs, **message.options)
+        finally:
+            reset_correlation_id(token)
+
+    def update_stats(self):
+        try:
+            stats = OutboxMessage.objects.aggregate(
+                pending=Count("id", filter=Q(failed_at__isnull=True)),
+                failed=Count("id", filter=Q(failed_at__isnull=False)),
+                oldest=Min("created_at", filter=Q(failed_at__isnull=True)),
+            )
+        except Exception:
+            logger.exception("Could not read outbox stats")
+            return
+        PENDING.set(stats["pending"])
+        FAILED.set(stats["failed"])
+        OLDEST_PENDING_AGE.set(
+            (timezone.now() - stats["oldest"]).total_seconds() if stats["oldest"] else 0
+        )
+
+    def wait(self, timeout):
+        """Sleep until ``timeout`` or a NOTIFY from ``dispatch()``."""
+        if self.connection.vendor != "postgresql" or self.stopping:
+            time.sleep(0 if self.stopping else timeout)
+            return
+        try:
+            self.connection.ensure_connection()
+            raw = self.connection.connection
+            if self.listening_on is not raw:
+                with self.connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                self.listening_on = raw
+            if select.select([raw], [], [], timeout)[0]:
+                raw.poll()
+                raw.notifies.clear()
+        except Exception:
+            logger.exception("Could not wait for outbox notifications")
+            self.connection.close_if_unusable_or_obsolete()
+            time.sleep(timeout)
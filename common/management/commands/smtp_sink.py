@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class SMTPSink:
+    """
+    A minimal SMTP server that accepts every message and drops it, counting
+    them. ``latency`` delays each reply to DATA, like a slow relay would.
+    """
+
+    def __init__(self, latency=0.0, verbosity=1, write=print):
+        self.latency = latency
+        self.verbosity = verbosity
+        self.write = write
+        self.received = 0
+
+    async def handle(self, reader, writer):
+        async def reply(line):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-sink ready")
+        try:
+            while line := await reader.readline():
+                command = line.decode("ascii", "replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    writer.write(b"250-smtp-sink\r\n250-8BITMIME\r\n")
+                    await reply("250 SMTPUTF8")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    size = 0
+                    while (data := await reader.readline()) not in (b".\r\n", b""):
+                        size += len(data)
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    self.received += 1
+                    if self.verbosity > 1:
+                        self.write(f"Received message {self.received} ({size} bytes)")
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def report(self, interval):
+        last, last_at = 0, time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            if self.received != last:
+                rate = (self.received - last) / (now - last_at)
+                self.write(f"{self.received:>10,} messages  {rate:>8,.0f}/s")
+            last, last_at = self.received, now
+
+    async def serve(self, host, port, report_every):
+        server = await asyncio.start_server(self.handle, host, port)
+        self.write(f"SMTP sink listening on {host}:{port}")
+        async with server:
+            if report_every:
+                asyncio.create_task(self.report(report_every))
+            await server.serve_forever()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local SMTP server that accepts and drops every message, to "
+        "test and load test email sending."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Seconds to wait before accepting each message.",
+        )
+        parser.add_argument(
+            "--report-every",
+            type=float,
+            default=5.0,
+            help="Print the message count and rate every this many seconds.",
+        )
+
+    def handle(self, *args, host, port, latency, report_every, verbosity, **options):
+        sink = SMTPSink(latency, verbosity, self.stdout.write)
+        try:
+            asyncio.run(sink.serve(host, port, report_every))
+        except KeyboardInterrupt:
+            self.stdout.write(f"Received {sink.received:,} messages")
@@ -0,0 +1,112 @@
+"""
+Prometheus metrics for HTTP requests.
+
+``MetricsMiddleware`` records, per resolved URL name (``sign-in``,
+``user-info``, ``admin:users_useraccount_changelist``, ...), method and
+status:
+
+- ``django_http_request_duration_seconds``: latency histogram
+- ``django_http_response_size_bytes``: response size histogram
+- ``django_http_requests_in_flight``: requests being handled right now
+
+``metrics_view`` exposes them in the Prometheus text format. When
+``PROMETHEUS_MULTIPROC_DIR`` is set (``config/gunicorn.py`` sets it), every
+worker writes its samples there and the view aggregates all workers, so a
+scrape sees the whole server whichever worker answers it.
+"""
+
+import os
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LABELS = ("view", "method", "status")
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+REQUEST_LATENCY = Histogram(
+    "django_http_request_duration_seconds",
+    "Time spent handling a request, by view.",
+    LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+RESPONSE_SIZE = Histogram(
+    "django_http_response_size_bytes",
+    "Size of response bodies, by view. Streaming responses are not counted.",
+    LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "django_http_requests_in_flight",
+    "Requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+
+
+def view_label(request):
+    """URL name of the resolved view, or a fixed value to bound cardinality."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or "<unnamed>"
+
+
+class MetricsMiddleware:
+    """Records request metrics; put it first in ``MIDDLEWARE``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            response = self.get_response(request)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+
+        labels = (
+            view_label(request),
+            request.method if request.method in METHODS else "other",
+            str(response.status_code),
+        )
+        REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - started)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+        return response
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint.
+
+    A plain Django view, so DRF authentication and throttling do not apply.
+    When ``METRICS_TOKEN`` is set, scrapers must send it as a bearer token.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden()
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
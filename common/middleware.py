@@ -0,0 +1,142 @@
+"""
+Path-scoped middleware.
+
+``ScopedMiddleware`` runs a different middleware chain depending on the
+request path, so stateless JWT endpoints don't pay for sessions, CSRF
+cookies and messages they never use. Chains are declared in
+``SCOPED_MIDDLEWARE`` as ``{path prefix: [middleware, ...]}``; the longest
+prefix matching ``request.path_info`` (without the leading ``/``) wins and
+``""`` is the fallback::
+
+    MIDDLEWARE = [
+        ...,  # applies to every request
+        "common.middleware.ScopedMiddleware",
+    ]
+    SCOPED_MIDDLEWARE = {
+        "api/": ["django.middleware.common.CommonMiddleware"],
+        "": [...],  # the full stack, for the admin and everything else
+    }
+
+Each chain is built and run the way Django runs ``MIDDLEWARE``, including
+``process_view``, ``process_template_response`` and ``process_exception``
+hooks. Scoped middleware must be synchronous-capable.
+"""
+
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class MiddlewareChain:
+    """One scope's middleware, wrapped around ``get_response``."""
+
+    def __init__(self, middleware_paths, get_response):
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler = convert_exception_to_response(get_response)
+        for middleware_path in reversed(middleware_paths):
+            middleware = import_string(middleware_path)
+            if not getattr(middleware, "sync_capable", True):
+                raise ImproperlyConfigured(
+                    f"Scoped middleware {middleware_path} must be sync capable."
+                )
+            try:
+                mw_instance = middleware(handler)
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(mw_instance, "process_view"):
+                self.view_middleware.insert(0, mw_instance.process_view)
+            if hasattr(mw_instance, "process_template_response"):
+                self.template_response_middleware.append(
+                    mw_instance.process_template_response
+                )
+            if hasattr(mw_instance, "process_exception"):
+                self.exception_middleware.append(mw_instance.process_exception)
+
+            handler = convert_exception_to_response(mw_instance)
+        self.handler = handler
+
+
+def get_scopes():
+    return getattr(settings, "SCOPED_MIDDLEWARE", {"": []})
+
+
+def scope_for_path(scopes, path):
+    """Longest prefix in ``scopes`` that ``path`` (no leading ``/``) starts with."""
+    return max(
+        (prefix for prefix in scopes if path.startswith(prefix)),
+        key=len,
+        default=None,
+    )
+
+
+class ScopedMiddleware:
+    """Runs the ``SCOPED_MIDDLEWARE`` chain matching the request path."""
+
+    def __init__(self, get_response):
+        self.chains = {
+            prefix: MiddlewareChain(paths, get_response)
+            for prefix, paths in get_scopes().items()
+        }
+        if "" not in self.chains:
+            self.chains[""] = MiddlewareChain([], get_response)
+        # Longest first, so the first match is the most specific
+        self.prefixes = sorted(self.chains, key=len, reverse=True)
+
+    def __call__(self, request):
+        path = request.path_info.lstrip("/")
+        prefix = next(prefix for prefix in self.prefixes if path.startswith(prefix))
+        request._scoped_middleware = chain = self.chains[prefix]
+        return chain.handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        for process_view in request._scoped_middleware.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        for method in request._scoped_middleware.template_response_middleware:
+            response = method(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        for method in request._scoped_middleware.exception_middleware:
+            response = method(request, exception)
+            if response is not None:
+                return response
+        return None
+
+
+# Admin middleware the admin's own checks (admin.E408-E410) look for in
+# MIDDLEWARE, in the order it needs them
+ADMIN_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+]
+
+
+def check_admin_scope(app_configs, **kwargs):
+    """The scope serving ``admin/`` must have what the admin needs."""
+    if "common.middleware.ScopedMiddleware" not in settings.MIDDLEWARE:
+        return []
+    scopes = get_scopes()
+    prefix = scope_for_path(scopes, "admin/")
+    chain = list(scopes[prefix]) if prefix is not None else []
+    present = [path for path in ADMIN_MIDDLEWARE if path in chain]
+    if present == ADMIN_MIDDLEWARE and present == sorted(present, key=chain.index):
+        return []
+    return [
+        checks.Error(
+            f"The SCOPED_MIDDLEWARE scope serving admin/ ({prefix!r}) must "
+            f"include {', '.join(ADMIN_MIDDLEWARE)}, in that order.",
+            id="common.E001",
+        )
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxMessage",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("task", models.CharField(max_length=255)),
+                ("args", models.JSONField(default=list)),
+                ("kwargs", models.JSONField(default=dict)),
+                ("options", models.JSONField(default=dict)),
+                (
+                    "ordering_key",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("available_at", models.DateTimeField()),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("failed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("failed_at__isnull", True)),
+                        fields=["available_at", "id"],
+                        name="outbox_pending_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(
+                            ("failed_at__isnull", True),
+                            models.Q(("ordering_key", ""), _negated=True),
+                        ),
+                        fields=["ordering_key", "id"],
+                        name="outbox_ordering_key_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
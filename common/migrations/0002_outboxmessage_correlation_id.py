@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="correlation_id",
+            field=models.CharField(blank=True, default="", max_length=128),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0002_outboxmessage_correlation_id"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="outboxmessage",
+            name="outbox_ordering_key_idx",
+        ),
+        migrations.AddIndex(
+            model_name="outboxmessage",
+            index=models.Index(
+                condition=models.Q(("ordering_key", ""), _negated=True),
+                fields=["ordering_key", "id"],
+                name="outbox_ordering_key_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,12 @@
-import uuid
+import copy
 
 from django.db import models
+from django.db.models import lookups
+from django.db.models.fields.files import FieldFile
+
+from .utils import default_uuid
+
+NOT_LOADED = object()
 
 
 class NormalizedEmailField(models.EmailField):
@@ -8,18 +14,138 @@ class NormalizedEmailField(models.EmailField):
     Email field that automatically normalizes email addresses by:
     - Converting to lowercase
     - Stripping whitespace
+
+    ``exact``, ``iexact`` and ``in`` lookups normalize the compared value the
+    same way, so ``email=`` and ``email__iexact=`` match regardless of the
+    client's casing and are both answered by a plain index on the column.
     """
 
+    @staticmethod
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip().lower()
+        return value
+
     def pre_save(self, model_instance, add):
         value = getattr(model_instance, self.attname)
         if value:
-            value = value.strip().lower()
+            value = self.normalize(value)
             setattr(model_instance, self.attname, value)
         return super().pre_save(model_instance, add)
 
 
-class TimeStampModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+@NormalizedEmailField.register_lookup
+class NormalizedEmailExact(lookups.Exact):
+    def get_prep_lookup(self):
+        self.rhs = NormalizedEmailField.normalize(self.rhs)
+        return super().get_prep_lookup()
+
+
+@NormalizedEmailField.register_lookup
+class NormalizedEmailIExact(NormalizedEmailExact):
+    lookup_name = "iexact"
+
+    def as_sql(self, compiler, connection):
+        # Stored values are already lowercase, so a case-insensitive match is an
+        # exact match on the normalized value instead of UPPER(email) = UPPER(%s).
+        return NormalizedEmailExact(self.lhs, self.rhs).as_sql(compiler, connection)
+
+
+@NormalizedEmailField.register_lookup
+class NormalizedEmailIn(lookups.In):
+    def get_prep_lookup(self):
+        if isinstance(self.rhs, (list, tuple, set)):
+            self.rhs = [NormalizedEmailField.normalize(value) for value in self.rhs]
+        return super().get_prep_lookup()
+
+
+class DirtyFieldsMixin:
+    """
+    Mixin that tracks the field values loaded from the database so that
+    ``save()`` only writes the columns that actually changed.
+
+    - Instances loaded from the database snapshot their concrete field values.
+    - ``save()`` on such an instance issues an ``UPDATE`` of the modified
+      columns (plus any ``auto_now`` fields) and skips the write entirely,
+      including ``pre_save``/``post_save`` signals, when nothing changed.
+    - Inserts, explicit ``update_fields`` and ``force_insert`` saves, and
+      saves to another database behave exactly like ``Model.save()``.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {}
+        instance._snapshot_fields()
+        return instance
+
+    def _tracked_value(self, field):
+        value = self.__dict__.get(field.attname)
+        if isinstance(value, FieldFile):
+            return value.name
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def _snapshot_fields(self, field_names=None):
+        """Record the current value of the loaded (non-deferred) fields."""
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            if field_names is not None and (
+                field.name not in field_names and field.attname not in field_names
+            ):
+                continue
+            self._loaded_values[field.attname] = self._tracked_value(field)
+
+    def get_dirty_fields(self):
+        """Return the names of the fields modified since they were loaded."""
+        loaded_values = getattr(self, "_loaded_values", {})
+        dirty_fields = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            loaded_value = loaded_values.get(field.attname, NOT_LOADED)
+            if loaded_value is NOT_LOADED or loaded_value != self._tracked_value(field):
+                dirty_fields.append(field.name)
+        return dirty_fields
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using")
+        if (
+            not args
+            and hasattr(self, "_loaded_values")
+            and not self._state.adding
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+            and (using is None or using == self._state.db)
+        ):
+            update_fields = self.get_dirty_fields()
+            if update_fields:
+                update_fields += [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if getattr(field, "auto_now", False)
+                    and field.name not in update_fields
+                ]
+            kwargs["update_fields"] = update_fields
+
+        super().save(*args, **kwargs)
+
+        if not hasattr(self, "_loaded_values"):
+            self._loaded_values = {}
+        self._snapshot_fields(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if not hasattr(self, "_loaded_values"):
+            self._loaded_values = {}
+        self._snapshot_fields(fields)
+
+
+class TimeStampModel(DirtyFieldsMixin, models.Model):
+    # UUIDv4 by default; set UUID7_PRIMARY_KEYS to get time-ordered UUIDv7 keys
+    id = models.UUIDField(primary_key=True, default=default_uuid, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -37,3 +163,49 @@ class BaseContactForm(TimeStampModel):
 
     class Meta:
         abstract = True
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task to publish once the transaction that wrote it commits.
+
+    Written by ``common.outbox.dispatch`` and published, then deleted, by the
+    ``relay_outbox`` command. Rows with ``failed_at`` set ran out of
+    attempts and are kept for inspection; they hold back the later messages
+    with their ``ordering_key`` until they are retried or deleted.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    options = models.JSONField(default=dict)
+    # Messages sharing a key are published in order, one at a time
+    ordering_key = models.CharField(max_length=255, blank=True, default="")
+    # Correlation ID of the request or task that dispatched it, passed on
+    # to the task when it is published
+    correlation_id = models.CharField(max_length=128, blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    failed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["available_at", "id"],
+                condition=models.Q(failed_at__isnull=True),
+                name="outbox_pending_idx",
+            ),
+            models.Index(
+                fields=["ordering_key", "id"],
+                condition=~models.Q(ordering_key=""),
+                name="outbox_ordering_key_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk}"
@@ -0,0 +1,117 @@
+"""
+Transactional outbox for Celery tasks.
+
+``dispatch()`` writes the task to the ``OutboxMessage`` table in the current
+transaction instead of publishing it, so the request never waits on the
+broker, and the task is sent if and only if the transaction commits. The
+``relay_outbox`` management command publishes pending messages in batches:
+
+- failed publishes are retried with exponential backoff, up to
+  ``OUTBOX_MAX_ATTEMPTS`` times, then kept with ``failed_at`` set
+- messages with the same ``ordering_key`` are published in order: one is
+  only picked up once every earlier one has been published. A message that
+  ran out of attempts holds the later ones back until it is retried (admin
+  action) or deleted
+- several relays can run side by side (``SELECT ... FOR UPDATE SKIP LOCKED``)
+
+Tasks keep the correlation ID of the request that dispatched them (see
+``common.logging``), even though the relay publishes them later.
+
+Delivery is at least once: a relay that dies between publishing and
+deleting a batch publishes it again. Tasks should be idempotent (see
+``config.extensions.idempotency``).
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from common.logging import get_correlation_id
+from common.models import OutboxMessage
+
+# NOTIFY channel waking the relay up when messages are committed
+CHANNEL = "common_outbox"
+
+
+def dispatch(task, args=(), kwargs=None, ordering_key="", countdown=None, **options):
+    """
+    Queue ``task`` (a task or its name) like ``task.apply_async()`` would,
+    once the current transaction commits.
+    """
+    now = timezone.now()
+    message = OutboxMessage.objects.create(
+        task=getattr(task, "name", task),
+        args=list(args),
+        kwargs=kwargs or {},
+        options=options,
+        ordering_key=ordering_key,
+        correlation_id=get_correlation_id() or "",
+        available_at=now + timedelta(seconds=countdown) if countdown else now,
+    )
+    connection = connections[router.db_for_write(OutboxMessage)]
+    if connection.vendor == "postgresql":
+        # Delivered on commit, and dropped on rollback
+        with connection.cursor() as cursor:
+            cursor.execute(f"NOTIFY {CHANNEL}")
+    return message
+
+
+def backoff(attempts):
+    """Seconds to wait before the next attempt: 2, 4, 8, ... capped at 5 min."""
+    return min(2**attempts, 300)
+
+
+def pending_messages(now=None):
+    # Failed messages included, publishing past them would break the order
+    earlier = OutboxMessage.objects.filter(
+        ordering_key=OuterRef("ordering_key"), id__lt=OuterRef("id")
+    )
+    return OutboxMessage.objects.filter(
+        Q(ordering_key="") | ~Exists(earlier),
+        failed_at__isnull=True,
+        available_at__lte=now or timezone.now(),
+    ).order_by("id")
+
+
+def relay_batch(publish, batch_size=None, max_attempts=None):
+    """
+    Publish one batch of pending messages with ``publish(message)``.
+
+    Returns ``(published, failed)`` lists of messages. Stops at the first
+    publish error, since the broker is then most likely unavailable.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    max_attempts = max_attempts or getattr(settings, "OUTBOX_MAX_ATTEMPTS", 10)
+    published, failed = [], []
+    with transaction.atomic():
+        now = timezone.now()
+        messages = list(
+            pending_messages(now).select_for_update(skip_locked=True)[:batch_size]
+        )
+        for message in messages:
+            try:
+                publish(message)
+            except Exception as e:
+                message.attempts += 1
+                message.last_error = f"{type(e).__name__}: {e}"
+                message.available_at = now + timedelta(
+                    seconds=backoff(message.attempts)
+                )
+                if message.attempts >= max_attempts:
+                    message.failed_at = now
+                message.save(
+                    update_fields=[
+                        "attempts",
+                        "last_error",
+                        "available_at",
+                        "failed_at",
+                    ]
+                )
+                failed.append(message)
+                break
+            published.append(message)
+        OutboxMessage.objects.filter(pk__in=[m.pk for m in published]).delete()
+    return published, failed
@@ -1,7 +1,7 @@
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 from rest_framework import serializers
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 from .mixin import CamelSnakeMixin
@@ -20,6 +20,15 @@ class PaginationSerializer(CamelSnakeMixin, serializers.Serializer):
     results = serializers.ListField(child=serializers.DictField())
 
 
+class KeysetPaginationSerializer(CamelSnakeMixin, serializers.Serializer):
+    page_size = serializers.IntegerField()
+    has_next = serializers.BooleanField()
+    has_previous = serializers.BooleanField()
+    next = serializers.URLField()
+    previous = serializers.URLField()
+    results = serializers.ListField(child=serializers.DictField())
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     """
     Custom pagination class with configurable page size.
@@ -151,3 +160,41 @@ class LargeResultsPagination(StandardResultsSetPagination):
 
     page_size = 50
     max_page_size = 500
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination on the primary key.
+
+    Pages are fetched with ``WHERE id < <cursor> ORDER BY id DESC LIMIT n``,
+    so the cost of a page does not grow with its depth and no ``COUNT(*)`` is
+    issued. Intended for ``TimeStampModel`` subclasses using time-ordered
+    UUIDv7 keys (``UUID7_PRIMARY_KEYS``), where ``-id`` is newest first.
+
+    Features:
+    - Default page size: 10 items
+    - Configurable via 'limit' query parameter
+    - Maximum page size: 100 items
+    - Cursor query parameter: 'cursor'
+    """
+
+    page_size = 10
+    page_size_query_param = "limit"
+    max_page_size = 100
+    ordering = "-id"
+
+    def get_paginated_response(self, data):
+        """
+        Return a paginated style Response object with cursor links.
+        """
+        serializer = KeysetPaginationSerializer(
+            {
+                "page_size": self.page_size,
+                "has_next": self.has_next,
+                "has_previous": self.has_previous,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+        return Response(serializer.data)
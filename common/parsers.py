@@ -0,0 +1,47 @@
+import re
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.settings import api_settings
+from rest_framework.utils import json
+
+from .renderers import ORJSONRenderer
+
+# orjson parses integers wider than 64 bits as floats. Bodies with such a
+# run of digits, in a number or not, go through the json module instead.
+# Searched before decoding: digits are ASCII in every charset JSON uses
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+class ORJSONParser(BaseParser):
+    """
+    Drop-in replacement for DRF's ``JSONParser`` built on orjson.
+
+    Unlike the stock parser, NaN and Infinity are rejected even without
+    ``STRICT_JSON`` (unless the body has integers wider than 64 bits, see
+    ``_LONG_DIGITS``), and so are numbers out of the float range such as
+    ``1e400``, which the stock parser reads as infinity.
+    """
+
+    media_type = "application/json"
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+            long_digits = _LONG_DIGITS.search(data)
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding)
+            if long_digits:
+                parse_constant = (
+                    json.strict_constant if api_settings.STRICT_JSON else None
+                )
+                return json.loads(data, parse_constant=parse_constant)
+            return orjson.loads(data)
+        except ValueError as exc:  # UnicodeDecodeError included
+            raise ParseError(f"JSON parse error - {exc}") from exc
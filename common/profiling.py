@@ -0,0 +1,233 @@
+"""
+Sampled and on-demand request profiling.
+
+``ProfilingMiddleware`` profiles a random ``PROFILING_SAMPLE_RATE`` fraction
+of requests, plus any request sending ``X-Profile: <PROFILING_TOKEN>``. A
+background thread samples the request thread's stack every
+``PROFILING_INTERVAL`` seconds. The view itself is not instrumented, so the
+overhead is the same for fast and slow code. Profiles are rendered and saved
+to the default storage under ``PROFILING_PATH`` by a background thread, so
+the response never waits on the upload::
+
+    profiles/<date>/<url name>/<time>-<duration>ms-<id>.speedscope.json
+
+They open in https://www.speedscope.app. Set ``PROFILING_FORMAT =
+"collapsed"`` for folded stacks (flamegraph.pl, speedscope, ...) instead.
+The storage name of a triggered profile is returned in the ``X-Profile``
+response header; the file shows up there shortly after the response. When
+the storage falls behind, profiles beyond ``PROFILING_QUEUE_SIZE`` are
+dropped rather than held in memory.
+
+With neither a sample rate nor a token configured, the middleware removes
+itself from the chain at startup and costs nothing.
+"""
+
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.text import slugify
+
+from common.logging import logger
+
+
+class StackSampler:
+    """Samples the stack of one thread from a background thread."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+
+def render_collapsed(samples, interval, name):
+    """Folded stacks: ``root;caller;callee <count>`` per line."""
+    return "".join(
+        ";".join(
+            f"{function} ({filename}:{line})" for function, filename, line in stack
+        )
+        + f" {count}\n"
+        for stack, count in samples.items()
+    )
+
+
+def render_speedscope(samples, interval, name):
+    """Speedscope file format, one sampled profile weighted in seconds."""
+    frames, frame_index, stacks, weights = [], {}, [], []
+    for stack, count in samples.items():
+        indexes = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                function, filename, line = frame
+                frames.append({"name": function, "file": filename, "line": line})
+            indexes.append(frame_index[frame])
+        stacks.append(indexes)
+        weights.append(count * interval)
+    return json.dumps(
+        {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "common.profiling",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": stacks,
+                    "weights": weights,
+                }
+            ],
+        }
+    )
+
+
+FORMATS = {
+    "speedscope": (render_speedscope, "speedscope.json"),
+    "collapsed": (render_collapsed, "collapsed.txt"),
+}
+
+
+class ProfileWriter:
+    """Renders and saves profiles to the default storage from a background thread."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, name, render):
+        """Queue ``render()``'s output to be saved as ``name``; False if dropped."""
+        # Started lazily: the middleware may be built before gunicorn forks,
+        # and threads don't survive a fork
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self.queue = queue.Queue(self.maxsize)
+                    threading.Thread(
+                        target=self._run,
+                        args=(self.queue,),
+                        name="profile-writer",
+                        daemon=True,
+                    ).start()
+                    self._pid = os.getpid()
+        try:
+            self.queue.put_nowait((name, render))
+        except queue.Full:
+            logger.warning("Profile queue full, dropped %s", name)
+            return False
+        return True
+
+    def join(self):
+        """Wait until the queued profiles are saved."""
+        if self._pid == os.getpid():
+            self.queue.join()
+
+    @staticmethod
+    def _run(profiles):
+        while True:
+            name, render = profiles.get()
+            try:
+                default_storage.save(name, ContentFile(render().encode()))
+            except Exception:
+                logger.exception("Could not save request profile")
+            finally:
+                profiles.task_done()
+
+
+class ProfilingMiddleware:
+    """Profiles sampled or explicitly requested requests; see module docstring."""
+
+    trigger_header = "X-Profile"
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        self.token = getattr(settings, "PROFILING_TOKEN", "")
+        if not self.sample_rate and not self.token:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.interval = getattr(settings, "PROFILING_INTERVAL", 0.005)
+        self.path = getattr(settings, "PROFILING_PATH", "profiles")
+        self.render, self.extension = FORMATS[
+            getattr(settings, "PROFILING_FORMAT", "speedscope")
+        ]
+        self.writer = ProfileWriter(getattr(settings, "PROFILING_QUEUE_SIZE", 100))
+
+    def __call__(self, request):
+        triggered = self.is_triggered(request)
+        if not triggered and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            samples = sampler.stop()
+        duration = time.perf_counter() - started
+
+        name = self.save(request, response, samples, duration)
+        if triggered and name:
+            response.headers[self.trigger_header] = name
+        return response
+
+    def is_triggered(self, request):
+        value = request.headers.get(self.trigger_header)
+        return bool(value and self.token and constant_time_compare(value, self.token))
+
+    def save(self, request, response, samples, duration):
+        """Queue the profile for saving; returns its storage name, or None."""
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name if match else "") or "unresolved"
+        now = timezone.now()
+        title = (
+            f"{request.method} {request.path} ({view}) "
+            f"{response.status_code} in {duration * 1e3:.0f} ms"
+        )
+        name = (
+            f"{self.path}/{now:%Y-%m-%d}/{slugify(view.replace(':', '-'))}/"
+            f"{now:%H%M%S}-{duration * 1e3:.0f}ms-{uuid.uuid4().hex[:8]}"
+            f".{self.extension}"
+        )
+        if self.writer.submit(name, lambda: self.render(samples, self.interval, title)):
+            return name
+        return None
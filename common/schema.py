@@ -0,0 +1,156 @@
+"""
+Precomputed OpenAPI schema.
+
+drf-spectacular builds the schema by introspecting every view and serializer,
+on every request to ``api/v1/schema/``. Here it is built once per process
+instead, or once at build time: ``manage.py openapi_schema`` writes it to
+``OPENAPI_SCHEMA_FILE`` (the Dockerfile runs it next to ``collectstatic``)
+and ``manage.py openapi_schema --check`` fails when that file no longer
+matches the code.
+
+``SchemaView`` serves the document from memory, rendered and compressed
+(brotli, gzip) once per format, with a content-hash ``ETag``. In ``DEBUG``
+the file is ignored and the schema is generated on the first request, so it
+always reflects the code being edited. Schemas the precomputed document is
+not (another ``urlconf``, ``api_version``, ``custom_settings``, a ``lang`` or
+``version`` query parameter, ...) are generated per request, as
+``SpectacularAPIView`` does.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+import brotli
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from common.compression import negotiate
+
+RENDERERS = {"json": OpenApiJsonRenderer, "yaml": OpenApiYamlRenderer}
+
+# Preferred first
+ENCODINGS = {
+    "br": lambda body: brotli.compress(body, quality=11),
+    "gzip": lambda body: gzip.compress(body, compresslevel=9, mtime=0),
+}
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+        urlconf=spectacular_settings.SERVE_URLCONF
+    )
+    return generator.get_schema(request=None, public=True)
+
+
+def render_schema(schema, format="json"):
+    return RENDERERS[format]().render(schema, renderer_context={})
+
+
+class SchemaDocument:
+    """A schema with its rendered and compressed forms, built on demand."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._bodies = {}
+        self._etags = {}
+        self._lock = threading.Lock()
+
+    def body(self, format, encoding=None):
+        """The schema rendered as ``format``, compressed with ``encoding``."""
+        key = (format, encoding)
+        if key not in self._bodies:
+            if encoding is None:
+                body = render_schema(self.schema, format)
+            else:
+                body = ENCODINGS[encoding](self.body(format))
+            with self._lock:
+                self._bodies.setdefault(key, body)
+        return self._bodies[key]
+
+    def etag(self, format):
+        if format not in self._etags:
+            self._etags[format] = hashlib.sha256(self.body(format)).hexdigest()[:32]
+        return self._etags[format]
+
+
+_document = None
+_document_lock = threading.Lock()
+
+
+def get_schema_document():
+    """
+    The process-wide schema: loaded from ``OPENAPI_SCHEMA_FILE`` if it exists
+    (outside ``DEBUG``), otherwise generated. Built once per process.
+    """
+    global _document
+    if _document is None:
+        with _document_lock:
+            if _document is None:
+                path = getattr(settings, "OPENAPI_SCHEMA_FILE", None)
+                if path and not settings.DEBUG and os.path.exists(path):
+                    with open(path, "rb") as f:
+                        schema = json.load(f)
+                else:
+                    schema = generate_schema()
+                _document = SchemaDocument(schema)
+    return _document
+
+
+class SchemaView(SpectacularAPIView):
+    """
+    ``SpectacularAPIView`` serving the precomputed schema. Content
+    negotiation, authentication and permissions are unchanged.
+    """
+
+    def is_precomputed(self, request):
+        """Whether ``request`` asks for the schema ``generate_schema()`` builds."""
+        return (
+            self.generator_class is spectacular_settings.DEFAULT_GENERATOR_CLASS
+            and self.urlconf == spectacular_settings.SERVE_URLCONF
+            and self.patterns is None
+            and self.serve_public
+            and self.api_version is None
+            and not self.custom_settings
+            and not request.version
+            and not self._get_version_parameter(request)
+            and not (settings.USE_I18N and request.GET.get("lang"))
+        )
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if not self.is_precomputed(request):
+            return super().get(request, *args, **kwargs)
+
+        document = get_schema_document()
+        format = request.accepted_renderer.format
+        # Weak, since the same ETag is used for every encoding
+        etag = "W/" + quote_etag(document.etag(format))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            encoding = negotiate(request, ENCODINGS)
+            response = HttpResponse(
+                document.body(format, encoding),
+                content_type=request.accepted_renderer.media_type,
+            )
+            if encoding is not None:
+                response.headers["Content-Encoding"] = encoding
+            response.headers["Content-Disposition"] = (
+                f'inline; filename="{self._get_filename(request, None)}"'
+            )
+        response.headers["ETag"] = etag
+        patch_vary_headers(response, ["Accept", "Accept-Encoding"])
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
@@ -0,0 +1,141 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from .mixin import snake_to_camel
+
+# Serializer fields whose representation of a database value is the value
+# itself, so rows can be turned into dicts without a per-field call.
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.FloatField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """
+    List serializer for ``ValuesSerializer``.
+
+    Querysets are fetched with ``values_list()`` on the serializer's columns
+    and every row goes through the child's precompiled row converter.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        if isinstance(iterable, models.QuerySet):
+            iterable = self.child.get_values_queryset(iterable)
+
+        convert = self.child.get_row_converter()
+        return [
+            convert(item if isinstance(item, tuple) else self.child.get_row(item))
+            for item in iterable
+        ]
+
+
+class ValuesSerializer(serializers.ModelSerializer):
+    """
+    Read-only ``ModelSerializer`` that renders rows instead of model objects.
+
+    - Querysets are fetched as ``values_list()`` tuples of only the needed
+      columns, without instantiating model objects.
+    - The row-to-dict conversion is compiled once per serializer class, so
+      serializing a row is a ``zip`` plus a call for each field that needs
+      converting (dates, decimals, files, ...). The declared fields are never
+      deep-copied on the hot path.
+    - Output keys are camelCased like ``CamelSnakeMixin`` unless
+      ``camel_case = False``.
+
+    Output matches the equivalent ``CamelSnakeMixin`` ``ModelSerializer``.
+    Only plain model fields are supported. Paginate
+    ``get_values_queryset(queryset)`` to keep pages as tuples.
+    """
+
+    camel_case = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, "Meta", None)
+        if meta is not None and not hasattr(meta, "list_serializer_class"):
+            meta.list_serializer_class = ValuesListSerializer
+        cls._row_plan = None
+
+    @classmethod
+    def get_row_plan(cls):
+        """Return ``(keys, columns, converters)`` compiled for this class."""
+        if cls._row_plan is None:
+            model = cls.Meta.model
+            keys, columns, converters = [], [], []
+            for name, field in cls().fields.items():
+                if field.write_only:
+                    continue
+                source = field.source or name
+                try:
+                    model_field = model._meta.get_field(source)
+                except FieldDoesNotExist:
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__}.{name} must map to a model field."
+                    ) from None
+                if isinstance(field, serializers.FileField):
+                    converters.append((len(keys), model_field))
+                elif not isinstance(field, IDENTITY_FIELDS):
+                    converters.append((len(keys), field.to_representation))
+                keys.append(snake_to_camel(name) if cls.camel_case else name)
+                columns.append(model_field.attname)
+            cls._row_plan = (tuple(keys), tuple(columns), tuple(converters))
+        return cls._row_plan
+
+    def get_values_queryset(self, queryset):
+        return queryset.values_list(*self.get_row_plan()[1])
+
+    def get_row(self, instance):
+        return tuple(getattr(instance, column) for column in self.get_row_plan()[1])
+
+    def get_row_converter(self):
+        keys, _, converters = self.get_row_plan()
+        if not converters:
+            return lambda row: dict(zip(keys, row, strict=True))
+
+        request = self.context.get("request")
+        converters = [
+            (
+                index,
+                (
+                    self.file_converter(converter, request)
+                    if isinstance(converter, models.Field)
+                    else converter
+                ),
+            )
+            for index, converter in converters
+        ]
+
+        def convert(row):
+            values = list(row)
+            for index, converter in converters:
+                if values[index] is not None:
+                    values[index] = converter(values[index])
+            return dict(zip(keys, values, strict=True))
+
+        return convert
+
+    @staticmethod
+    def file_converter(model_field, request):
+        """Same output as DRF's ``FileField`` for a stored file name."""
+
+        def convert(value):
+            name = getattr(value, "name", value)
+            if not name:
+                return None
+            if not api_settings.UPLOADED_FILES_USE_URL:
+                return name
+            url = model_field.storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return convert
+
+    def to_representation(self, instance):
+        row = instance if isinstance(instance, tuple) else self.get_row(instance)
+        return self.get_row_converter()(row)
@@ -0,0 +1,139 @@
+import hashlib
+import threading
+import time
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.cache import caches
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+
+class CachedURLS3Storage(S3Storage):
+    """
+    ``S3Storage`` whose presigned URLs are stable within a time window.
+
+    Time is split into windows of ``AWS_QUERYSTRING_WINDOW`` seconds. The
+    first ``url()`` call for a file in a window signs it and stores the URL in
+    the ``AWS_QUERYSTRING_CACHE`` cache until the window ends, so every worker
+    hands out the same URL and browsers/CDNs can reuse the cached object.
+    URLs are also memoized in process, which makes repeated calls (e.g. a
+    changelist of avatars) close to free.
+
+    URLs are signed for ``AWS_QUERYSTRING_EXPIRE`` seconds past the end of
+    their window, so a URL handed out at the end of a window is still valid
+    for the full expiry.
+
+    Calls with custom ``parameters``, ``expire`` or ``http_method`` are signed
+    as usual and never cached.
+    """
+
+    max_memoized_urls = 10_000
+
+    def __init__(self, **settings_overrides):
+        super().__init__(**settings_overrides)
+        self.querystring_window = getattr(
+            settings, "AWS_QUERYSTRING_WINDOW", 60 * 60 * 24
+        )
+        self.url_cache_alias = getattr(settings, "AWS_QUERYSTRING_CACHE", "default")
+        self._urls = {}
+        self._urls_window = None
+        self._urls_lock = threading.Lock()
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if (
+            parameters
+            or expire is not None
+            or http_method is not None
+            or not self.querystring_auth
+            or not self.querystring_window
+        ):
+            return super().url(name, parameters, expire, http_method)
+
+        now = time.time()
+        window = int(now // self.querystring_window)
+        key = self._url_cache_key(name, window)
+        with self._urls_lock:
+            if self._urls_window != window:
+                self._urls, self._urls_window = {}, window
+            url = self._urls.get(key)
+        if url is not None:
+            return url
+
+        cache = caches[self.url_cache_alias]
+        url = cache.get(key)
+        if url is None:
+            remaining = (window + 1) * self.querystring_window - now
+            url = super().url(name, expire=int(remaining) + 1 + self.querystring_expire)
+            # First writer wins, so concurrent workers converge on one URL
+            if not cache.add(key, url, timeout=int(remaining) + 1):
+                url = cache.get(key, url)
+
+        with self._urls_lock:
+            if self._urls_window == window:
+                if len(self._urls) >= self.max_memoized_urls:
+                    self._urls.clear()
+                self._urls[key] = url
+        return url
+
+    def url_window_start(self):
+        """
+        Timestamp from which ``url()`` hands out the current URLs, so anything
+        embedding them is stale if it was built before. ``None`` if URLs are
+        not signed and never change.
+        """
+        if not self.querystring_auth:
+            return None
+        now = time.time()
+        if not self.querystring_window:
+            return now
+        return now // self.querystring_window * self.querystring_window
+
+    def _url_cache_key(self, name, window):
+        digest = hashlib.md5(
+            f"{self.bucket_name}:{self.location}:{name}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        return f"s3-url:{window}:{self.querystring_expire}:{digest}"
+
+    def presigned_post(self, name, content_type, max_size, expire=None):
+        """
+        Presigned POST target for uploading ``name`` straight to the bucket.
+
+        The policy pins the key and the content type and caps the size, so the
+        client cannot store anything else with it. Returns boto's
+        ``{"url": ..., "fields": {...}}``.
+        """
+        fields = {"Content-Type": content_type}
+        cache_control = self.get_object_parameters(name).get("CacheControl")
+        if cache_control:
+            fields["Cache-Control"] = cache_control
+        conditions = [{key: value} for key, value in fields.items()]
+        conditions.append(["content-length-range", 1, max_size])
+        return self.connection.meta.client.generate_presigned_post(
+            self.bucket_name,
+            self._normalize_name(clean_name(name)),
+            Fields=fields,
+            Conditions=conditions,
+            ExpiresIn=expire or self.querystring_expire,
+        )
+
+    def head(self, name):
+        """``head_object`` metadata for ``name``, or ``None`` if it does not exist."""
+        try:
+            return self.connection.meta.client.head_object(
+                Bucket=self.bucket_name, Key=self._normalize_name(clean_name(name))
+            )
+        except ClientError as err:
+            if err.response["ResponseMetadata"]["HTTPStatusCode"] == 404:
+                return None
+            raise
+
+    def read_prefix(self, name, length):
+        """Read the first ``length`` bytes of ``name`` with a ranged GET."""
+        response = self.connection.meta.client.get_object(
+            Bucket=self.bucket_name,
+            Key=self._normalize_name(clean_name(name)),
+            Range=f"bytes=0-{length - 1}",
+        )
+        return response["Body"].read()
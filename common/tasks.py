@@ -0,0 +1,26 @@
+import logging
+
+from celery import shared_task
+from django.apps import apps
+from django.contrib import admin
+
+from common.admin import loads_query, update_in_chunks
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, queue="admin")
+def run_bulk_update(self, model_label, name, query, chunk_size=1000):
+    """Run the ``name`` bulk update of ``model_label``'s admin over ``query``."""
+    model = apps.get_model(model_label)
+    update = admin.site.get_model_admin(model).bulk_updates[name]
+    queryset = loads_query(model, query)
+    total = queryset.count()
+    logger.info("%s: updating %s %s", update.description, total, model_label)
+
+    def progress(updated):
+        self.update_state(state="PROGRESS", meta={"updated": updated, "total": total})
+
+    updated = update_in_chunks(queryset, update.values, chunk_size, progress)
+    logger.info("%s: %s of %s updated", update.description, updated, total)
+    return {"updated": updated, "total": total}
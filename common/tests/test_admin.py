@@ -0,0 +1,222 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.messages import get_messages
+from django.core import signing
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from common.admin import BulkUpdate, EstimatedCountPaginator, update_in_chunks
+from common.tasks import run_bulk_update
+from users.models import UserAccount
+
+
+def create_users(count, **extra_fields):
+    return [
+        UserAccount.objects.create_user(
+            email=f"user{i}@example.com",
+            password="password",
+            first_name="Jane",
+            last_name="Doe",
+            **extra_fields,
+        )
+        for i in range(count)
+    ]
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_users(5)
+
+    def count(self, queryset, exact_count_limit=None):
+        paginator = EstimatedCountPaginator(queryset, 2)
+        if exact_count_limit is not None:
+            paginator.exact_count_limit = exact_count_limit
+        with CaptureQueriesContext(connection) as queries:
+            count = paginator.count
+        return count, [query["sql"] for query in queries]
+
+    def test_small_table_is_counted_exactly(self):
+        count, queries = self.count(UserAccount.objects.all())
+
+        self.assertEqual(count, 5)
+        self.assertIn("pg_class", queries[0])
+        self.assertIn("COUNT(", queries[-1])
+
+    def test_large_table_uses_the_table_estimate(self):
+        with mock.patch.object(
+            EstimatedCountPaginator, "_table_estimate", return_value=50_000
+        ):
+            count, queries = self.count(UserAccount.objects.all())
+
+        self.assertEqual(count, 50_000)
+        self.assertEqual(queries, [])
+
+    def test_filtered_queryset_is_counted_exactly(self):
+        queryset = UserAccount.objects.filter(email__startswith="user")
+
+        with mock.patch.object(
+            EstimatedCountPaginator, "_table_estimate", return_value=50_000
+        ) as table_estimate:
+            count, queries = self.count(queryset)
+
+        self.assertEqual(count, 5)
+        table_estimate.assert_not_called()
+        self.assertEqual(len(queries), 1)
+        self.assertIn("LIMIT 10001", queries[0])
+
+    def test_filtered_queryset_beyond_the_limit_uses_the_plan_estimate(self):
+        queryset = UserAccount.objects.filter(email__startswith="user")
+
+        with mock.patch.object(
+            EstimatedCountPaginator, "_plan_estimate", return_value=1000
+        ):
+            self.assertEqual(self.count(queryset, exact_count_limit=2)[0], 1000)
+        # Never less than the rows already counted
+        with mock.patch.object(
+            EstimatedCountPaginator, "_plan_estimate", return_value=1
+        ):
+            self.assertEqual(self.count(queryset, exact_count_limit=2)[0], 3)
+
+    def test_plan_estimate(self):
+        queryset = UserAccount.objects.filter(email__startswith="user")
+
+        self.assertGreaterEqual(EstimatedCountPaginator._plan_estimate(queryset), 1)
+
+    def test_other_databases_and_lists_are_counted_exactly(self):
+        with mock.patch.object(connection, "vendor", "sqlite"):
+            count, queries = self.count(UserAccount.objects.all())
+
+        self.assertEqual(count, 5)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(EstimatedCountPaginator([1, 2, 3], 2).count, 3)
+
+
+class UpdateInChunksTests(TestCase):
+    def test_updates_in_chunks(self):
+        users = create_users(5)
+        progress = []
+
+        # Per chunk: the primary keys, then the update in a savepoint
+        with self.assertNumQueries(3 * 4 + 1):
+            updated = update_in_chunks(
+                UserAccount.objects.all(), {"is_active": False}, 2, progress.append
+            )
+
+        self.assertEqual(updated, 5)
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertFalse(UserAccount.objects.filter(is_active=True).exists())
+        for user in users:
+            old_updated_at = user.updated_at
+            user.refresh_from_db()
+            self.assertGreater(user.updated_at, old_updated_at)
+
+    def test_only_updates_the_queryset(self):
+        first, second = create_users(2)
+
+        updated = update_in_chunks(
+            UserAccount.objects.filter(pk=first.pk), {"first_name": "Janet"}
+        )
+
+        self.assertEqual(updated, 1)
+        second.refresh_from_db()
+        self.assertEqual(second.first_name, "Jane")
+
+
+class BulkUpdateActionTests(TestCase):
+    url = reverse("admin:users_useraccount_changelist")
+
+    def setUp(self):
+        self.admin = UserAccount.objects.create_superuser(
+            email="admin@example.com",
+            password="password",
+            first_name="Admin",
+            last_name="User",
+        )
+        self.client.force_login(self.admin)
+        self.users = create_users(3, is_active=True)
+
+    def run_action(self, action, **data):
+        response = self.client.post(self.url, {"action": action, "index": 0, **data})
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        return response
+
+    def messages(self, response):
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_defaults_to_no_filter(self):
+        self.assertIsNone(BulkUpdate("Activate", {"is_active": True}).filter)
+
+    def test_updates_the_selected_rows(self):
+        response = self.run_action(
+            "deactivate_users", _selected_action=[self.users[0].pk]
+        )
+
+        self.assertEqual(
+            self.messages(response), ["Deactivate selected users: 1 updated."]
+        )
+        self.assertEqual(
+            list(UserAccount.objects.filter(is_active=False)), [self.users[0]]
+        )
+
+    def test_select_across_updates_every_row(self):
+        response = self.run_action(
+            "deactivate_users",
+            select_across=1,
+            _selected_action=[self.users[0].pk],
+        )
+
+        self.assertEqual(
+            self.messages(response), ["Deactivate selected users: 4 updated."]
+        )
+        self.assertFalse(UserAccount.objects.filter(is_active=True).exists())
+
+    def test_update_filter_is_applied(self):
+        UserAccount.objects.filter(pk=self.users[0].pk).update(is_email_verified=True)
+
+        response = self.run_action(
+            "mark_email_verified",
+            _selected_action=[user.pk for user in self.users],
+        )
+
+        self.assertEqual(
+            self.messages(response),
+            ["Mark selected users' email as verified: 2 updated."],
+        )
+        self.users[0].refresh_from_db()
+        self.assertIsNone(self.users[0].email_verified_at)
+
+    def test_large_selection_runs_in_a_task(self):
+        model_admin = admin.site.get_model_admin(UserAccount)
+
+        with (
+            mock.patch.object(model_admin, "bulk_update_sync_limit", 2),
+            mock.patch.object(
+                run_bulk_update,
+                "delay",
+                side_effect=lambda *args: run_bulk_update.apply(args),
+            ) as delay,
+        ):
+            response = self.run_action(
+                "deactivate_users",
+                select_across=1,
+                _selected_action=[self.users[0].pk],
+            )
+
+        self.assertEqual(
+            delay.call_args.args[:2], ("users.UserAccount", "deactivate_users")
+        )
+        (message,) = self.messages(response)
+        self.assertIn("running in the background", message)
+        self.assertFalse(UserAccount.objects.filter(is_active=True).exists())
+
+    def test_task_rejects_a_tampered_query(self):
+        with self.assertRaises(signing.BadSignature):
+            run_bulk_update.apply(
+                ("users.UserAccount", "deactivate_users", "tampered"),
+                throw=True,
+            )
+        self.assertEqual(UserAccount.objects.filter(is_active=True).count(), 4)
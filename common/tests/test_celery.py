@@ -0,0 +1,62 @@
+import threading
+
+from celery.contrib.testing.worker import start_worker
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from common.logging import CorrelationIdMiddleware, get_correlation_id
+from config.extensions.celery import app
+
+seen = {}
+ran = threading.Event()
+
+
+@app.task(name="common.tests.record_correlation_id", ignore_result=True)
+def record_correlation_id():
+    seen["correlation_id"] = get_correlation_id()
+    ran.set()
+
+
+class CorrelationIdPropagationTests(SimpleTestCase):
+    # The worker warms up its database connection when it starts
+    databases = {"default"}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Settings are read with the CELERY_ namespace
+        cls.broker_url = app.conf.CELERY_BROKER_URL
+        app.conf.CELERY_BROKER_URL = "memory://"
+        app.close()
+        cls.worker = start_worker(
+            app, pool="solo", perform_ping_check=False, shutdown_timeout=10
+        )
+        cls.worker.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.worker.__exit__(None, None, None)
+        app.conf.CELERY_BROKER_URL = cls.broker_url
+        app.close()
+        super().tearDownClass()
+
+    def setUp(self):
+        seen.clear()
+        ran.clear()
+
+    def test_task_logs_with_the_request_id(self):
+        def view(request):
+            record_correlation_id.delay()
+            return HttpResponse()
+
+        middleware = CorrelationIdMiddleware(view)
+        middleware(RequestFactory().get("/", HTTP_X_REQUEST_ID="request-123"))
+
+        self.assertTrue(ran.wait(10))
+        self.assertEqual(seen["correlation_id"], "request-123")
+
+    def test_task_without_a_request_uses_its_own_id(self):
+        result = record_correlation_id.delay()
+
+        self.assertTrue(ran.wait(10))
+        self.assertEqual(seen["correlation_id"], result.id)
@@ -0,0 +1,161 @@
+import gzip
+import json
+
+import brotli
+import zstandard
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from common.compression import CompressionMiddleware
+
+BODY = json.dumps([{"id": i, "name": "Jane Doe"} for i in range(100)]).encode()
+
+
+@override_settings(
+    COMPRESSION_MIN_SIZE=200, COMPRESSION_EXCLUDE_COOKIES=["access", "refresh"]
+)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def get(self, response, accept_encoding="gzip, deflate, br, zstd"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=BODY):
+        return HttpResponse(body, content_type="application/json")
+
+    def test_prefers_brotli(self):
+        response = self.get(self.json_response())
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), BODY)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_negotiates_the_accepted_encoding(self):
+        decompressors = {
+            "zstd": zstandard.ZstdDecompressor().decompress,
+            "gzip": gzip.decompress,
+        }
+        for encoding, decompress in decompressors.items():
+            with self.subTest(encoding):
+                response = self.get(self.json_response(), f"{encoding}, deflate")
+
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertEqual(decompress(response.content), BODY)
+
+    def test_skips_encodings_with_zero_quality(self):
+        response = self.get(self.json_response(), "br;q=0, gzip;q=0.5")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_wildcard_accepts_the_preferred_encoding(self):
+        response = self.get(self.json_response(), "*")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_refused_encoding_is_not_picked_through_the_wildcard(self):
+        response = self.get(self.json_response(), "br;q=0, *")
+
+        self.assertEqual(response["Content-Encoding"], "zstd")
+
+    def test_prefers_the_highest_quality(self):
+        for accept_encoding, encoding in (
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0.8, br;q=0.9", "br"),
+            ("*;q=0.1, gzip;q=0.2", "gzip"),
+            ("gzip;q=1, br;q=1", "br"),
+            ("GZIP; Q=0.9", "gzip"),
+        ):
+            with self.subTest(accept_encoding):
+                response = self.get(self.json_response(), accept_encoding)
+
+                self.assertEqual(response["Content-Encoding"], encoding)
+
+    def test_no_accepted_encoding(self):
+        for accept_encoding in ("", "identity", "deflate", "*;q=0", "gzip;q=x"):
+            with self.subTest(accept_encoding):
+                response = self.get(self.json_response(), accept_encoding)
+
+                self.assertFalse(response.has_header("Content-Encoding"))
+                self.assertEqual(response.content, BODY)
+                self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_small_body_is_not_compressed(self):
+        response = self.get(self.json_response(b'{"id": 1}'))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_incompressible_type_is_not_compressed(self):
+        response = self.get(HttpResponse(BODY, content_type="image/png"))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_compressible_types(self):
+        for content_type in (
+            "text/html; charset=utf-8",
+            "application/problem+json",
+            "application/vnd.oai.openapi+json",
+            "application/yaml",
+        ):
+            with self.subTest(content_type):
+                response = self.get(HttpResponse(BODY, content_type=content_type))
+
+                self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_response_setting_auth_cookies_is_not_compressed(self):
+        # BREACH: the tokens are in both the cookie and the body
+        response = JsonResponse({"access": "secret" * 50, "refresh": "secret"})
+        response.set_cookie("access", "secret" * 50)
+
+        response = self.get(response)
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn(b"secret", response.content)
+
+    def test_other_cookies_do_not_prevent_compression(self):
+        response = self.json_response()
+        response.set_cookie("theme", "dark")
+
+        self.assertEqual(self.get(response)["Content-Encoding"], "br")
+
+    def test_encoded_response_is_left_alone(self):
+        compressed = gzip.compress(BODY)
+        response = HttpResponse(compressed, content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+
+        response = self.get(response, "br")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response.content, compressed)
+
+    def test_partial_response_is_left_alone(self):
+        response = self.json_response()
+        response["Content-Range"] = f"bytes 0-{len(BODY) - 1}/{len(BODY) * 2}"
+
+        self.assertFalse(self.get(response).has_header("Content-Encoding"))
+
+    def test_streaming_response_is_compressed_per_chunk(self):
+        chunks = [BODY[:1000], b"", BODY[1000:]]
+        response = StreamingHttpResponse(chunks, content_type="application/json")
+        response["Content-Length"] = str(len(BODY))
+
+        response = self.get(response, "gzip")
+        compressed = list(response.streaming_content)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        # One flushed block per non-empty chunk, then the trailer
+        self.assertEqual(len(compressed), 3)
+        self.assertEqual(gzip.decompress(b"".join(compressed)), BODY)
+
+    def test_strong_etag_is_weakened(self):
+        response = self.json_response()
+        response["ETag"] = '"abc"'
+
+        self.assertEqual(self.get(response)["ETag"], 'W/"abc"')
+
+    def test_weak_etag_is_kept(self):
+        response = self.json_response()
+        response["ETag"] = 'W/"abc"'
+
+        self.assertEqual(self.get(response)["ETag"], 'W/"abc"')
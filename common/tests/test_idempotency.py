@@ -0,0 +1,75 @@
+from unittest import mock
+
+from celery import Task
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from config.extensions.celery import app
+from config.extensions.idempotency import IdempotentTask
+
+calls = []
+
+
+@app.task(
+    base=IdempotentTask,
+    name="common.tests.send_code",
+    idempotency_args=["email"],
+    ignore_result=True,
+)
+def send_code(email, code, fail=False):
+    calls.append((email, code))
+    if fail:
+        raise ConnectionError("SMTP server unavailable")
+
+
+class IdempotentTaskTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        calls.clear()
+        patcher = mock.patch.object(Task, "apply_async", autospec=True)
+        self.publish = patcher.start()
+        self.publish.side_effect = lambda task, args, kwargs, task_id, **options: (
+            task.AsyncResult(task_id)
+        )
+        self.addCleanup(patcher.stop)
+
+    def test_duplicate_enqueue_is_not_published(self):
+        first = send_code.delay("jane@example.com", "123456")
+        second = send_code.delay("jane@example.com", "123456")
+
+        self.assertEqual(self.publish.call_count, 1)
+        self.assertEqual(second.id, first.id)
+
+    def test_key_only_uses_idempotency_args(self):
+        send_code.delay("jane@example.com", "123456")
+        send_code.delay("jane@example.com", "654321")
+        send_code.delay("john@example.com", "123456")
+
+        self.assertEqual(self.publish.call_count, 2)
+
+    def test_duplicate_run_is_skipped(self):
+        send_code.apply(("jane@example.com", "123456"), task_id="first")
+        send_code.apply(("jane@example.com", "123456"), task_id="redelivered")
+
+        self.assertEqual(calls, [("jane@example.com", "123456")])
+
+    def test_failed_run_lets_the_next_enqueue_through(self):
+        pending = send_code.delay("jane@example.com", "123456", fail=True)
+        send_code.apply(
+            ("jane@example.com", "123456"), {"fail": True}, task_id=pending.id
+        )
+
+        resent = send_code.delay("jane@example.com", "123456")
+        self.assertEqual(self.publish.call_count, 2)
+        self.assertNotEqual(resent.id, pending.id)
+
+        # Not marked done either, so the new copy runs
+        send_code.apply(("jane@example.com", "123456"), task_id=resent.id)
+        self.assertEqual(len(calls), 2)
+
+    def test_successful_run_keeps_collapsing_duplicates(self):
+        pending = send_code.delay("jane@example.com", "123456")
+        send_code.apply(("jane@example.com", "123456"), task_id=pending.id)
+
+        self.assertEqual(send_code.delay("jane@example.com", "123456").id, pending.id)
+        self.assertEqual(self.publish.call_count, 1)
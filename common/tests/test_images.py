@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db.models.fields.files import FieldFile
+from django.test import SimpleTestCase
+from PIL import Image
+
+from common.images import create_derivatives, derivative_name, pick_derivative
+from users.models import UserAccount
+
+
+def image_file(size, mode="RGB", image_format="PNG"):
+    buffer = BytesIO()
+    Image.new(mode, size).save(buffer, image_format)
+    return ContentFile(buffer.getvalue())
+
+
+class CreateDerivativesTests(SimpleTestCase):
+    def setUp(self):
+        self.storage = FileSystemStorage(location=tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.storage.location)
+        self.field = UserAccount._meta.get_field("profile_picture")
+
+    def field_file(self, content, name="avatars/me.png"):
+        name = self.storage.save(name, content)
+        field_file = FieldFile(None, self.field, name)
+        field_file.storage = self.storage
+        return field_file
+
+    def test_creates_each_size_and_format(self):
+        field_file = self.field_file(image_file((600, 300)))
+
+        derivatives = create_derivatives(field_file)
+
+        self.assertEqual(
+            [(item["size"], item["format"]) for item in derivatives],
+            [(size, ext) for size in (64, 128, 256, 512) for ext in ("jpg", "webp")],
+        )
+        for item in derivatives:
+            self.assertEqual(
+                item["name"],
+                derivative_name("avatars/me.png", item["size"], item["format"]),
+            )
+            self.assertEqual(
+                (item["width"], item["height"]), (item["size"], item["size"] // 2)
+            )
+            with self.storage.open(item["name"]) as file, Image.open(file) as image:
+                self.assertEqual(image.size, (item["width"], item["height"]))
+                self.assertEqual(
+                    image.format, "WEBP" if item["format"] == "webp" else "JPEG"
+                )
+
+    def test_does_not_upscale(self):
+        field_file = self.field_file(image_file((100, 100)))
+
+        derivatives = create_derivatives(field_file)
+
+        self.assertEqual({item["size"] for item in derivatives}, {64})
+
+    def test_smallest_size_is_kept_for_tiny_images(self):
+        field_file = self.field_file(image_file((20, 10)))
+
+        derivatives = create_derivatives(field_file)
+
+        self.assertEqual({item["size"] for item in derivatives}, {64})
+        self.assertEqual((derivatives[0]["width"], derivatives[0]["height"]), (20, 10))
+
+    def test_transparency_is_flattened_for_jpeg(self):
+        field_file = self.field_file(image_file((100, 100), mode="RGBA"))
+
+        derivatives = create_derivatives(field_file)
+
+        jpeg = next(item for item in derivatives if item["format"] == "jpg")
+        with self.storage.open(jpeg["name"]) as file, Image.open(file) as image:
+            self.assertEqual(image.mode, "RGB")
+
+
+class PickDerivativeTests(SimpleTestCase):
+    derivatives = [
+        {"size": size, "format": ext, "name": f"me_{size}.{ext}"}
+        for size in (64, 128, 256)
+        for ext in ("jpg", "webp")
+    ]
+
+    def test_smallest_covering_the_size(self):
+        self.assertEqual(pick_derivative(self.derivatives, 100)["name"], "me_128.webp")
+        self.assertEqual(
+            pick_derivative(self.derivatives, 128, "jpg")["name"], "me_128.jpg"
+        )
+
+    def test_largest_without_or_beyond_the_size(self):
+        self.assertEqual(pick_derivative(self.derivatives)["name"], "me_256.webp")
+        self.assertEqual(pick_derivative(self.derivatives, 1000)["name"], "me_256.webp")
+
+    def test_none_without_derivatives_in_the_format(self):
+        self.assertIsNone(pick_derivative([]))
+        self.assertIsNone(pick_derivative(None))
+        self.assertIsNone(pick_derivative(self.derivatives, extension="avif"))
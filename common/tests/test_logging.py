@@ -0,0 +1,122 @@
+import json
+import logging
+import logging.handlers
+import queue
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from common.logging import (
+    JSONFormatter,
+    QueueHandler,
+    dropped_records,
+    reset_correlation_id,
+    set_correlation_id,
+)
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(**attributes):
+    return logging.makeLogRecord(
+        {"name": "test", "levelno": logging.INFO, "levelname": "INFO", **attributes}
+    )
+
+
+class JSONFormatterTests(SimpleTestCase):
+    def format(self, record):
+        return json.loads(JSONFormatter().format(record))
+
+    def test_formats_the_record_and_its_extra_fields(self):
+        record = make_record(msg="Hello %s", args=("world",), user_id=42)
+
+        data = self.format(record)
+
+        self.assertEqual(data["message"], "Hello world")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["user_id"], 42)
+        self.assertTrue(data["timestamp"].endswith("Z"))
+
+    def test_falls_back_to_the_current_correlation_id(self):
+        token = set_correlation_id("abc")
+        self.addCleanup(reset_correlation_id, token)
+
+        data = self.format(make_record(msg="Hello"))
+
+        self.assertEqual(data["correlation_id"], "abc")
+
+    def test_correlation_id_of_the_record_wins(self):
+        token = set_correlation_id("abc")
+        self.addCleanup(reset_correlation_id, token)
+
+        data = self.format(make_record(msg="Hello", correlation_id=None))
+
+        self.assertIsNone(data["correlation_id"])
+
+
+class QueueHandlerTests(SimpleTestCase):
+    def make_handler(self, maxsize=10):
+        self.target = CollectingHandler()
+        handler = QueueHandler(queue.Queue(maxsize))
+        handler.listener = logging.handlers.QueueListener(handler.queue, self.target)
+        self.addCleanup(handler._stop_listener)
+        return handler
+
+    def test_listener_writes_the_records(self):
+        handler = self.make_handler()
+        token = set_correlation_id("abc")
+        try:
+            handler.handle(make_record(msg="Hello %s", args=("world",)))
+        finally:
+            reset_correlation_id(token)
+
+        handler._stop_listener()
+
+        (record,) = self.target.records
+        self.assertEqual(record.getMessage(), "Hello world")
+        self.assertEqual(record.correlation_id, "abc")
+
+    def test_full_queue_drops_and_reports(self):
+        handler = self.make_handler(maxsize=2)
+        handler.listener = None  # Nothing drains the queue
+        before = dropped_records().get("test", 0)
+
+        for message in ("kept", "kept", "dropped"):
+            handler.handle(make_record(msg=message))
+        self.assertEqual(dropped_records()["test"], before + 1)
+
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(make_record(msg="kept too"))
+
+        self.assertEqual(handler.queue.get_nowait().getMessage(), "kept too")
+        report = handler.queue.get_nowait()
+        self.assertEqual(report.levelno, logging.WARNING)
+        self.assertEqual(report.dropped_records, 1)
+
+    def test_child_process_starts_its_own_listener(self):
+        handler = self.make_handler()
+        handler.handle(make_record(msg="parent"))
+        parent_listener = handler._process_listener
+        parent_queue = handler.queue
+
+        with mock.patch("common.logging.os.getpid", return_value=-1):
+            handler._after_fork()
+            handler.handle(make_record(msg="child"))
+
+            self.assertIsNot(handler.queue, parent_queue)
+            self.assertIsNot(handler._process_listener, parent_listener)
+            handler._stop_listener()
+
+        parent_listener.stop()
+        self.assertCountEqual(
+            [record.getMessage() for record in self.target.records],
+            ["parent", "child"],
+        )
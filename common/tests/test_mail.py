@@ -0,0 +1,64 @@
+import asyncio
+
+import aiosmtplib
+from django.test import SimpleTestCase
+
+from common.mail import SMTPPool
+from common.management.commands.smtp_sink import SMTPSink
+
+
+class RefusingSMTPSink(SMTPSink):
+    """Refuses mail to ``refused@example.com``, and counts connections."""
+
+    connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        await super().handle(RefusingReader(reader, writer), writer)
+
+
+class RefusingReader:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def readline(self):
+        while (
+            (line := await self.reader.readline())
+            .upper()
+            .startswith(b"RCPT TO:<REFUSED@")
+        ):
+            self.writer.write(b"550 Mailbox unavailable\r\n")
+            await self.writer.drain()
+        return line
+
+
+class SMTPPoolTests(SimpleTestCase):
+    async def send(self, *recipients):
+        sink = RefusingSMTPSink(verbosity=0)
+        server = await asyncio.start_server(sink.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        pool = SMTPPool(1, hostname="127.0.0.1", port=port, timeout=5)
+        errors = []
+        async with server:
+            for recipient in recipients:
+                try:
+                    await pool.send("app@example.com", [recipient], b"Hello\r\n")
+                except aiosmtplib.SMTPException as e:
+                    errors.append(type(e))
+            await pool.close()
+        return sink, errors
+
+    def test_reuses_the_connection(self):
+        sink, errors = asyncio.run(self.send("jane@example.com", "john@example.com"))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sink.received, 2)
+        self.assertEqual(sink.connections, 1)
+
+    def test_refused_recipient_keeps_the_connection(self):
+        sink, errors = asyncio.run(self.send("refused@example.com", "jane@example.com"))
+
+        self.assertEqual(errors, [aiosmtplib.SMTPRecipientsRefused])
+        self.assertEqual(sink.received, 1)
+        self.assertEqual(sink.connections, 1)
@@ -0,0 +1,92 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+from prometheus_client import REGISTRY
+
+MODULE = "common.tests.test_metrics"
+
+
+def view(request, pk=None):
+    return HttpResponse("ok")
+
+
+urlpatterns = [
+    path("items/<int:pk>/", view, name="item"),
+    path("unnamed/", view),
+]
+
+
+def sample(name, view, method="GET", status="200"):
+    value = REGISTRY.get_sample_value(
+        name, {"view": view, "method": method, "status": status}
+    )
+    return value or 0
+
+
+def requests_count(view, method="GET", status="200"):
+    return sample("django_http_request_duration_seconds_count", view, method, status)
+
+
+@override_settings(ROOT_URLCONF=MODULE)
+class MetricsMiddlewareTests(SimpleTestCase):
+    def test_requests_are_labelled_by_url_name(self):
+        before = requests_count("item")
+        size_before = sample("django_http_response_size_bytes_sum", "item")
+
+        self.client.get("/items/1/")
+        self.client.get("/items/2/")
+
+        self.assertEqual(requests_count("item"), before + 2)
+        self.assertEqual(
+            sample("django_http_response_size_bytes_sum", "item"), size_before + 4
+        )
+
+    def test_unresolved_paths_share_a_label(self):
+        before_unresolved = requests_count("<unresolved>", status="404")
+        # Django names unnamed routes after the view's dotted path
+        before_unnamed = requests_count(f"{MODULE}.view")
+
+        self.client.get("/missing/1/")
+        self.client.get("/missing/2/")
+        self.client.get("/unnamed/")
+
+        self.assertEqual(
+            requests_count("<unresolved>", status="404"), before_unresolved + 2
+        )
+        self.assertEqual(requests_count(f"{MODULE}.view"), before_unnamed + 1)
+
+    def test_unknown_methods_are_grouped(self):
+        before = requests_count("item", method="other")
+
+        self.client.generic("BREW", "/items/1/")
+
+        self.assertEqual(requests_count("item", method="other"), before + 1)
+
+
+class MetricsViewTests(SimpleTestCase):
+    url = "/metrics/"
+
+    @override_settings(METRICS_TOKEN="")
+    def test_open_without_a_token(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"django_http_request_duration_seconds", response.content)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token_is_required_when_set(self):
+        for headers in (
+            {},
+            {"Authorization": "Bearer other"},
+            {"Authorization": "secret"},
+        ):
+            with self.subTest(headers):
+                response = self.client.get(self.url, headers=headers)
+
+                self.assertEqual(response.status_code, 403)
+
+        response = self.client.get(self.url, headers={"Authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_only_get_is_allowed(self):
+        self.assertEqual(self.client.post(self.url).status_code, 405)
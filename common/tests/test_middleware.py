@@ -0,0 +1,172 @@
+from django.core import checks
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+
+from common.middleware import ADMIN_MIDDLEWARE, check_admin_scope
+
+MODULE = "common.tests.test_middleware"
+
+trace = []
+
+
+class TracingMiddleware:
+    name = None
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trace.append(f"{self.name} in")
+        response = self.get_response(request)
+        trace.append(f"{self.name} out")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        trace.append(f"{self.name} view")
+
+    def process_exception(self, request, exception):
+        trace.append(f"{self.name} exception")
+
+
+class First(TracingMiddleware):
+    name = "first"
+
+
+class Second(TracingMiddleware):
+    name = "second"
+
+
+class Api(TracingMiddleware):
+    name = "api"
+
+
+class Handled(TracingMiddleware):
+    name = "handled"
+
+    def process_exception(self, request, exception):
+        trace.append(f"{self.name} exception")
+        return HttpResponse("handled", status=500)
+
+
+def view(request):
+    trace.append("view")
+    return HttpResponse()
+
+
+def failing_view(request):
+    raise ValueError
+
+
+urlpatterns = [
+    path("api/v1/view/", view),
+    path("api/v2/view/", view),
+    path("admin/view/", view),
+    path("docs/api/", view),
+    path("fail/", failing_view),
+]
+
+
+@override_settings(
+    ROOT_URLCONF=MODULE,
+    MIDDLEWARE=["common.middleware.ScopedMiddleware"],
+    SCOPED_MIDDLEWARE={
+        "api/": [f"{MODULE}.Api"],
+        "api/v2/": [f"{MODULE}.Second"],
+        "": [f"{MODULE}.First", f"{MODULE}.Second"],
+    },
+)
+class ScopedMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        trace.clear()
+
+    def test_runs_the_chain_of_the_matching_prefix(self):
+        self.client.get("/api/v1/view/")
+
+        self.assertEqual(trace, ["api in", "api view", "view", "api out"])
+
+    def test_longest_prefix_wins(self):
+        self.client.get("/api/v2/view/")
+
+        self.assertEqual(trace, ["second in", "second view", "view", "second out"])
+
+    def test_fallback_chain_runs_in_order(self):
+        self.client.get("/admin/view/")
+
+        self.assertEqual(
+            trace,
+            [
+                "first in",
+                "second in",
+                "first view",
+                "second view",
+                "view",
+                "second out",
+                "first out",
+            ],
+        )
+
+    def test_prefix_must_match_from_the_start(self):
+        self.client.get("/docs/api/")
+
+        self.assertEqual(trace[0], "first in")
+        self.assertNotIn("api in", trace)
+
+    @override_settings(SCOPED_MIDDLEWARE={"": [f"{MODULE}.First", f"{MODULE}.Handled"]})
+    def test_exception_middleware_of_the_scope(self):
+        response = self.client.get("/fail/")
+
+        self.assertEqual(response.content, b"handled")
+        # Innermost first, and the first response stops the chain
+        self.assertEqual(
+            trace,
+            [
+                "first in",
+                "handled in",
+                "first view",
+                "handled view",
+                "handled exception",
+                "handled out",
+                "first out",
+            ],
+        )
+
+
+class AdminScopeCheckTests(SimpleTestCase):
+    def test_default_settings_pass(self):
+        self.assertEqual(check_admin_scope(None), [])
+
+    def test_admin_scope_with_its_middleware_passes(self):
+        scopes = {"admin/": ADMIN_MIDDLEWARE, "": []}
+        with override_settings(SCOPED_MIDDLEWARE=scopes):
+            self.assertEqual(check_admin_scope(None), [])
+
+    def test_missing_admin_middleware(self):
+        for missing in ADMIN_MIDDLEWARE:
+            chain = [path for path in ADMIN_MIDDLEWARE if path != missing]
+            with (
+                self.subTest(missing),
+                override_settings(SCOPED_MIDDLEWARE={"": chain}),
+            ):
+                (error,) = check_admin_scope(None)
+
+                self.assertEqual(error.id, "common.E001")
+
+    def test_admin_middleware_out_of_order(self):
+        with override_settings(SCOPED_MIDDLEWARE={"": ADMIN_MIDDLEWARE[::-1]}):
+            (error,) = check_admin_scope(None)
+
+        self.assertEqual(error.id, "common.E001")
+
+    def test_admin_prefix_is_checked_over_the_fallback(self):
+        scopes = {"admin/": [], "": ADMIN_MIDDLEWARE}
+        with override_settings(SCOPED_MIDDLEWARE=scopes):
+            (error,) = check_admin_scope(None)
+
+        self.assertIn("'admin/'", error.msg)
+
+    def test_check_is_registered(self):
+        with override_settings(SCOPED_MIDDLEWARE={"": []}):
+            errors = checks.run_checks(tags=[checks.Tags.admin])
+
+        self.assertIn("common.E001", [error.id for error in errors])
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest import mock
+
+from celery import Task
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from common.logging import get_correlation_id, reset_correlation_id, set_correlation_id
+from common.models import OutboxMessage
+from common.outbox import backoff, dispatch, pending_messages, relay_batch
+from config.extensions.celery import app
+
+
+@app.task(name="common.tests.notify", ignore_result=True)
+def notify(name):
+    pass
+
+
+class DispatchTests(TestCase):
+    def test_stores_the_task_call(self):
+        message = dispatch(notify, args=("jane",), ordering_key="jane", queue="low")
+
+        self.assertEqual(message.task, "common.tests.notify")
+        self.assertEqual(message.args, ["jane"])
+        self.assertEqual(message.options, {"queue": "low"})
+        self.assertEqual(message.ordering_key, "jane")
+
+    def test_rolled_back_message_is_not_kept(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            dispatch(notify, args=("jane",))
+            raise RuntimeError
+
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_countdown_delays_the_message(self):
+        dispatch(notify, args=("jane",), countdown=60)
+
+        self.assertFalse(pending_messages().exists())
+        later = timezone.now() + timedelta(seconds=61)
+        self.assertTrue(pending_messages(later).exists())
+
+    def test_keeps_the_correlation_id(self):
+        token = set_correlation_id("request-123")
+        try:
+            message = dispatch(notify, args=("jane",))
+        finally:
+            reset_correlation_id(token)
+
+        self.assertEqual(message.correlation_id, "request-123")
+
+
+class RelayTests(TestCase):
+    def setUp(self):
+        self.published = []
+
+    def publish(self, message):
+        self.published.append(message.args)
+
+    def fail(self, message):
+        raise ConnectionError("Broker unavailable")
+
+    def test_messages_with_the_same_key_are_published_in_order(self):
+        dispatch(notify, args=("first",), ordering_key="jane")
+        dispatch(notify, args=("second",), ordering_key="jane")
+        dispatch(notify, args=("other",), ordering_key="john")
+
+        self.assertEqual([m.args for m in pending_messages()], [["first"], ["other"]])
+
+        relay_batch(self.fail)
+        # The first message is waiting for its retry, and holds the second back
+        self.assertEqual([m.args for m in pending_messages()], [["other"]])
+
+        later = timezone.now() + timedelta(seconds=backoff(1))
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            relay_batch(self.publish)
+            relay_batch(self.publish)
+
+        self.assertEqual(self.published, [["first"], ["other"], ["second"]])
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_failed_publish_backs_off(self):
+        message = dispatch(notify, args=("jane",))
+
+        published, failed = relay_batch(self.fail)
+
+        self.assertEqual((published, failed), ([], [message]))
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 1)
+        self.assertEqual(message.last_error, "ConnectionError: Broker unavailable")
+        self.assertGreater(message.available_at, timezone.now())
+        self.assertIsNone(message.failed_at)
+
+    def test_message_fails_after_max_attempts(self):
+        message = dispatch(notify, args=("jane",))
+
+        for _ in range(3):
+            OutboxMessage.objects.update(available_at=timezone.now())
+            relay_batch(self.fail, max_attempts=3)
+
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 3)
+        self.assertIsNotNone(message.failed_at)
+        self.assertFalse(pending_messages(timezone.now() + timedelta(days=1)).exists())
+
+    def test_failed_message_holds_its_key_back(self):
+        dispatch(notify, args=("first",), ordering_key="jane")
+        dispatch(notify, args=("second",), ordering_key="jane")
+        dispatch(notify, args=("other",), ordering_key="john")
+        relay_batch(self.fail, max_attempts=1)
+
+        later = timezone.now() + timedelta(days=1)
+        self.assertEqual([m.args for m in pending_messages(later)], [["other"]])
+
+        # Retried from the admin
+        OutboxMessage.objects.filter(failed_at__isnull=False).update(
+            attempts=0, failed_at=None, available_at=timezone.now()
+        )
+        relay_batch(self.publish)
+        relay_batch(self.publish)
+        self.assertEqual(self.published, [["first"], ["other"], ["second"]])
+
+    def test_backoff_is_capped(self):
+        self.assertEqual([backoff(n) for n in range(1, 4)], [2, 4, 8])
+        self.assertEqual(backoff(20), 300)
+
+    def test_relay_publishes_with_the_dispatching_correlation_id(self):
+        token = set_correlation_id("request-123")
+        try:
+            dispatch(notify, args=("jane",))
+        finally:
+            reset_correlation_id(token)
+        seen = []
+
+        with (
+            mock.patch.object(
+                Task,
+                "apply_async",
+                autospec=True,
+                side_effect=lambda *args, **kwargs: seen.append(get_correlation_id()),
+            ),
+            # Leave the test runner's signal handlers alone
+            mock.patch("signal.signal"),
+        ):
+            call_command("relay_outbox", once=True)
+
+        self.assertEqual(seen, ["request-123"])
+        self.assertIsNone(get_correlation_id())
+        self.assertFalse(OutboxMessage.objects.exists())
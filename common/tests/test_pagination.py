@@ -0,0 +1,89 @@
+from datetime import UTC, datetime
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common.pagination import KeysetPagination
+from common.utils import default_uuid, uuid7, uuid7_from_datetime, uuid7_to_datetime
+from users.models import UserAccount
+
+
+class UUID7Tests(TestCase):
+    def test_uuid7_is_time_ordered(self):
+        values = [uuid7() for _ in range(1000)]
+        self.assertEqual(values, sorted(values))
+        self.assertTrue(all(value.version == 7 for value in values))
+
+    def test_uuid7_datetime_round_trip(self):
+        moment = datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=UTC)
+        self.assertEqual(uuid7_to_datetime(uuid7_from_datetime(moment)), moment)
+
+    def test_default_uuid(self):
+        self.assertEqual(default_uuid().version, 4)
+        with override_settings(UUID7_PRIMARY_KEYS=True):
+            self.assertEqual(default_uuid().version, 7)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        UserAccount.objects.bulk_create(
+            UserAccount(
+                email=f"user{n}@example.com",
+                username=f"user{n}",
+                first_name="User",
+                last_name=str(n),
+            )
+            for n in range(25)
+        )
+        cls.ids = list(UserAccount.objects.order_by("-id").values_list("id", flat=True))
+
+    def paginate(self, url):
+        request = Request(APIRequestFactory().get(url))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(UserAccount.objects.all(), request)
+        return paginator, [user.id for user in page]
+
+    def test_walks_all_rows_newest_first(self):
+        seen = []
+        url = "/users/?limit=10"
+        while url:
+            paginator, ids = self.paginate(url)
+            seen += ids
+            url = paginator.get_next_link()
+        self.assertEqual(seen, self.ids)
+
+    def test_previous_link_returns_to_the_previous_page(self):
+        first, first_ids = self.paginate("/users/?limit=10")
+        second, _ = self.paginate(first.get_next_link())
+        _, ids = self.paginate(second.get_previous_link())
+        self.assertEqual(ids, first_ids)
+
+    def test_page_is_a_single_keyset_query(self):
+        first, _ = self.paginate("/users/?limit=10")
+        with CaptureQueriesContext(connection) as queries:
+            self.paginate(first.get_next_link())
+
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"]
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+        self.assertIn('"id" <', sql)
+
+    def test_limit_is_capped(self):
+        paginator, ids = self.paginate("/users/?limit=1000")
+        self.assertEqual(paginator.page_size, KeysetPagination.max_page_size)
+        self.assertEqual(len(ids), 25)
+
+    def test_response_shape(self):
+        paginator, _ = self.paginate("/users/?limit=10")
+        response = paginator.get_paginated_response([])
+        self.assertEqual(
+            set(response.data),
+            {"pageSize", "hasNext", "hasPrevious", "next", "previous", "results"},
+        )
+        self.assertTrue(response.data["hasNext"])
+        self.assertFalse(response.data["hasPrevious"])
@@ -0,0 +1,39 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+
+from common.parsers import ORJSONParser
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def parse(self, body, encoding=None):
+        context = {"encoding": encoding} if encoding else None
+        return ORJSONParser().parse(BytesIO(body), parser_context=context)
+
+    def test_parses_json(self):
+        self.assertEqual(
+            self.parse(b'{"name": "Jan\\u00e9", "ids": [1, 2.5, null]}'),
+            {"name": "Jané", "ids": [1, 2.5, None]},
+        )
+
+    def test_other_charsets_are_decoded(self):
+        body = '{"name": "Jané"}'.encode("latin-1")
+
+        self.assertEqual(self.parse(body, encoding="latin-1"), {"name": "Jané"})
+
+    def test_wide_integers_are_exact(self):
+        for value in (2**64, -(2**63) - 1, 10**30):
+            with self.subTest(value):
+                self.assertEqual(self.parse(f"[{value}]".encode()), [value])
+
+    def test_invalid_bodies_raise_parse_errors(self):
+        for body in (
+            b'{"name": ',
+            b"[NaN]",
+            b"[Infinity]",
+            b'{"name": "\xff"}',
+            b"[100000000000000000000, NaN]",
+        ):
+            with self.subTest(body), self.assertRaises(ParseError):
+                self.parse(body)
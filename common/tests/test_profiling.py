@@ -0,0 +1,63 @@
+import time
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from common.profiling import ProfilingMiddleware
+
+
+def view(request):
+    time.sleep(0.05)
+    return HttpResponse("ok")
+
+
+@override_settings(PROFILING_SAMPLE_RATE=0.0, PROFILING_TOKEN="secret")
+class ProfilingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch("common.profiling.default_storage")
+        self.storage = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.middleware = ProfilingMiddleware(view)
+
+    def test_untriggered_requests_are_not_profiled(self):
+        response = self.middleware(RequestFactory().get("/"))
+
+        self.assertNotIn("X-Profile", response)
+        self.storage.save.assert_not_called()
+
+    def test_triggered_request_is_saved_in_the_background(self):
+        def slow_save(name, content):
+            time.sleep(0.5)
+            return name
+
+        self.storage.save.side_effect = slow_save
+
+        started = time.perf_counter()
+        response = self.middleware(RequestFactory().get("/", HTTP_X_PROFILE="secret"))
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.5)
+        name = response["X-Profile"]
+        self.assertTrue(name.startswith("profiles/"))
+        self.assertTrue(name.endswith(".speedscope.json"))
+
+        self.middleware.writer.join()
+        self.storage.save.assert_called_once()
+        saved_name, content = self.storage.save.call_args.args
+        self.assertEqual(saved_name, name)
+        self.assertIn(b'"type": "sampled"', content.read())
+
+    @override_settings(PROFILING_QUEUE_SIZE=1)
+    def test_profiles_are_dropped_when_the_storage_falls_behind(self):
+        middleware = ProfilingMiddleware(view)
+        self.storage.save.side_effect = lambda name, content: time.sleep(0.3)
+
+        responses = [
+            middleware(RequestFactory().get("/", HTTP_X_PROFILE="secret"))
+            for _ in range(3)
+        ]
+
+        self.assertIn("X-Profile", responses[0])
+        self.assertNotIn("X-Profile", responses[-1])
+        middleware.writer.join()
@@ -0,0 +1,73 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from common.renderers import CamelCaseORJSONRenderer, ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def render(self, data, renderer_class=ORJSONRenderer, media_type=None):
+        return renderer_class().render(data, media_type)
+
+    def test_renders_like_the_stock_renderer(self):
+        data = {
+            "name": "Jane  ",
+            "nested": [{"count": 1, "ok": True, "none": None}],
+            "big": 2**64,
+            "lazy": gettext_lazy("Hello"),
+            "date": datetime.date(2024, 1, 2),
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "amount": decimal.Decimal("1.50"),
+        }
+
+        self.assertEqual(self.render(data), JSONRenderer().render(data))
+
+    def test_datetimes_are_iso_8601(self):
+        value = datetime.datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.UTC)
+
+        self.assertEqual(self.render([value]), b'["2024-01-02T03:04:05.678000Z"]')
+
+    def test_wide_integers_fall_back_to_the_stock_renderer(self):
+        for value in (2**64, -(2**63) - 1, 10**30):
+            with self.subTest(value):
+                self.assertEqual(
+                    json.loads(self.render({"value": value})), {"value": value}
+                )
+
+    def test_non_finite_floats_are_null(self):
+        rendered = self.render([float("nan"), float("inf")])
+
+        self.assertEqual(rendered, b"[null,null]")
+
+    def test_indented_output_uses_the_stock_renderer(self):
+        rendered = self.render({"a": 1}, media_type="application/json; indent=2")
+
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_none_renders_nothing(self):
+        self.assertEqual(self.render(None), b"")
+
+    def test_camel_case_keys(self):
+        data = {
+            "first_name": "Jane",
+            "profile_picture": {"picture_url": None},
+            "user_list": [{"is_active": True}],
+            1: "one",
+        }
+
+        rendered = json.loads(self.render(data, CamelCaseORJSONRenderer))
+
+        self.assertEqual(
+            rendered,
+            {
+                "firstName": "Jane",
+                "profilePicture": {"pictureUrl": None},
+                "userList": [{"isActive": True}],
+                "1": "one",
+            },
+        )
@@ -0,0 +1,130 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import brotli
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+
+from common.schema import SchemaView, get_schema_document
+
+
+class SchemaViewTests(SimpleTestCase):
+    url = reverse("schema")
+
+    def setUp(self):
+        # Generated again for each test
+        patcher = mock.patch("common.schema._document", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, url=None, **headers):
+        return self.client.get(
+            url or self.url, HTTP_ACCEPT="application/vnd.oai.openapi+json", **headers
+        )
+
+    def test_serves_the_precomputed_schema(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, get_schema_document().body("json"))
+        self.assertEqual(json.loads(response.content)["info"]["title"], "Django API")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.get()["ETag"]
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_depends_on_the_format(self):
+        json_etag = self.get()["ETag"]
+
+        response = self.client.get(self.url, HTTP_ACCEPT="application/vnd.oai.openapi")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], json_etag)
+
+    def test_serves_the_compressed_body(self):
+        response = self.get(HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(
+            brotli.decompress(response.content), get_schema_document().body("json")
+        )
+
+    def test_query_parameters_generate_the_schema(self):
+        with mock.patch("common.schema.get_schema_document") as document:
+            response = self.get(f"{self.url}?lang=en")
+
+        document.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    def test_view_options_are_honored(self):
+        view = SchemaView.as_view(custom_settings={"TITLE": "Other API"})
+        request = RequestFactory().get(
+            self.url, HTTP_ACCEPT="application/vnd.oai.openapi+json"
+        )
+
+        response = view(request)
+        response.render()
+
+        self.assertEqual(json.loads(response.content)["info"]["title"], "Other API")
+
+
+class DocsViewTests(SimpleTestCase):
+    def test_docs_point_at_the_schema(self):
+        for name in ("swagger-ui", "redoc"):
+            with self.subTest(name):
+                response = self.client.get(reverse(name))
+
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, reverse("schema"))
+
+    def test_views_are_not_state_changing(self):
+        # Lazily imported views must stay CSRF exempt like APIView.as_view()
+        client = self.client_class(enforce_csrf_checks=True)
+
+        response = client.post(reverse("schema"))
+
+        self.assertEqual(response.status_code, 405)
+
+
+class OpenAPISchemaCommandTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = Path(directory) / "openapi.json"
+
+    def test_check_passes_for_an_up_to_date_file(self):
+        call_command("openapi_schema", file=str(self.path), stdout=StringIO())
+
+        stdout = StringIO()
+        call_command("openapi_schema", check=True, file=str(self.path), stdout=stdout)
+
+        self.assertEqual(stdout.getvalue(), f"{self.path} is up to date\n")
+
+    def test_check_fails_for_a_stale_file(self):
+        call_command("openapi_schema", file=str(self.path), stdout=StringIO())
+        schema = json.loads(self.path.read_bytes())
+        schema["info"]["title"] = "Stale"
+        self.path.write_text(json.dumps(schema))
+
+        with self.assertRaisesMessage(CommandError, "is out of date"):
+            call_command(
+                "openapi_schema", check=True, file=str(self.path), stderr=StringIO()
+            )
+
+    def test_check_fails_without_a_file(self):
+        with self.assertRaisesMessage(CommandError, "does not exist"):
+            call_command("openapi_schema", check=True, file=str(self.path))
@@ -0,0 +1,109 @@
+from datetime import UTC, datetime
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common.mixin import CamelSnakeMixin
+from common.renderers import ORJSONRenderer
+from common.serializers import ValuesSerializer
+from users.models import UserAccount
+
+FIELDS = [
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "created_at",
+    "email_verified_at",
+    "otp_expiry",
+    "profile_picture",
+]
+
+
+class UserValuesSerializer(ValuesSerializer):
+    class Meta:
+        model = UserAccount
+        fields = FIELDS
+
+
+class UserModelSerializer(CamelSnakeMixin, serializers.ModelSerializer):
+    class Meta:
+        model = UserAccount
+        fields = FIELDS
+
+
+class ValuesSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(5):
+            UserAccount.objects.create_user(
+                email=f"user{n}@example.com",
+                password="password",
+                first_name=f"Zoë {n}",
+                last_name="",
+                is_active=bool(n % 2),
+                email_verified_at=(
+                    datetime(2026, 1, n + 1, 12, 30, 15, 123456, tzinfo=UTC)
+                    if n % 2
+                    else None
+                ),
+                profile_picture=f"useraccount_files/{n}.jpg" if n % 3 else "",
+            )
+
+    def setUp(self):
+        # File URLs without S3 credentials
+        field = UserAccount._meta.get_field("profile_picture")
+        storage = FileSystemStorage(base_url="/media/")
+        patcher = mock.patch.object(field, "storage", storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def render(self, serializer_class, data, **kwargs):
+        return ORJSONRenderer().render(serializer_class(data, **kwargs).data)
+
+    def assertSameOutput(self, data, **kwargs):
+        self.assertEqual(
+            self.render(UserValuesSerializer, data, **kwargs),
+            self.render(UserModelSerializer, data, **kwargs),
+        )
+
+    def test_queryset_matches_model_serializer(self):
+        self.assertSameOutput(UserAccount.objects.order_by("id"), many=True)
+
+    def test_instance_matches_model_serializer(self):
+        for user in UserAccount.objects.all():
+            with self.subTest(user=user.email):
+                self.assertSameOutput(user)
+
+    def test_file_urls_match_with_a_request(self):
+        request = Request(APIRequestFactory().get("/"))
+        self.assertSameOutput(
+            UserAccount.objects.order_by("id"),
+            many=True,
+            context={"request": request},
+        )
+
+    def test_queryset_is_fetched_as_tuples(self):
+        queryset = UserAccount.objects.order_by("id")
+        with self.assertNumQueries(1):
+            data = UserValuesSerializer(queryset, many=True).data
+        self.assertEqual(len(data), 5)
+        self.assertEqual(
+            list(data[0]),
+            [
+                "id",
+                "email",
+                "firstName",
+                "lastName",
+                "isActive",
+                "createdAt",
+                "emailVerifiedAt",
+                "otpExpiry",
+                "profilePicture",
+            ],
+        )
@@ -1,4 +1,17 @@
 import os
+import secrets
+import threading
+import time
+import uuid
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+
+_uuid7_lock = threading.Lock()
+_uuid7_last_timestamp = 0
+_uuid7_counter = 0
 
 
 def dynamic_upload_path(instance, filename):
@@ -10,3 +23,83 @@ def dynamic_company_logo_upload_path(instance, filename):
     """Dynamic path for company logo uploads based on company name."""
     return os.path.join(f"company_logos/{instance.name}/", filename)
 
+
+def uuid7():
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits hold the Unix timestamp in milliseconds and the next 12
+    bits a counter, so UUIDs generated by one process are strictly increasing.
+    """
+    global _uuid7_last_timestamp, _uuid7_counter
+
+    with _uuid7_lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp > _uuid7_last_timestamp:
+            _uuid7_last_timestamp = timestamp
+            # Start the counter in the lower half so bursts rarely overflow
+            _uuid7_counter = secrets.randbits(11)
+        else:
+            _uuid7_counter += 1
+            if _uuid7_counter > 0xFFF:
+                # Counter exhausted within this millisecond, borrow the next one
+                _uuid7_last_timestamp += 1
+                _uuid7_counter = 0
+        timestamp = _uuid7_last_timestamp
+        counter = _uuid7_counter
+
+    value = (
+        (timestamp & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_from_datetime(value):
+    """
+    Return the smallest UUIDv7 for the given datetime.
+
+    Useful as a lower bound for ``id__gte`` filters on UUIDv7 keyed tables.
+    """
+    timestamp = int(value.timestamp() * 1000)
+    return uuid.UUID(int=(timestamp & 0xFFFFFFFFFFFF) << 80 | 0x7 << 76 | 0b10 << 62)
+
+
+def uuid7_to_datetime(value):
+    """Return the creation time embedded in a UUIDv7."""
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=UTC)
+
+
+def default_uuid():
+    """
+    Default for UUID primary keys.
+
+    Returns a time-ordered UUIDv7 when ``UUID7_PRIMARY_KEYS`` is enabled and
+    a random UUIDv4 otherwise.
+    """
+    if getattr(settings, "UUID7_PRIMARY_KEYS", False):
+        return uuid7()
+    return uuid.uuid4()
+
+
+def lazy_view(view_class, **initkwargs):
+    """
+    ``view_class.as_view(**initkwargs)`` for a DRF view given by dotted path,
+    imported on its first request instead of when the URLconf is loaded.
+
+    Like ``APIView.as_view()``, the view is CSRF exempt. It is not an API view
+    to drf-spectacular, so only use it for views excluded from the schema.
+    """
+    view = None
+
+    @csrf_exempt
+    def lazy(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_class).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return lazy
@@ -0,0 +1,7 @@
+# Load the Celery app with Django, so tasks queued by web processes use its
+# configuration and signal handlers (e.g. correlation ID propagation). Cheap:
+# celery itself is already imported by django_celery_results' models, the app
+# only adds a handful of modules (see manage.py profile_startup)
+from .extensions.celery import app as celery_app
+
+__all__ = ("celery_app",)
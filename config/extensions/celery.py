@@ -2,8 +2,14 @@ from __future__ import absolute_import, unicode_literals
 import os
 
 from celery import Celery
-from django.conf import settings
 from celery.schedules import crontab
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+)
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
 
@@ -14,7 +20,8 @@ app.conf.result_serializer = "json"
 app.conf.result_extended = True
 
 # app.config_from_envvar(settings.CELERY_BROKER_URL)
-app.config_from_object(settings, namespace="CELERY")
+# Passed by name so Django settings are only loaded when the app is configured
+app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Auto-discover tasks from all registered Django apps
 app.autodiscover_tasks()
@@ -30,4 +37,54 @@ app.conf.beat_schedule = {
         "task": "core.tasks.create_daily_ticker_summaries_task",
         "schedule": crontab(minute="*/30"),  # Run every 30 minutes
     },
-}
\ No newline at end of file
+}
+
+
+@worker_init.connect
+def warm_up_worker(**kwargs):
+    """Load URLs and templates once in the parent, before the pool forks."""
+    from config.warmup import close_connections, warm_up
+
+    warm_up(connect=False)
+    close_connections()
+
+
+@worker_process_init.connect
+def warm_up_worker_process(**kwargs):
+    """Open this pool process's own DB and cache connections before any task."""
+    from config.warmup import warm_up
+
+    warm_up()
+
+
+# Message header carrying the correlation ID. Not "correlation_id": the
+# worker fills request.correlation_id from the AMQP property, the task id
+CORRELATION_ID_HEADER = "x_correlation_id"
+
+
+@before_task_publish.connect
+def add_correlation_id(headers=None, **kwargs):
+    """Pass the current request's (or task's) correlation ID on to the task."""
+    from common.logging import get_correlation_id
+
+    correlation_id = get_correlation_id()
+    if headers is not None and correlation_id:
+        headers.setdefault(CORRELATION_ID_HEADER, correlation_id)
+
+
+@task_prerun.connect
+def set_task_correlation_id(task=None, task_id=None, **kwargs):
+    from common.logging import set_correlation_id
+
+    task.request.correlation_token = set_correlation_id(
+        task.request.get(CORRELATION_ID_HEADER) or task_id
+    )
+
+
+@task_postrun.connect
+def reset_task_correlation_id(task=None, **kwargs):
+    from common.logging import reset_correlation_id
+
+    token = getattr(task.request, "correlation_token", None)
+    if token is not None:
+        reset_correlation_id(token)
@@ -0,0 +1,109 @@
+"""
+Idempotent Celery tasks.
+
+A task using ``IdempotentTask`` as its base gets a key derived from its name
+and arguments (all of them, or those named in ``idempotency_args``), and
+uses the shared cache to make sure the same work runs once per
+``idempotency_window`` seconds:
+
+- enqueue: a duplicate ``delay()``/``apply_async()`` within the window is
+  not published; the ``AsyncResult`` of the pending task is returned instead
+- run: a short-lived lock stops two workers running the same key at once,
+  e.g. after a broker redelivery
+- completion is recorded, so a copy that still reaches a worker within the
+  window (client or broker level retries) is skipped
+- a run that fails releases the key, so the work can be queued again at
+  once (e.g. a user asking for another OTP after a failed send)
+
+::
+
+    @shared_task(base=IdempotentTask, idempotency_window=60)
+    def send_otp_email(email, otp): ...
+
+Retries (``self.retry()``) keep the task ID and are not treated as
+duplicates. A run lost with its worker leaves no trace but the pending key,
+which expires after ``idempotency_window``. The cache must be shared by web
+and worker processes (Redis via ``DJANGO_CACHE_URL``).
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+
+from celery import Task, states, uuid
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotentTask(Task):
+    # Names of the arguments that identify the work; None means all of them
+    idempotency_args = None
+    # Duplicates are collapsed for this many seconds after the first enqueue
+    # and after completion
+    idempotency_window = 60
+    # Upper bound on how long one run may hold the lock
+    idempotency_lock_timeout = 300
+    idempotency_cache = "default"
+
+    def idempotency_key(self, args=None, kwargs=None):
+        bound = inspect.signature(self.run).bind(*(args or ()), **(kwargs or {}))
+        bound.apply_defaults()
+        values = bound.arguments
+        if self.idempotency_args is not None:
+            values = {name: values[name] for name in self.idempotency_args}
+        digest = hashlib.sha256(
+            json.dumps(values, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"task-idempotency:{self.name}:{digest}"
+
+    @property
+    def idempotency_store(self):
+        return caches[self.idempotency_cache]
+
+    def apply_async(self, args=None, kwargs=None, task_id=None, **options):
+        task_id = task_id or uuid()
+        key = self.idempotency_key(args, kwargs)
+        cache = self.idempotency_store
+        if not cache.add(f"{key}:pending", task_id, timeout=self.idempotency_window):
+            pending_id = cache.get(f"{key}:pending")
+            if pending_id not in (None, task_id):
+                logger.info(
+                    "Dropped duplicate %s, pending as %s", self.name, pending_id
+                )
+                return self.AsyncResult(pending_id)
+        return super().apply_async(args, kwargs, task_id=task_id, **options)
+
+    def __call__(self, *args, **kwargs):
+        if self.request.called_directly:
+            return super().__call__(*args, **kwargs)
+
+        key = self.idempotency_key(args, kwargs)
+        cache = self.idempotency_store
+        task_id = self.request.id
+
+        done_by = cache.get(f"{key}:done")
+        if done_by is not None:
+            logger.info("Skipped %s, already done by %s", self.name, done_by)
+            return None
+        if not cache.add(f"{key}:lock", task_id, timeout=self.idempotency_lock_timeout):
+            logger.info("Skipped %s, already running", self.name)
+            return None
+        try:
+            result = super().__call__(*args, **kwargs)
+            cache.set(f"{key}:done", task_id, timeout=self.idempotency_window)
+            return result
+        finally:
+            cache.delete(f"{key}:lock")
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        super().after_return(status, retval, task_id, args, kwargs, einfo)
+        if self.request.called_directly or status in (states.SUCCESS, states.RETRY):
+            return
+        # Failed: let the next enqueue through instead of dropping it as a
+        # duplicate of work that never happened
+        key = f"{self.idempotency_key(args, kwargs)}:pending"
+        cache = self.idempotency_store
+        if cache.get(key) == task_id:
+            cache.delete(key)
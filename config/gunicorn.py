@@ -0,0 +1,67 @@
+"""
+Gunicorn settings, used with ``gunicorn -c config/gunicorn.py``.
+
+The app is preloaded in the master: Django is set up and warmed up once and
+forked workers share that memory copy-on-write, so scaling out a worker costs
+a fork rather than a full boot. Set ``GUNICORN_PRELOAD=false`` to load the app
+in each worker instead (e.g. to use ``--reload``).
+"""
+
+import gc
+import os
+import tempfile
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() in ("1", "true")
+
+# Workers write their Prometheus samples here so /metrics/ can aggregate them.
+# Must be set before prometheus_client is imported, i.e. before the app loads.
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "prometheus")
+)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def on_starting(server):
+    """Drop samples left over by previous runs (files are named ``*_<pid>.db``)."""
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    for name in os.listdir(directory):
+        if not name.endswith(f"_{os.getpid()}.db"):
+            os.remove(os.path.join(directory, name))
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, before any worker forks."""
+    if not preload_app:
+        return
+    from common.schema import get_schema_document
+    from config.warmup import close_connections, warm_up
+
+    elapsed = warm_up(connect=False)
+    server.log.info("App warmed up in %.0f ms", elapsed * 1e3)
+    # Load and render the OpenAPI schema once for every worker
+    get_schema_document().body("json")
+    # Forked workers must not inherit the master's sockets
+    close_connections()
+    # Keep the objects loaded so far out of the GC so collections in the
+    # workers don't touch (and copy) the shared pages
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    """Runs in each worker after the app is loaded, before accepting requests."""
+    from django.core.handlers.asgi import ASGIHandler
+
+    from config.warmup import warm_up
+
+    # Connections are per thread. Sync workers serve requests on this thread,
+    # but under ASGI (UvicornWorker) sync views run on asgiref's executor
+    # thread, which would never use a connection opened here
+    elapsed = warm_up(connect=not isinstance(worker.wsgi, ASGIHandler))
+    worker.log.info("Worker %s warmed up in %.0f ms", worker.pid, elapsed * 1e3)
+
+
+def child_exit(server, worker):
+    """Stop counting a dead worker's in-flight requests."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
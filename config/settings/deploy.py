@@ -6,28 +6,64 @@ ALLOWED_HOSTS = env.list("ALLOWED_HOSTS", default=[])
 CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
 CSRF_TRUSTED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS", default=[])
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_BACKEND = env(
+    "DJANGO_EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
+)
 EMAIL_HOST = env("DJANGO_EMAIL_HOST", default="smtp.gmail.com")
 EMAIL_PORT = 587
 EMAIL_HOST_USER = env("DJANGO_EMAIL_USER")
 EMAIL_HOST_PASSWORD = env("DJANGO_EMAIL_PASSWORD")
 EMAIL_USE_TLS = True
 
-# Logging
+# Logging: structured JSON, written by a background thread (see common.logging)
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "common.logging.JSONFormatter",
+        },
+    },
+    "filters": {
+        "sample": {
+            "()": "common.logging.SamplingFilter",
+            "rate": env.float("DJANGO_LOG_SAMPLE_RATE", default=0.1),
+            "level": "ERROR",
+        },
+    },
     "handlers": {
+        "console": {
+            "level": "INFO",
+            "class": "logging.StreamHandler",
+            "stream": "ext://sys.stdout",
+            "formatter": "json",
+        },
         "file": {
             "level": "ERROR",
             "class": "logging.FileHandler",
             "filename": "/var/log/django_error.log",
+            "formatter": "json",
         },
+        "queue": {
+            "class": "common.logging.QueueHandler",
+            "handlers": ["console", "file"],
+            "queue": {"()": "queue.Queue", "maxsize": 10_000},
+            "respect_handler_level": True,
+        },
+    },
+    "root": {
+        "handlers": ["queue"],
+        "level": "INFO",
     },
     "loggers": {
         "django": {
-            "handlers": ["file"],
-            "level": "ERROR",
+            "handlers": [],
+            "level": "INFO",
+            "propagate": True,
+        },
+        # Logs every 4xx as a warning; keep a sample of those
+        "django.request": {
+            "filters": ["sample"],
             "propagate": True,
         },
     },
@@ -37,7 +73,9 @@ ENV = "production"
 
 # Database-based sessions
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
-SESSION_COOKIE_SECURE = env.bool("DJANGO_SESSION_COOKIE_SECURE", default=False)  # Only send cookies over HTTPS (requires SSL)
+SESSION_COOKIE_SECURE = env.bool(
+    "DJANGO_SESSION_COOKIE_SECURE", default=False
+)  # Only send cookies over HTTPS (requires SSL)
 SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access to session cookie
 SESSION_COOKIE_SAMESITE = "Lax"  # CSRF protection
 SESSION_COOKIE_AGE = 60 * 60 * 24 * 14  # 2 weeks (default)
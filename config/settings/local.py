@@ -10,10 +10,12 @@ CSRF_TRUSTED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS", default=[])
 
 INSTALLED_APPS += []
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_BACKEND = env(
+    "DJANGO_EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
+)
 EMAIL_HOST = env("DJANGO_EMAIL_HOST")
-EMAIL_PORT = env("DJANGO_EMAIL_PORT", default=587)  # type: ignore
-EMAIL_USE_TLS = env("DJANGO_EMAIL_USE_TLS", default=True)  # type: ignore
+EMAIL_PORT = env.int("DJANGO_EMAIL_PORT", default=587)
+EMAIL_USE_TLS = env.bool("DJANGO_EMAIL_USE_TLS", default=True)
 EMAIL_HOST_USER = env("DJANGO_EMAIL_USER", default="Django <test@django.com>")  # e.g. yourname@gmail.com
 EMAIL_HOST_PASSWORD = env("DJANGO_EMAIL_PASSWORD", default="")
 
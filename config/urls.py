@@ -18,28 +18,29 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+from common.metrics import metrics_view
+from common.utils import lazy_view
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
+    # API docs, imported on first use: drf-spectacular's views and schema
+    # generator are not needed to serve the API
+    path("api/v1/schema/", lazy_view("common.schema.SchemaView"), name="schema"),
     path(
         "api/v1/schema/swagger-ui/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
     path(
         "api/v1/schema/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
         name="redoc",
     ),
     # Auth
     path("api/v1/auth/", include("users.urls")),
+    # Prometheus scrape endpoint
+    path("metrics/", metrics_view, name="metrics"),
 ]
 
 
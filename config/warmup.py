@@ -0,0 +1,63 @@
+"""
+Warm-up for web and worker processes.
+
+Everything Django otherwise loads on the first request (URLconf and views,
+templates) is loaded up front, so the first request served by a fresh worker
+is not slower than the rest. The storage backend (boto3, ~120 ms) and the API
+docs views are left to the requests that use them: most processes, e.g. the
+emails worker, never do. With ``preload_app`` (see ``config/gunicorn.py``)
+this runs once in the master and is shared by every forked worker; database
+and cache connections are then opened in each worker, since sockets must
+never be shared across a fork.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Templates rendered on hot paths
+WARM_UP_TEMPLATES = [
+    "otp_email.html",
+    "admin/change_list.html",
+    "admin/change_form.html",
+]
+
+
+def warm_up(connect=True):
+    """
+    Load URLs, views and templates.
+
+    With ``connect``, also open the database connection(s) and the default
+    cache connection of the current process. Returns the time taken in
+    seconds. Errors are logged, not raised: a worker that could not warm up
+    still serves requests.
+    """
+    started = time.perf_counter()
+    try:
+        resolver = get_resolver()
+        # Imports every view and builds the reverse() lookup tables
+        resolver.reverse_dict  # noqa: B018
+        for template in getattr(settings, "WARM_UP_TEMPLATES", WARM_UP_TEMPLATES):
+            get_template(template)
+        if connect:
+            for alias in connections:
+                connections[alias].ensure_connection()
+            caches["default"].get("warm-up")
+    except Exception:
+        logger.exception("Warm-up failed")
+    return time.perf_counter() - started
+
+
+def close_connections():
+    """Close any DB and cache connections opened before forking."""
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+    for cache in caches.all(initialized_only=True):
+        cache.close()
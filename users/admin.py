@@ -1,12 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Case, Q, Value, When
+from django.db.models.functions import Concat, Left, Now, Trim
 from django.utils.html import format_html
 
+from common.admin import BulkUpdate, BulkUpdateActionsMixin, LargeTableAdminMixin
+
 from .models import UserAccount
 
 
 @admin.register(UserAccount)
-class UserAccountAdmin(BaseUserAdmin):
+class UserAccountAdmin(BulkUpdateActionsMixin, LargeTableAdminMixin, BaseUserAdmin):
     """Admin configuration for UserAccount model."""
 
     list_display = [
@@ -35,7 +39,6 @@ class UserAccountAdmin(BaseUserAdmin):
         "last_name",
     ]
     ordering = ["-created_at"]
-    date_hierarchy = "created_at"
     readonly_fields = [
         "id",
         "created_at",
@@ -138,19 +141,55 @@ class UserAccountAdmin(BaseUserAdmin):
 
     filter_horizontal = ["groups", "user_permissions"]
 
+    bulk_updates = {
+        "activate_users": BulkUpdate("Activate selected users", {"is_active": True}),
+        "deactivate_users": BulkUpdate(
+            "Deactivate selected users", {"is_active": False}
+        ),
+        "mark_email_verified": BulkUpdate(
+            "Mark selected users' email as verified",
+            {"is_email_verified": True, "email_verified_at": Now()},
+            # Keep the original verification date of verified users
+            Q(is_email_verified=False),
+        ),
+        "reset_otp": BulkUpdate(
+            "Reset OTP of selected users",
+            {"otp": None, "otp_expiry": None, "otp_sent_at": None},
+        ),
+    }
+
     def profile_picture_preview(self, obj):
         """Display profile picture thumbnail in admin."""
         if obj.profile_picture:
             return format_html(
                 '<img src="{}" style="max-height: 50px; max-width: 50px; border-radius: 50%;" />',
-                obj.profile_picture.url,
+                # 2x the displayed size for high-density screens
+                obj.get_profile_picture_url(size=100),
             )
         return format_html('<span style="color: #999;">No image</span>')
 
     profile_picture_preview.short_description = "Profile Picture"
 
+    def get_queryset(self, request):
+        # Same value as UserAccount.name, computed by the database for the page
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                display_name=Trim(
+                    Case(
+                        When(last_name="", then="first_name"),
+                        default=Concat(
+                            "first_name", Value(" "), Left("last_name", 1), Value(".")
+                        ),
+                    )
+                )
+            )
+        )
+
     def name(self, obj):
         """Display user's full name."""
-        return obj.name
+        return obj.display_name
 
     name.short_description = "Name"
+    name.admin_order_field = "display_name"
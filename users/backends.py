@@ -0,0 +1,92 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import transaction
+
+PERMISSIONS_KEY = "user-perms:{}"
+PERMISSIONS_VERSION_KEY = "user-perms-version:{}"
+
+
+def get_permission_cache():
+    return caches[getattr(settings, "PERMISSION_CACHE", "default")]
+
+
+def get_permission_cache_timeout():
+    return getattr(settings, "PERMISSION_CACHE_TIMEOUT", 3600)
+
+
+def get_version_timeout():
+    """
+    Lifetime of a version token: well past the sets stored under it. One that
+    expires is replaced by a fresh token, so it only costs a recomputation.
+    """
+    return get_permission_cache_timeout() * 24
+
+
+def invalidate_permissions(user_ids):
+    """
+    Drop the cached permission sets of ``user_ids`` once the current
+    transaction commits.
+
+    Each user's set is stored with a version token, and invalidating gives
+    the user a new token, so a set computed concurrently from the old rows
+    can never be served afterwards.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+
+    def invalidate():
+        get_permission_cache().set_many(
+            {PERMISSIONS_VERSION_KEY.format(pk): uuid.uuid4().hex for pk in user_ids},
+            timeout=get_version_timeout(),
+        )
+
+    transaction.on_commit(invalidate)
+
+
+class CachedPermissionsBackend(ModelBackend):
+    """
+    ``ModelBackend`` that keeps each user's effective permission set in the
+    cache, so ``has_perm``, ``has_module_perms`` and ``get_all_permissions``
+    cost one cache lookup per request instead of a join through ``groups``
+    and ``user_permissions``.
+
+    Sets are invalidated when a user's groups or permissions, or a group's
+    permissions, change (see ``users.signals``). ``PERMISSION_CACHE_TIMEOUT``
+    is only a backstop. Superusers skip the cache, since ``PermissionsMixin``
+    answers their checks without asking the backend.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if (
+            not user_obj.is_active
+            or user_obj.is_anonymous
+            or user_obj.is_superuser
+            or obj is not None
+        ):
+            return super().get_all_permissions(user_obj, obj=obj)
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = self.get_cached_permissions(user_obj)
+        return user_obj._perm_cache
+
+    def get_cached_permissions(self, user_obj):
+        cache = get_permission_cache()
+        key = PERMISSIONS_KEY.format(user_obj.pk)
+        version_key = PERMISSIONS_VERSION_KEY.format(user_obj.pk)
+        cached = cache.get_many([key, version_key])
+        version = cached.get(version_key)
+        if version is None:
+            # Never set or evicted: start from a fresh token rather than a
+            # fixed one an old set may still be stored under
+            version = uuid.uuid4().hex
+            if not cache.add(version_key, version, timeout=get_version_timeout()):
+                version = cache.get(version_key, version)
+        elif key in cached and cached[key][0] == version:
+            return cached[key][1]
+
+        permissions = super().get_all_permissions(user_obj)
+        cache.set(key, (version, permissions), timeout=get_permission_cache_timeout())
+        return permissions
@@ -0,0 +1,315 @@
+import functools
+import io
+import operator
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import UTC, datetime
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# Rows are generated in chunks with their own random generator, so the data
+# only depends on --seed, --start and --now, not on batch size or jobs
+CHUNK_SIZE = 10_000
+
+FIRST_NAMES = """
+    James Mary Robert Patricia John Jennifer Michael Linda David Elizabeth
+    William Barbara Richard Susan Joseph Jessica Thomas Sarah Charles Karen
+    Christopher Lisa Daniel Nancy Matthew Betty Anthony Sandra Mark Margaret
+    Donald Ashley Steven Kimberly Andrew Emily Paul Donna Joshua Michelle
+    Kenneth Carol Kevin Amanda Brian Melissa George Deborah Timothy Stephanie
+    Ahmed Fatima Wei Mei Hiroshi Yuki Raj Priya Carlos Sofia Luca Giulia
+    Olga Ivan Aisha Omar Chen Ling Kwame Ama Mateo Valentina Noah Emma
+    Liam Olivia Lucas Mia Hugo Chloe Leon Hannah Elias Lea Arjun Ananya
+""".split()
+LAST_NAMES = """
+    Smith Johnson Williams Brown Jones Garcia Miller Davis Rodriguez Martinez
+    Hernandez Lopez Gonzalez Wilson Anderson Thomas Taylor Moore Jackson Martin
+    Lee Perez Thompson White Harris Sanchez Clark Ramirez Lewis Robinson
+    Walker Young Allen King Wright Scott Torres Nguyen Hill Flores Green
+    Adams Nelson Baker Hall Rivera Campbell Mitchell Carter Roberts Khan
+    Ali Wang Li Zhang Liu Chen Tanaka Suzuki Sato Patel Sharma Singh Kumar
+    Rossi Russo Ferrari Muller Schmidt Schneider Fischer Weber Dubois Martin
+    Ivanov Petrov Silva Santos Oliveira Mensah Okafor Haddad Cohen Jensen
+""".split()
+# (name, lowercase name) pairs
+FIRST_NAMES = [(name, name.lower()) for name in FIRST_NAMES]
+LAST_NAMES = [(name, name.lower()) for name in LAST_NAMES]
+DOMAINS = ["example.com", "example.org", "example.net", "mail.example.com"]
+
+NULL = r"\N"
+
+
+@functools.cache
+def format_day(day):
+    return datetime.fromtimestamp(day * 86400, UTC).strftime("%Y-%m-%d")
+
+
+def format_time(value):
+    """A UTC timestamp, to the second; faster than ``datetime.isoformat()``."""
+    day, seconds = divmod(int(value), 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{format_day(day)} {hours:02}:{minutes:02}:{seconds:02}+00"
+
+
+def generate_users(seed, start, chunk, options):
+    """
+    COPY text rows for the users of ``chunk``, in ``options["columns"]`` order.
+
+    Each user is staff, verified (active, maybe logged in) or unverified
+    (inactive, with an OTP that is either still valid or expired).
+    """
+    rng = random.Random(f"{seed}:{chunk}")
+    now = options["now"]
+    span = options["days"] * 86400
+    staff_ratio = options["staff_ratio"]
+    unverified_ratio = staff_ratio + options["unverified_ratio"]
+    pending_otp_ratio = options["pending_otp_ratio"]
+    password = options["password_hash"]
+    in_column_order = operator.itemgetter(*options["columns"])
+
+    first = start + chunk * CHUNK_SIZE
+    last = min(first + CHUNK_SIZE, start + options["count"])
+    buffer = io.StringIO()
+    for n in range(first, last):
+        first_name, first_lower = rng.choice(FIRST_NAMES)
+        last_name, last_lower = rng.choice(LAST_NAMES)
+        username = f"{first_lower}{last_lower}{rng.getrandbits(32):08x}"
+        separator = "." if rng.random() < 0.5 else ""
+        email = f"{first_lower}{separator}{last_lower}.{n}@{rng.choice(DOMAINS)}"
+        created = now - span * rng.random() ** 2  # more recent signups
+        state = rng.random()
+
+        if staff_ratio <= state < unverified_ratio:
+            if rng.random() < pending_otp_ratio:
+                # Asked for a code in the last 10 minutes
+                otp_sent = max(created, now - 600 * rng.random())
+            else:
+                otp_sent = created
+            is_active = is_verified = "f"
+            verified_at = last_login = NULL
+            otp = f"{rng.randrange(100000, 1000000)}"
+            otp_sent_at = format_time(otp_sent)
+            otp_expiry = format_time(otp_sent + 600)
+            updated = otp_sent
+        else:
+            verified = created + 600 * rng.random()
+            is_active = is_verified = "t"
+            verified_at = format_time(verified)
+            logged_in = verified + (now - verified) * rng.random()
+            last_login = format_time(logged_in) if rng.random() < 0.8 else NULL
+            otp = otp_sent_at = otp_expiry = NULL
+            updated = verified
+
+        row = {
+            "password": password,
+            "last_login": last_login,
+            "is_superuser": "f",
+            "username": username,
+            "email": email,
+            "first_name": first_name,
+            "last_name": last_name,
+            "is_active": is_active,
+            "is_staff": "t" if state < staff_ratio else "f",
+            "created_at": format_time(created),
+            "updated_at": format_time(updated),
+            "is_email_verified": is_verified,
+            "email_verified_at": verified_at,
+            "email_verification_token": NULL,
+            "profile_picture": NULL,
+            "profile_picture_derivatives": "[]",
+            "otp": otp,
+            "otp_expiry": otp_expiry,
+            "otp_sent_at": otp_sent_at,
+        }
+        buffer.write("\t".join(in_column_order(row)))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer, last - first
+
+
+def load_chunks(seed, start, chunks, options):
+    """COPY ``chunks`` into the users table in one transaction."""
+    columns = ", ".join(connection.ops.quote_name(c) for c in options["columns"])
+    rows = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Losing the last batches on a crash is fine for seed data
+        cursor.execute("SET LOCAL synchronous_commit TO off")
+        for chunk in chunks:
+            buffer, count = generate_users(seed, start, chunk, options)
+            # Raise Django's IntegrityError & co. rather than psycopg2's
+            with connection.wrap_database_errors:
+                cursor.copy_expert(
+                    f"COPY {options['table']} ({columns}) FROM STDIN", buffer
+                )
+            rows += count
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load reproducible synthetic users through COPY, for load and "
+        "scale testing. Needs PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, help="Number of users to create.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--start",
+            type=int,
+            default=0,
+            help="Number of the first user; emails end in .<number>@, so use "
+            "different ranges to load more users on top of a previous run.",
+        )
+        parser.add_argument(
+            "--now",
+            default=None,
+            help="Reference time (ISO 8601) the data is generated around "
+            "(default: now). Pin it for byte-identical runs.",
+        )
+        parser.add_argument(
+            "--days", type=int, default=730, help="Spread signups over this many days."
+        )
+        parser.add_argument("--staff-ratio", type=float, default=0.001)
+        parser.add_argument(
+            "--unverified-ratio",
+            type=float,
+            default=0.2,
+            help="Share of inactive users who never entered their OTP.",
+        )
+        parser.add_argument(
+            "--pending-otp-ratio",
+            type=float,
+            default=0.05,
+            help="Share of unverified users whose OTP is still valid.",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of every user, hashed once.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100_000)
+        parser.add_argument(
+            "--jobs", type=int, default=1, help="Load in this many processes."
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Drop the secondary indexes during the load and rebuild them "
+            "afterwards, which is much faster for millions of rows.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("seed_users needs PostgreSQL (COPY).")
+        if options["staff_ratio"] + options["unverified_ratio"] > 1:
+            raise CommandError("--staff-ratio + --unverified-ratio must be <= 1.")
+
+        User = get_user_model()
+        now = parse_datetime(options["now"]) if options["now"] else timezone.now()
+        if now is None:
+            raise CommandError(f"Invalid --now: {options['now']}")
+        if timezone.is_naive(now):
+            now = timezone.make_aware(now, UTC)
+        seed = options["seed"]
+        generator_options = {
+            "count": options["count"],
+            "now": now.timestamp(),
+            "days": options["days"],
+            "staff_ratio": options["staff_ratio"],
+            "unverified_ratio": options["unverified_ratio"],
+            "pending_otp_ratio": options["pending_otp_ratio"],
+            "password_hash": make_password(options["password"], salt=f"seed{seed}"),
+            "table": connection.ops.quote_name(User._meta.db_table),
+            "columns": [
+                field.column
+                for field in User._meta.concrete_fields
+                if not field.primary_key
+            ],
+        }
+
+        chunks = range(-(-options["count"] // CHUNK_SIZE))
+        per_batch = max(1, options["batch_size"] // CHUNK_SIZE)
+        batches = [chunks[i : i + per_batch] for i in range(0, len(chunks), per_batch)]
+
+        indexes = self.drop_indexes(User) if options["defer_indexes"] else []
+        started = time.perf_counter()
+        try:
+            loaded = 0
+            for rows in self.load(seed, options, generator_options, batches):
+                loaded += rows
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{loaded:>12,} users  {loaded / elapsed:>10,.0f} users/s"
+                )
+        except IntegrityError as e:
+            raise CommandError(
+                f"{e}\nThese users may already exist, load them with another --start."
+            ) from None
+        finally:
+            self.create_indexes(indexes)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {generator_options['table']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {loaded:,} users in {time.perf_counter() - started:.1f}s"
+            )
+        )
+
+    def load(self, seed, options, generator_options, batches):
+        start = options["start"]
+        if options["jobs"] <= 1:
+            for batch in batches:
+                yield load_chunks(seed, start, batch, generator_options)
+            return
+
+        # Each process opens its own connection
+        connections.close_all()
+        with ProcessPoolExecutor(options["jobs"], initializer=django.setup) as pool:
+            futures = [
+                pool.submit(load_chunks, seed, start, batch, generator_options)
+                for batch in batches
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def drop_indexes(self, model):
+        """Drop the non-unique indexes of ``model``, returning their DDL."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT i.relname, pg_get_indexdef(i.oid)
+                FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+                WHERE x.indrelid = %s::regclass
+                    AND NOT x.indisprimary AND NOT x.indisunique
+                """,
+                [model._meta.db_table],
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+        self.stdout.write(f"Dropped {len(indexes)} indexes until the load is done")
+        return [definition for _, definition in indexes]
+
+    def create_indexes(self, definitions):
+        for definition in definitions:
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(definition)
+            self.stdout.write(
+                f"Rebuilt in {time.perf_counter() - started:>6.1f}s: {definition}"
+            )
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:23
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="useraccount",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_email_trgm_idx",
+            ),
+        ),
+    ]
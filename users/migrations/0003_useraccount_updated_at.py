@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_email_trgm_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="useraccount",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:29
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0003_useraccount_updated_at"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="useraccount",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("username"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_username_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="useraccount",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_first_name_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="useraccount",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_last_name_trgm_idx",
+            ),
+        ),
+    ]
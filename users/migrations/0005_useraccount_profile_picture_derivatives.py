@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_admin_search_trgm_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="useraccount",
+            name="profile_picture_derivatives",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
@@ -5,10 +5,13 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from common.utils import dynamic_upload_path
 
-from common.models import NormalizedEmailField
+from common.images import pick_derivative
+from common.models import DirtyFieldsMixin, NormalizedEmailField
 
 
 class UserAccountManager(BaseUserManager):
@@ -16,16 +19,16 @@ class UserAccountManager(BaseUserManager):
         if not email:
             raise ValueError("Please enter email")
         email = self.normalize_email(email)
-        user = self.model(email=email, **extra_fields)
+        extra_fields["is_staff"] = is_superuser
+        user = self.model(email=email, is_superuser=is_superuser, **extra_fields)
         user.set_password(password)
-        user.save()
-
-        user.is_staff = is_superuser
-        user.is_superuser = is_superuser
-
         user.save(using=self._db)
         return user
 
+    def get_by_email(self, email):
+        """Fetch a user by email with a single probe of the unique index."""
+        return self.get(email=email)
+
     def create_superuser(self, email, password=None, **extra_fields):
         user = self.create_user(
             email, password=password, is_superuser=True, is_staff=True, **extra_fields
@@ -34,7 +37,7 @@ class UserAccountManager(BaseUserManager):
         return user
 
 
-class UserAccount(AbstractBaseUser, PermissionsMixin):
+class UserAccount(DirtyFieldsMixin, AbstractBaseUser, PermissionsMixin):
     username = models.CharField(max_length=255, null=True, blank=True)
     email = NormalizedEmailField(max_length=255, unique=True)
     first_name = models.CharField(max_length=255)
@@ -43,6 +46,7 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     # Email verified
     is_email_verified = models.BooleanField(default=False)
@@ -54,6 +58,10 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
     profile_picture = models.ImageField(
         upload_to=dynamic_upload_path, null=True, blank=True, max_length=500
     )
+    # Resized copies of profile_picture, filled in by a Celery task
+    profile_picture_derivatives = models.JSONField(
+        default=list, blank=True, editable=False
+    )
 
     objects = UserAccountManager()
 
@@ -71,7 +79,42 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
             self.username = (
                 self.first_name.lower() + self.last_name.lower() + str(uuid.uuid4())[:8]
             )
+        update_fields = kwargs.get("update_fields")
+        picture_changed = "profile_picture" in self.get_dirty_fields() and (
+            update_fields is None or "profile_picture" in update_fields
+        )
+        replaced = []
+        if picture_changed:
+            replaced = [item["name"] for item in self.profile_picture_derivatives]
+            self.profile_picture_derivatives = []
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "profile_picture_derivatives",
+                }
         super().save(*args, **kwargs)
+        if picture_changed and (self.profile_picture or replaced):
+            from users.tasks import generate_profile_picture_derivatives
+
+            user_id, name = self.pk, self.profile_picture.name or ""
+            transaction.on_commit(
+                lambda: generate_profile_picture_derivatives.delay(
+                    user_id, name, replaced
+                )
+            )
+
+    def get_profile_picture_url(self, size=None, extension="webp"):
+        """
+        URL of the smallest profile picture derivative covering ``size`` px.
+
+        Falls back to the original until the derivatives have been generated.
+        """
+        if not self.profile_picture:
+            return None
+        derivative = pick_derivative(self.profile_picture_derivatives, size, extension)
+        if derivative is None:
+            return self.profile_picture.url
+        return self.profile_picture.storage.url(derivative["name"])
 
     @property
     def name(self):
@@ -109,4 +152,21 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
             models.Index(
                 fields=["is_active", "created_at"], name="user_active_created_at_idx"
             ),
+            # Trigram indexes for the admin's search (UPPER(column) LIKE ...)
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="user_email_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("username"), name="gin_trgm_ops"),
+                name="user_username_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("first_name"), name="gin_trgm_ops"),
+                name="user_first_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("last_name"), name="gin_trgm_ops"),
+                name="user_last_name_trgm_idx",
+            ),
         ]
@@ -1,8 +1,31 @@
+from io import BytesIO
+
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.core import signing
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 
 from common.mixin import CamelSnakeMixin
+from common.serializers import ValuesSerializer
 from users.models import UserAccount
+from users.tokens import RefreshToken
+
+PROFILE_PICTURE_UPLOAD_SALT = "users.profile-picture-upload"
+
+# Accepted content types -> (file extension, Pillow format)
+PROFILE_PICTURE_CONTENT_TYPES = {
+    "image/jpeg": ("jpg", "JPEG"),
+    "image/png": ("png", "PNG"),
+    "image/webp": ("webp", "WEBP"),
+}
 
 
 class SignInSerializer(CamelSnakeMixin, serializers.Serializer):
@@ -32,18 +55,123 @@ class SignInSerializer(CamelSnakeMixin, serializers.Serializer):
         return attrs
 
 
-class UserAccountSerializer(CamelSnakeMixin, serializers.ModelSerializer):
+class UserAccountSerializer(ValuesSerializer):
     class Meta:
         model = UserAccount
         fields = ["first_name", "last_name", "email", "is_superuser"]
 
 
+@extend_schema_field(
+    {
+        "type": "object",
+        "nullable": True,
+        "properties": {
+            "url": {"type": "string", "format": "uri"},
+            "variants": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "size": {"type": "integer"},
+                        "width": {"type": "integer"},
+                        "height": {"type": "integer"},
+                        "format": {"type": "string"},
+                        "url": {"type": "string", "format": "uri"},
+                    },
+                },
+            },
+        },
+    }
+)
+class ProfilePictureField(serializers.Field):
+    """
+    Profile picture URLs: the original plus every generated derivative.
+
+    ``variants`` is empty until the derivatives have been generated, so
+    clients should fall back to ``url``.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, user):
+        if not user.profile_picture:
+            return None
+        storage = user.profile_picture.storage
+        return {
+            "url": user.profile_picture.url,
+            "variants": [
+                {
+                    "size": derivative["size"],
+                    "width": derivative["width"],
+                    "height": derivative["height"],
+                    "format": derivative["format"],
+                    "url": storage.url(derivative["name"]),
+                }
+                for derivative in user.profile_picture_derivatives
+            ],
+        }
+
+
+class UserProfileSerializer(CamelSnakeMixin, serializers.ModelSerializer):
+    profile_picture = ProfilePictureField()
+
+    class Meta:
+        model = UserAccount
+        fields = [*UserAccountSerializer.Meta.fields, "profile_picture"]
+
+
 class SignInResponseSerializer(CamelSnakeMixin, serializers.Serializer):
     access = serializers.CharField()
     refresh = serializers.CharField()
     user = UserAccountSerializer()
 
 
+class TokenPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+
+class RefreshTokenSerializer(TokenRefreshSerializer):
+    """
+    Refresh with a single token decode and a single user query.
+
+    Rotated refresh tokens are blacklisted in the cache (see
+    ``users.tokens``), and a token can only be rotated once, so replaying an
+    old refresh token fails. The user is returned with the new tokens.
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = (
+            UserAccount.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user_id is not None
+            else None
+        )
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        data = {"access": str(refresh.access_token), "user": user}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION and not refresh.blacklist():
+                # Already rotated, possibly by a concurrent request
+                raise TokenError(_("Token is blacklisted"))
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        else:
+            data["refresh"] = attrs["refresh"]
+        return data
+
+
 class SignUpSerializer(CamelSnakeMixin, serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True, style={"input_type": "password"})
@@ -78,7 +206,7 @@ class ResendOTPSerializer(CamelSnakeMixin, serializers.Serializer):
         if not email:
             raise serializers.ValidationError({"error": "Email is required."})
         try:
-            user = UserAccount.objects.get(email=email)
+            user = UserAccount.objects.get_by_email(email)
         except UserAccount.DoesNotExist:
             raise serializers.ValidationError(
                 {"error": "User with this email does not exist."}
@@ -87,3 +215,58 @@ class ResendOTPSerializer(CamelSnakeMixin, serializers.Serializer):
             raise serializers.ValidationError({"error": "Email is already verified."})
         attrs["user"] = user
         return attrs
+
+
+class ProfilePictureUploadSerializer(CamelSnakeMixin, serializers.Serializer):
+    content_type = serializers.ChoiceField(choices=list(PROFILE_PICTURE_CONTENT_TYPES))
+    size = serializers.IntegerField(
+        min_value=1, max_value=settings.PROFILE_PICTURE_MAX_UPLOAD_SIZE
+    )
+
+
+class ProfilePictureConfirmSerializer(CamelSnakeMixin, serializers.Serializer):
+    token = serializers.CharField()
+
+    # Enough for Pillow to read the header of any accepted format
+    header_size = 64 * 1024
+
+    def validate_token(self, value):
+        try:
+            upload = signing.loads(
+                value,
+                salt=PROFILE_PICTURE_UPLOAD_SALT,
+                max_age=settings.PROFILE_PICTURE_UPLOAD_EXPIRE * 2,
+            )
+        except signing.BadSignature:
+            raise serializers.ValidationError("Invalid or expired upload.") from None
+        if upload["user"] != str(self.context["request"].user.pk):
+            raise serializers.ValidationError("Invalid or expired upload.")
+        return upload
+
+    def validate(self, attrs):
+        upload = attrs["token"]
+        storage = UserAccount._meta.get_field("profile_picture").storage
+        head = storage.head(upload["key"])
+        if head is None:
+            raise serializers.ValidationError({"error": "Upload not found."})
+        if (
+            head["ContentLength"] > upload["size"]
+            or head.get("ContentType") != upload["content_type"]
+        ):
+            raise serializers.ValidationError({"error": "Upload is not allowed."})
+
+        from PIL import Image, UnidentifiedImageError
+
+        header = storage.read_prefix(upload["key"], self.header_size)
+        _, image_format = PROFILE_PICTURE_CONTENT_TYPES[upload["content_type"]]
+        try:
+            with Image.open(BytesIO(header)) as image:
+                valid = image.format == image_format
+        except (UnidentifiedImageError, OSError):
+            valid = False
+        if not valid:
+            raise serializers.ValidationError(
+                {"error": "Upload is not a valid image of the declared type."}
+            )
+        attrs["key"] = upload["key"]
+        return attrs
@@ -0,0 +1,69 @@
+from django.contrib.auth.models import Group, Permission
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from users.backends import invalidate_permissions
+from users.models import UserAccount
+
+# pre_clear, since the affected rows are gone by post_clear
+INVALIDATING_ACTIONS = {"post_add", "post_remove", "pre_clear"}
+
+
+def users_in_groups(groups):
+    return UserAccount.objects.filter(groups__in=groups).values_list("pk", flat=True)
+
+
+@receiver(m2m_changed, sender=UserAccount.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in INVALIDATING_ACTIONS:
+        return
+    if not reverse:
+        invalidate_permissions([instance.pk])
+    elif pk_set is not None:
+        invalidate_permissions(pk_set)
+    else:
+        invalidate_permissions(users_in_groups([instance]))
+
+
+@receiver(m2m_changed, sender=UserAccount.user_permissions.through)
+def user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in INVALIDATING_ACTIONS:
+        return
+    if not reverse:
+        invalidate_permissions([instance.pk])
+    elif pk_set is not None:
+        invalidate_permissions(pk_set)
+    else:
+        invalidate_permissions(
+            UserAccount.objects.filter(user_permissions=instance).values_list(
+                "pk", flat=True
+            )
+        )
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in INVALIDATING_ACTIONS:
+        return
+    if not reverse:
+        invalidate_permissions(users_in_groups([instance]))
+    elif pk_set is not None:
+        invalidate_permissions(users_in_groups(pk_set))
+    else:
+        invalidate_permissions(users_in_groups(instance.group_set.all()))
+
+
+@receiver(pre_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    # The cascade removes memberships without sending m2m_changed
+    invalidate_permissions(users_in_groups([instance]))
+
+
+@receiver(pre_delete, sender=Permission)
+def permission_deleted(sender, instance, **kwargs):
+    invalidate_permissions(
+        UserAccount.objects.filter(
+            Q(user_permissions=instance) | Q(groups__permissions=instance)
+        ).values_list("pk", flat=True)
+    )
@@ -4,9 +4,18 @@ from celery import shared_task
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
+from django.utils import timezone
 
+from common.images import create_derivatives
+from config.extensions.idempotency import IdempotentTask
+from users.models import UserAccount
 
-@shared_task(queue="emails")
+
+# No result: the emails worker runs hundreds of threads (see common.mail), and
+# storing results would open a database connection in each
+@shared_task(
+    base=IdempotentTask, queue="emails", idempotency_window=60, ignore_result=True
+)
 def send_otp_email(email, otp):
     """Send OTP verification email"""
     support_email = getattr(settings, "DEFAULT_FROM_EMAIL", "support@accelno.com")
@@ -29,3 +38,25 @@ def send_otp_email(email, otp):
     )
     email_message.attach_alternative(html_message, "text/html")
     email_message.send(fail_silently=False)
+
+
+@shared_task(queue="images")
+def generate_profile_picture_derivatives(user_id, name, replaced=()):
+    """
+    Generate resized WebP/JPEG copies of a user's profile picture, then delete
+    the ``replaced`` copies of the picture it replaced
+    """
+    storage = UserAccount._meta.get_field("profile_picture").storage
+    user = UserAccount.objects.filter(pk=user_id).only("id", "profile_picture").first()
+    derivatives = []
+    # Skipped if the picture was replaced or removed after this task was queued
+    if name and user is not None and user.profile_picture.name == name:
+        derivatives = create_derivatives(user.profile_picture)
+        UserAccount.objects.filter(pk=user_id, profile_picture=name).update(
+            profile_picture_derivatives=derivatives, updated_at=timezone.now()
+        )
+
+    # A new picture under the same name overwrote them
+    kept = {item["name"] for item in derivatives}
+    for stale in set(replaced) - kept:
+        storage.delete(stale)
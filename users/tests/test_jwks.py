@@ -0,0 +1,137 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
+
+from common.jwt_verifier import TokenVerifier
+from users.tokens import KeyRingTokenBackend
+
+
+def key_backend(*key_files):
+    return KeyRingTokenBackend(
+        key_files, api_settings.ALGORITHM, api_settings.SIGNING_KEY
+    )
+
+
+def claims(token_type="access", **extra):
+    now = aware_utcnow()
+    return {
+        "token_type": token_type,
+        "user_id": 1,
+        "iat": datetime_to_epoch(now),
+        "exp": datetime_to_epoch(now + timedelta(minutes=5)),
+        **extra,
+    }
+
+
+class KeyRingTests(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.key_dir = Path(tempfile.mkdtemp())
+        cls.old_key, cls.new_key = (
+            cls.write_key(name) for name in ("old.pem", "new.pem")
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.key_dir)
+        super().tearDownClass()
+
+    @classmethod
+    def write_key(cls, name):
+        path = cls.key_dir / name
+        path.write_bytes(
+            ed25519.Ed25519PrivateKey.generate().private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        return str(path)
+
+    def setUp(self):
+        self.backend = key_backend(self.old_key)
+
+    def test_signs_with_the_key_file(self):
+        token = self.backend.encode(claims())
+
+        header = jwt.get_unverified_header(token)
+        self.assertEqual(header["alg"], "EdDSA")
+        self.assertEqual(header["kid"], self.backend.keys[0].kid)
+        self.assertEqual(self.backend.decode(token)["user_id"], 1)
+
+    def test_token_verifies_through_the_jwks(self):
+        token = self.backend.encode(claims())
+
+        verifier = TokenVerifier(jwks=self.backend.jwks)
+
+        self.assertEqual(verifier.verify(token)["user_id"], 1)
+        (jwk,) = self.backend.jwks["keys"]
+        self.assertEqual(jwk["kty"], "OKP")
+        self.assertNotIn("d", jwk)
+
+    def test_tokens_of_the_previous_key_verify_after_rotation(self):
+        token = self.backend.encode(claims())
+
+        rotated = key_backend(self.new_key, self.old_key)
+
+        self.assertEqual(rotated.decode(token)["user_id"], 1)
+        new_token = rotated.encode(claims())
+        self.assertEqual(
+            jwt.get_unverified_header(new_token)["kid"], rotated.keys[0].kid
+        )
+        self.assertNotEqual(rotated.keys[0].kid, self.backend.keys[0].kid)
+        self.assertEqual(
+            TokenVerifier(jwks=rotated.jwks).verify(new_token)["user_id"], 1
+        )
+
+    def test_jwks_endpoint(self):
+        with mock.patch("users.views.token_backend", self.backend):
+            response = self.client.get(reverse("jwks"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/jwk-set+json")
+        self.assertEqual(response.json(), self.backend.jwks)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=300", response["Cache-Control"])
+
+    def test_rejects_hs256_tokens(self):
+        # Signed with the public key as an HMAC secret, under the right kid
+        (jwk,) = self.backend.jwks["keys"]
+        token = jwt.encode(
+            claims(), jwk["x"], algorithm="HS256", headers={"kid": jwk["kid"]}
+        )
+
+        with self.assertRaises(TokenBackendError):
+            self.backend.decode(token)
+        with self.assertRaises(jwt.InvalidTokenError):
+            TokenVerifier(jwks=self.backend.jwks).verify(token)
+
+    def test_rejects_unknown_key_ids(self):
+        token = key_backend(self.new_key).encode(claims())
+
+        with self.assertRaises(TokenBackendError):
+            self.backend.decode(token)
+
+    def test_verifier_rejects_refresh_tokens(self):
+        token = self.backend.encode(claims(token_type="refresh"))
+
+        with self.assertRaisesMessage(jwt.InvalidTokenError, "Wrong token type"):
+            TokenVerifier(jwks=self.backend.jwks).verify(token)
+
+    def test_empty_key_set_rejects_every_token(self):
+        token = self.backend.encode(claims())
+
+        with self.assertRaisesMessage(jwt.InvalidTokenError, "Unknown signing key"):
+            TokenVerifier(jwks={"keys": []}).verify(token)
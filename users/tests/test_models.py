@@ -0,0 +1,102 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import UserAccount
+
+
+def create_user(email="jane@example.com", **extra_fields):
+    return UserAccount.objects.create_user(
+        email=email,
+        password="password",
+        first_name="Jane",
+        last_name="Doe",
+        **extra_fields,
+    )
+
+
+class DirtyFieldsTests(TestCase):
+    def setUp(self):
+        self.user = UserAccount.objects.get(pk=create_user().pk)
+
+    def test_loaded_instance_is_clean(self):
+        self.assertEqual(self.user.get_dirty_fields(), [])
+
+    def test_save_without_changes_skips_the_write(self):
+        with self.assertNumQueries(0):
+            self.user.save()
+
+    def test_save_updates_only_changed_columns(self):
+        self.user.first_name = "Janet"
+        self.assertEqual(self.user.get_dirty_fields(), ["first_name"])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save()
+
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"]
+        self.assertTrue(sql.startswith("UPDATE"))
+        self.assertIn('"first_name"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"last_name"', sql)
+        self.assertNotIn('"password"', sql)
+        self.assertEqual(self.user.get_dirty_fields(), [])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Janet")
+
+    def test_setting_the_same_value_is_not_a_change(self):
+        self.user.first_name = "Jane"
+        self.assertEqual(self.user.get_dirty_fields(), [])
+
+    def test_mutated_json_field_is_dirty(self):
+        self.user.profile_picture_derivatives.append({"name": "x.webp"})
+        self.assertEqual(self.user.get_dirty_fields(), ["profile_picture_derivatives"])
+
+    def test_explicit_update_fields_are_respected(self):
+        self.user.first_name = "Janet"
+        self.user.last_name = "Roe"
+        self.user.save(update_fields=["last_name"])
+
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.first_name, self.user.last_name), ("Jane", "Roe"))
+
+    def test_deferred_fields_are_not_written(self):
+        user = UserAccount.objects.only("first_name").get(pk=self.user.pk)
+        user.first_name = "Janet"
+
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+
+        self.assertNotIn('"email"', queries[0]["sql"])
+
+
+class NormalizedEmailTests(TestCase):
+    def setUp(self):
+        self.user = create_user(email="  Jane.Doe@Example.COM ")
+
+    def test_email_is_stored_normalized(self):
+        self.assertEqual(self.user.email, "jane.doe@example.com")
+        self.assertEqual(
+            UserAccount.objects.values_list("email", flat=True).get(),
+            "jane.doe@example.com",
+        )
+
+    def test_lookups_normalize_the_compared_value(self):
+        for lookup in (
+            {"email": "JANE.DOE@example.com"},
+            {"email__iexact": " jane.doe@EXAMPLE.com"},
+            {"email__in": ["nobody@example.com", "Jane.Doe@Example.com"]},
+        ):
+            with self.subTest(lookup=lookup):
+                self.assertEqual(UserAccount.objects.get(**lookup), self.user)
+
+    def test_iexact_compares_the_column_as_is(self):
+        with CaptureQueriesContext(connection) as queries:
+            UserAccount.objects.filter(email__iexact="JANE.DOE@example.com").exists()
+
+        self.assertNotIn("UPPER", queries[0]["sql"])
+
+    def test_get_by_email(self):
+        self.assertEqual(
+            UserAccount.objects.get_by_email("Jane.Doe@example.com"), self.user
+        )
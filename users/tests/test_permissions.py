@@ -0,0 +1,100 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from users.backends import PERMISSIONS_VERSION_KEY
+from users.models import UserAccount
+
+PERMISSION = "users.change_useraccount"
+
+
+class CachedPermissionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserAccount.objects.create_user(
+            email="jane@example.com",
+            password="password",
+            first_name="Jane",
+            last_name="Doe",
+        )
+        self.permission = Permission.objects.get(
+            content_type__app_label="users", codename="change_useraccount"
+        )
+
+    def has_perm(self):
+        # A fresh instance, like the next request would load
+        return UserAccount.objects.get(pk=self.user.pk).has_perm(PERMISSION)
+
+    def test_permissions_are_cached(self):
+        self.assertFalse(self.has_perm())
+        user = UserAccount.objects.get(pk=self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(user.has_perm(PERMISSION))
+
+    def test_user_permission_change_invalidates(self):
+        self.assertFalse(self.has_perm())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.permission)
+        self.assertTrue(self.has_perm())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.remove(self.permission)
+        self.assertFalse(self.has_perm())
+
+    def test_group_changes_invalidate(self):
+        group = Group.objects.create(name="Editors")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(group)
+        self.assertFalse(self.has_perm())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            group.permissions.add(self.permission)
+        self.assertTrue(self.has_perm())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            group.delete()
+        self.assertFalse(self.has_perm())
+
+    def test_invalidation_waits_for_the_commit(self):
+        self.assertFalse(self.has_perm())
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.user.user_permissions.add(self.permission)
+        self.assertFalse(self.has_perm())
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(self.has_perm())
+
+    def test_evicted_version_does_not_revive_an_old_set(self):
+        self.assertFalse(self.has_perm())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.permission)
+
+        # The version key is evicted before the new set was ever cached
+        cache.delete(PERMISSIONS_VERSION_KEY.format(self.user.pk))
+
+        self.assertTrue(self.has_perm())
+
+    @override_settings(PERMISSION_CACHE_TIMEOUT=60)
+    def test_version_tokens_expire(self):
+        version_key = PERMISSIONS_VERSION_KEY.format(self.user.pk)
+        self.assertFalse(self.has_perm())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.permission)
+        self.assertTrue(self.has_perm())
+
+        now = time.time()
+        with mock.patch("django.core.cache.backends.locmem.time.time") as clock:
+            clock.return_value = now + 60 * 24 - 1
+            self.assertIsNotNone(cache.get(version_key))
+
+            clock.return_value = now + 60 * 24 + 1
+            self.assertIsNone(cache.get(version_key))
+            self.assertTrue(self.has_perm())
+            self.assertIsNotNone(cache.get(version_key))
@@ -0,0 +1,253 @@
+import shutil
+import tempfile
+import time
+from io import BytesIO
+from unittest import mock
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from users.models import UserAccount
+from users.tasks import generate_profile_picture_derivatives
+
+storage = UserAccount._meta.get_field("profile_picture").storage
+
+
+def create_user(email="jane@example.com"):
+    return UserAccount.objects.create_user(
+        email=email, password="password", first_name="Jane", last_name="Doe"
+    )
+
+
+def image_bytes(image_format="PNG"):
+    buffer = BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@mock.patch(
+    "storages.backends.s3.S3Storage.url",
+    lambda storage, name, expire=None, **kwargs: f"https://s3/{name}",
+)
+class ProfilePictureUploadTests(APITestCase):
+    upload_url = reverse("profile-picture-upload")
+    confirm_url = reverse("profile-picture-confirm")
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        patcher = mock.patch.object(
+            storage,
+            "presigned_post",
+            side_effect=lambda key, content_type, max_size, expire: {
+                "url": "https://s3/bucket",
+                "fields": {"key": key, "Content-Type": content_type},
+            },
+        )
+        self.presigned_post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request_upload(self, content_type="image/png", size=1000):
+        response = self.client.post(
+            self.upload_url,
+            {"contentType": content_type, "size": size},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def confirm(self, token, content=None, content_type="image/png", size=None):
+        content = image_bytes() if content is None else content
+        head = {"ContentLength": size or len(content), "ContentType": content_type}
+        with (
+            mock.patch.object(storage, "head", return_value=head),
+            mock.patch.object(storage, "read_prefix", return_value=content),
+        ):
+            return self.client.post(self.confirm_url, {"token": token}, format="json")
+
+    def test_upload_target_is_limited_to_the_declared_file(self):
+        upload = self.request_upload(size=1234)
+
+        key, content_type, max_size = self.presigned_post.call_args.args
+        self.assertTrue(key.endswith(".png"))
+        self.assertEqual(content_type, "image/png")
+        self.assertEqual(max_size, 1234)
+        self.assertEqual(upload["fields"]["key"], key)
+        self.assertEqual(upload["expiresIn"], settings.PROFILE_PICTURE_UPLOAD_EXPIRE)
+
+    def test_upload_rejects_other_files(self):
+        for data in (
+            {"contentType": "image/gif", "size": 1000},
+            {"contentType": "image/png", "size": 0},
+            {
+                "contentType": "image/png",
+                "size": settings.PROFILE_PICTURE_MAX_UPLOAD_SIZE + 1,
+            },
+        ):
+            with self.subTest(data):
+                response = self.client.post(self.upload_url, data, format="json")
+
+                self.assertEqual(response.status_code, 400)
+
+    def test_valid_upload_is_attached(self):
+        upload = self.request_upload()
+
+        with self.captureOnCommitCallbacks():
+            response = self.confirm(upload["token"])
+
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(
+            self.user.profile_picture.name, self.presigned_post.call_args.args[0]
+        )
+
+    def test_token_of_another_user_is_rejected(self):
+        upload = self.request_upload()
+        self.client.force_authenticate(create_user("john@example.com"))
+
+        response = self.confirm(upload["token"])
+
+        self.assertEqual(response.status_code, 400)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.profile_picture)
+
+    def test_expired_token_is_rejected(self):
+        upload = self.request_upload()
+        later = time.time() + settings.PROFILE_PICTURE_UPLOAD_EXPIRE * 2 + 1
+
+        with mock.patch("django.core.signing.time.time", return_value=later):
+            response = self.confirm(upload["token"])
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_forged_token_is_rejected(self):
+        token = signing.dumps(
+            {"user": str(self.user.pk), "key": "other.png"}, salt="other"
+        )
+
+        self.assertEqual(self.confirm(token).status_code, 400)
+
+    def test_missing_upload_is_rejected(self):
+        upload = self.request_upload()
+
+        with mock.patch.object(storage, "head", return_value=None):
+            response = self.client.post(
+                self.confirm_url, {"token": upload["token"]}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_wrong_content_type_is_rejected(self):
+        upload = self.request_upload()
+
+        response = self.confirm(upload["token"], content_type="text/html")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_file_larger_than_declared_is_rejected(self):
+        upload = self.request_upload(size=1000)
+
+        response = self.confirm(upload["token"], size=1001)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_content_must_be_an_image_of_the_declared_format(self):
+        for content in (b"<html></html>", image_bytes("JPEG")):
+            with self.subTest(content=content[:8]):
+                upload = self.request_upload()
+
+                response = self.confirm(upload["token"], content)
+
+                self.assertEqual(response.status_code, 400)
+
+
+class ProfilePictureDerivativesTests(APITestCase):
+    def setUp(self):
+        field = UserAccount._meta.get_field("profile_picture")
+        self.storage = FileSystemStorage(location=tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.storage.location)
+        patcher = mock.patch.object(field, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = create_user()
+
+    def set_picture(self, name="avatars/me.png", **save_kwargs):
+        if name:
+            self.storage.save(name, ContentFile(image_bytes()))
+        self.user.profile_picture.name = name
+        with (
+            mock.patch.object(generate_profile_picture_derivatives, "delay") as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.user.save(**save_kwargs)
+        return delay
+
+    def test_new_picture_is_queued_on_commit(self):
+        delay = self.set_picture()
+
+        delay.assert_called_once_with(self.user.pk, "avatars/me.png", [])
+
+    def test_task_stores_the_derivatives(self):
+        self.set_picture()
+
+        generate_profile_picture_derivatives(self.user.pk, "avatars/me.png")
+
+        self.user.refresh_from_db()
+        self.assertEqual(
+            [item["name"] for item in self.user.profile_picture_derivatives],
+            ["avatars/me_64.jpg", "avatars/me_64.webp"],
+        )
+        self.assertEqual(
+            self.user.get_profile_picture_url(),
+            self.storage.url("avatars/me_64.webp"),
+        )
+
+    def test_replacing_the_picture_deletes_its_derivatives(self):
+        self.set_picture()
+        generate_profile_picture_derivatives(self.user.pk, "avatars/me.png")
+        self.user.refresh_from_db()
+        old = [item["name"] for item in self.user.profile_picture_derivatives]
+
+        delay = self.set_picture("avatars/new.png", update_fields=["profile_picture"])
+
+        delay.assert_called_once_with(self.user.pk, "avatars/new.png", old)
+        # The reset is saved with the new picture, even with update_fields
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_derivatives, [])
+
+        generate_profile_picture_derivatives(*delay.call_args.args)
+
+        self.user.refresh_from_db()
+        self.assertEqual(len(self.user.profile_picture_derivatives), 2)
+        for name in old:
+            self.assertFalse(self.storage.exists(name))
+        for item in self.user.profile_picture_derivatives:
+            self.assertTrue(self.storage.exists(item["name"]))
+
+    def test_outdated_task_only_deletes_the_replaced_derivatives(self):
+        self.set_picture("avatars/new.png")
+        self.storage.save("avatars/me_64.webp", ContentFile(b"old"))
+
+        generate_profile_picture_derivatives(
+            self.user.pk, "avatars/me.png", ["avatars/me_64.webp"]
+        )
+
+        self.assertFalse(self.storage.exists("avatars/me_64.webp"))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_derivatives, [])
+
+    def test_removing_the_picture_deletes_its_derivatives(self):
+        self.set_picture()
+        generate_profile_picture_derivatives(self.user.pk, "avatars/me.png")
+        self.user.refresh_from_db()
+
+        delay = self.set_picture(name="")
+
+        delay.assert_called_once_with(
+            self.user.pk, "", ["avatars/me_64.jpg", "avatars/me_64.webp"]
+        )
@@ -0,0 +1,87 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from users.management.commands.seed_users import CHUNK_SIZE, generate_users
+from users.models import UserAccount
+
+NOW = "2026-01-01T00:00:00Z"
+
+OPTIONS = {
+    "count": 2 * CHUNK_SIZE,
+    "now": 1767225600.0,
+    "days": 730,
+    "staff_ratio": 0.001,
+    "unverified_ratio": 0.2,
+    "pending_otp_ratio": 0.05,
+    "password_hash": "hash",
+    "columns": ["email", "first_name", "is_staff", "is_active", "otp", "created_at"],
+}
+
+
+def rows(seed, chunk, start=0, **options):
+    buffer, _ = generate_users(seed, start, chunk, {**OPTIONS, **options})
+    return [line.split("\t") for line in buffer.read().splitlines()]
+
+
+class GenerateUsersTests(SimpleTestCase):
+    def test_same_seed_same_rows(self):
+        self.assertEqual(rows(1, 0), rows(1, 0))
+        self.assertNotEqual(rows(1, 0), rows(2, 0))
+
+    def test_chunks_are_independent(self):
+        second = rows(1, 1)
+
+        self.assertEqual(len(second), CHUNK_SIZE)
+        self.assertNotEqual(second, rows(1, 0))
+        self.assertTrue(second[0][0].split("@")[0].endswith(f".{CHUNK_SIZE}"))
+
+    def test_last_chunk_stops_at_the_count(self):
+        self.assertEqual(len(rows(1, 0, count=5)), 5)
+
+    def test_ratios(self):
+        staff = rows(1, 0, count=100, staff_ratio=1, unverified_ratio=0)
+        unverified = rows(1, 0, count=100, staff_ratio=0, unverified_ratio=1)
+
+        self.assertEqual({row[2] for row in staff}, {"t"})
+        self.assertEqual({(row[2], row[3]) for row in unverified}, {("f", "f")})
+        self.assertNotIn(r"\N", {row[4] for row in unverified})
+
+
+class SeedUsersCommandTests(TestCase):
+    def seed(self, count=30, **options):
+        call_command("seed_users", count, now=NOW, stdout=StringIO(), **options)
+        return list(
+            UserAccount.objects.order_by("email").values_list(
+                "email", "first_name", "last_name", "is_active", "otp", "created_at"
+            )
+        )
+
+    def test_fixed_seed_is_reproducible(self):
+        first = self.seed(seed=7)
+        UserAccount.objects.all().delete()
+
+        self.assertEqual(self.seed(seed=7, batch_size=1), first)
+        self.assertEqual(len(first), 30)
+
+    def test_users_can_log_in_with_the_password(self):
+        self.seed(count=3, password="secret")
+
+        user = UserAccount.objects.filter(is_active=True).first()
+        self.assertTrue(user.check_password("secret"))
+
+    def test_loading_the_same_range_twice_fails(self):
+        self.seed(count=3)
+
+        with self.assertRaisesMessage(CommandError, "another --start"):
+            self.seed(count=3)
+
+    def test_other_databases_are_rejected(self):
+        with (
+            mock.patch.object(connection, "vendor", "sqlite"),
+            self.assertRaisesMessage(CommandError, "needs PostgreSQL"),
+        ):
+            call_command("seed_users", 1)
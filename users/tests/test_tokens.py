@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.core.cache import cache, caches
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from users.models import UserAccount
+from users.tokens import RefreshToken
+
+
+class RefreshTokenRotationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserAccount.objects.create_user(
+            email="jane@example.com",
+            password="password",
+            first_name="Jane",
+            last_name="Doe",
+            is_email_verified=True,
+        )
+
+    def sign_in(self):
+        response = self.client.post(
+            reverse("sign-in"),
+            {"email": "jane@example.com", "password": "password"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data["refresh"]
+
+    def refresh(self, token):
+        return self.client.post(
+            reverse("refresh-token"), {"refresh": token}, format="json"
+        )
+
+    def test_refresh_rotates_the_token(self):
+        token = self.sign_in()
+
+        response = self.refresh(token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data["refresh"], token)
+        self.assertEqual(response.data["user"]["email"], "jane@example.com")
+        self.assertEqual(self.refresh(response.data["refresh"]).status_code, 200)
+
+    def test_replayed_refresh_token_is_rejected(self):
+        token = self.sign_in()
+        self.assertEqual(self.refresh(token).status_code, 200)
+
+        response = self.refresh(token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_blacklist_entry_expires_with_the_token(self):
+        token = RefreshToken.for_user(self.user)
+        blacklist = caches["default"]
+
+        with mock.patch.object(blacklist, "add", wraps=blacklist.add) as add:
+            self.assertTrue(token.blacklist())
+            self.assertFalse(token.blacklist())
+
+        lifetime = token.payload["exp"] - token.payload["iat"]
+        self.assertAlmostEqual(add.call_args.kwargs["timeout"], lifetime, delta=2)
+
+    def test_inactive_user_cannot_refresh(self):
+        token = self.sign_in()
+        UserAccount.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self.refresh(token).status_code, 401)
@@ -0,0 +1,140 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from common.models import OutboxMessage
+from users.models import UserAccount
+
+
+def create_user(email="jane@example.com", **extra_fields):
+    return UserAccount.objects.create_user(
+        email=email,
+        password="password",
+        first_name="Jane",
+        last_name="Doe",
+        **extra_fields,
+    )
+
+
+class UserInfoConditionalGetTests(APITestCase):
+    url = reverse("user-info")
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+
+    def test_sends_validators(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_matching_last_modified_is_not_modified(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_update_changes_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.user.first_name = "Janet"
+        self.user.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["user"]["firstName"], "Janet")
+
+
+@mock.patch(
+    "storages.backends.s3.S3Storage.url",
+    lambda storage, name, expire=None, **kwargs: f"https://s3/{name}?e={expire}",
+)
+class UserInfoProfilePictureTests(APITestCase):
+    url = reverse("user-info")
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(profile_picture="useraccount_files/me.jpg")
+        self.client.force_authenticate(self.user)
+
+    def get_in_next_url_window(self, **headers):
+        later = time.time() + settings.AWS_QUERYSTRING_WINDOW
+        with mock.patch("common.storage.time.time", return_value=later):
+            return self.client.get(self.url, **headers)
+
+    def test_not_modified_within_the_url_window(self):
+        response = self.client.get(self.url)
+
+        response = self.client.get(
+            self.url,
+            HTTP_IF_NONE_MATCH=response["ETag"],
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_the_url_window(self):
+        first = self.client.get(self.url)
+
+        response = self.get_in_next_url_window(HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_last_modified_moves_with_the_url_window(self):
+        first = self.client.get(self.url)
+
+        response = self.get_in_next_url_window(
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+
+class OTPEmailTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_sign_up_and_resend_share_the_normalized_email(self):
+        response = self.client.post(
+            reverse("sign-up"),
+            {
+                "email": "Jane.Doe@Example.COM",
+                "password": "Str0ng-password",
+                "confirmPassword": "Str0ng-password",
+                "firstName": "Jane",
+                "lastName": "Doe",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(
+            reverse("resend-otp"), {"email": "jane.doe@example.com"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        sign_up, resend = OutboxMessage.objects.order_by("id")
+        self.assertEqual(sign_up.ordering_key, "jane.doe@example.com")
+        self.assertEqual(resend.ordering_key, sign_up.ordering_key)
+        # The same OTP is resent, so the two emails are deduplicated
+        self.assertEqual(resend.args, sign_up.args)
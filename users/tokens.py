@@ -0,0 +1,200 @@
+import base64
+import hashlib
+import json
+from collections import namedtuple
+from functools import cached_property
+
+import jwt
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import (
+    TokenBackendError,
+    TokenBackendExpiredToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken as BaseAccessToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import datetime_to_epoch
+
+from common.jwt_verifier import TokenVerifier
+
+SigningKey = namedtuple("SigningKey", ["kid", "algorithm", "private_key", "jwk"])
+
+# JWK members that identify a public key, per key type (RFC 7638)
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+def key_algorithm(private_key):
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return "EdDSA"
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return "RS256"
+    if isinstance(private_key, ec.EllipticCurvePrivateKey) and isinstance(
+        private_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    raise ImproperlyConfigured("JWT keys must be Ed25519, RSA or EC P-256 private keys")
+
+
+def jwk_thumbprint(jwk):
+    members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(
+        json.dumps(members, sort_keys=True, separators=(",", ":")).encode()
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def load_signing_key(path):
+    """Load a PEM private key; its ID is the thumbprint of the public key."""
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    with open(path, "rb") as f:
+        private_key = load_pem_private_key(f.read(), password=None)
+    algorithm = key_algorithm(private_key)
+    jwk = jwt.get_algorithm_by_name(algorithm).to_jwk(
+        private_key.public_key(), as_dict=True
+    )
+    kid = jwk_thumbprint(jwk)
+    jwk.update(kid=kid, alg=algorithm, use="sig")
+    return SigningKey(kid, algorithm, private_key, jwk)
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """
+    Signs tokens with the first key of ``JWT_KEY_FILES`` and verifies them
+    with any of them, so keys can be rotated without logging everyone out.
+
+    Tokens carry the ``kid`` of their key, and ``jwks`` publishes the public
+    halves for other services (see ``common.jwt_verifier``). With no key
+    files configured, the HS256 ``SIGNING_KEY`` from ``SIMPLE_JWT`` is used
+    as before.
+    """
+
+    def __init__(self, key_files, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.key_files = list(key_files)
+
+    @cached_property
+    def keys(self):
+        return [load_signing_key(path) for path in self.key_files]
+
+    @cached_property
+    def jwks(self):
+        return {"keys": [key.jwk for key in self.keys]}
+
+    @cached_property
+    def verifier(self):
+        return TokenVerifier(
+            jwks=self.jwks,
+            token_type=None,
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.get_leeway(),
+        )
+
+    def encode(self, payload):
+        if not self.key_files:
+            return super().encode(payload)
+
+        key = self.keys[0]
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+        return jwt.encode(
+            jwt_payload,
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True):
+        if not self.key_files:
+            return super().decode(token, verify=verify)
+
+        try:
+            return self.verifier.verify(token, verify_signature=verify)
+        except jwt.ExpiredSignatureError as e:
+            raise TokenBackendExpiredToken(_("Token is expired")) from e
+        except jwt.InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+
+
+token_backend = KeyRingTokenBackend(
+    getattr(settings, "JWT_KEY_FILES", ()),
+    api_settings.ALGORITHM,
+    api_settings.SIGNING_KEY,
+    api_settings.VERIFYING_KEY,
+    api_settings.AUDIENCE,
+    api_settings.ISSUER,
+    api_settings.JWK_URL,
+    api_settings.LEEWAY,
+    api_settings.JSON_ENCODER,
+)
+
+
+class CacheBlacklistMixin:
+    """
+    Token blacklist kept in the cache instead of simplejwt's
+    ``token_blacklist`` tables.
+
+    Entries are keyed by ``jti`` and expire together with the token, so the
+    blacklist only ever holds tokens that are still alive, and checking it
+    is one cache lookup no matter how many tokens were revoked. Use a shared
+    cache (``JWT_BLACKLIST_CACHE``, Redis in production) so every worker
+    sees the same blacklist.
+    """
+
+    blacklist_key_prefix = "jwt-blacklist"
+
+    @staticmethod
+    def get_blacklist_cache():
+        return caches[getattr(settings, "JWT_BLACKLIST_CACHE", "default")]
+
+    def get_blacklist_key(self):
+        return f"{self.blacklist_key_prefix}:{self.payload[api_settings.JTI_CLAIM]}"
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        self.check_blacklist()
+
+    def check_blacklist(self):
+        if self.get_blacklist_cache().get(self.get_blacklist_key()) is not None:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        Blacklist this token until it expires.
+
+        Returns ``False`` if it already was, which makes this an atomic
+        "use once" check for token rotation.
+        """
+        timeout = self.payload["exp"] - datetime_to_epoch(self.current_time)
+        return self.get_blacklist_cache().add(
+            self.get_blacklist_key(), 1, timeout=max(int(timeout), 1)
+        )
+
+    def outstand(self):
+        # Only tokens that have been revoked are stored
+        return None
+
+
+class AccessToken(BaseAccessToken):
+    _token_backend = token_backend
+
+
+class RefreshToken(CacheBlacklistMixin, BaseRefreshToken):
+    access_token_class = AccessToken
+    _token_backend = token_backend
@@ -1,6 +1,9 @@
 from django.urls import path
 
 from users.views import (
+    JWKSView,
+    ProfilePictureConfirmView,
+    ProfilePictureUploadView,
     RefreshTokenView,
     ResendOTPView,
     SignInView,
@@ -18,6 +21,19 @@ urlpatterns = [
     path("verify-otp/", VerifyOTPView.as_view(), name="verify-otp"),
     # Refresh Token
     path("refresh-token/", RefreshTokenView.as_view(), name="refresh-token"),
+    # Public keys for verifying tokens elsewhere
+    path(".well-known/jwks.json", JWKSView.as_view(), name="jwks"),
     # User Info
     path("user-info/", UserInfoView.as_view(), name="user-info"),
+    # Direct-to-S3 profile picture upload
+    path(
+        "profile-picture/upload/",
+        ProfilePictureUploadView.as_view(),
+        name="profile-picture-upload",
+    ),
+    path(
+        "profile-picture/confirm/",
+        ProfilePictureConfirmView.as_view(),
+        name="profile-picture-confirm",
+    ),
 ]
@@ -1,28 +1,48 @@
 import random
-from datetime import timedelta
+import uuid
+from datetime import UTC, datetime, timedelta
 
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from common.conditional import conditional_get, updated_at_etag
+from common.outbox import dispatch
+from common.utils import dynamic_upload_path
 from users.models import UserAccount
 from users.serializers import (
+    PROFILE_PICTURE_CONTENT_TYPES,
+    PROFILE_PICTURE_UPLOAD_SALT,
+    ProfilePictureConfirmSerializer,
+    ProfilePictureUploadSerializer,
+    RefreshTokenSerializer,
     ResendOTPSerializer,
     SignInResponseSerializer,
     SignInSerializer,
     SignUpSerializer,
-    UserAccountSerializer,
+    TokenPairSerializer,
+    UserProfileSerializer,
     VerifyOTPSerializer,
 )
 from users.tasks import send_otp_email
+from users.tokens import token_backend
 
 
 class SignInView(TokenObtainPairView):
     authentication_classes = []
     permission_classes = []
+    serializer_class = TokenPairSerializer
 
     def post(self, request):
         serializer = SignInSerializer(data=request.data)
@@ -63,29 +83,17 @@ class SignInView(TokenObtainPairView):
 class RefreshTokenView(TokenRefreshView):
     authentication_classes = []
     permission_classes = []
+    serializer_class = RefreshTokenSerializer
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0]) from e
 
+        response_serializer = SignInResponseSerializer(serializer.validated_data)
         tokens = serializer.validated_data
-
-        # Get the user from the refresh token
-        from rest_framework_simplejwt.tokens import RefreshToken
-
-        refresh_token = RefreshToken(tokens["refresh"])
-        user = refresh_token.payload.get("user_id")
-        from users.models import UserAccount
-
-        user = UserAccount.objects.get(id=user)
-
-        response_serializer = SignInResponseSerializer(
-            {
-                "access": tokens["access"],
-                "refresh": tokens["refresh"],
-                "user": user,
-            }
-        )
         response_data = response_serializer.data
         response = Response()
         response.data = response_data
@@ -106,6 +114,23 @@ class RefreshTokenView(TokenRefreshView):
         return response
 
 
+class JWKSView(APIView):
+    """
+    Public keys for verifying our JWTs (RFC 7517), so other services can
+    check tokens without calling the API (see ``common.jwt_verifier``). The
+    set is empty while tokens are signed with HS256.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = []
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    @method_decorator(cache_control(public=True, max_age=settings.JWT_JWKS_MAX_AGE))
+    def get(self, request):
+        return Response(token_backend.jwks, content_type="application/jwk-set+json")
+
+
 class SignUpView(APIView):
     authentication_classes = []
     permission_classes = [AllowAny]
@@ -120,24 +145,28 @@ class SignUpView(APIView):
         first_name = serializer.validated_data["first_name"]
         last_name = serializer.validated_data["last_name"]
 
-        # Create user (inactive until OTP is verified)
-        user = UserAccount.objects.create_user(
-            email=email,
-            password=password,
-            first_name=first_name,
-            last_name=last_name,
-            is_active=False,  # User will be activated after OTP verification
-        )
-
         # Generate 6-digit OTP
         otp = str(random.randint(100000, 999999))
-        user.otp = otp
-        user.otp_expiry = timezone.now() + timedelta(minutes=10)
-        user.otp_sent_at = timezone.now()
-        user.save()
+        now = timezone.now()
+
+        with transaction.atomic():
+            # Create user (inactive until OTP is verified) with the OTP in one
+            # insert
+            user = UserAccount.objects.create_user(
+                email=email,
+                password=password,
+                first_name=first_name,
+                last_name=last_name,
+                is_active=False,  # User will be activated after OTP verification
+                otp=otp,
+                otp_expiry=now + timedelta(minutes=10),
+                otp_sent_at=now,
+            )
 
-        # Send OTP email asynchronously using Celery
-        send_otp_email.delay(email, otp)
+            # Send OTP email asynchronously using Celery, once the user is
+            # committed (see common.outbox). Keyed by the normalized email, like
+            # resends, so they are ordered and deduplicated together
+            dispatch(send_otp_email, args=(user.email, otp), ordering_key=user.email)
 
         return Response(
             {
@@ -161,7 +190,7 @@ class VerifyOTPView(APIView):
         otp = serializer.validated_data["otp"]
 
         try:
-            user = UserAccount.objects.get(email=email)
+            user = UserAccount.objects.get_by_email(email)
         except UserAccount.DoesNotExist:
             return Response(
                 {"error": "User with this email does not exist."},
@@ -209,11 +238,41 @@ class VerifyOTPView(APIView):
         )
 
 
+def profile_picture_url_window(user):
+    """
+    Start of the window the profile picture URLs were signed in (see
+    ``CachedURLS3Storage``). The payload embeds them, so it changes with the
+    window even when the user doesn't, and a 304 must not outlive the URLs.
+    """
+    if not user.profile_picture:
+        return None
+    url_window_start = getattr(user.profile_picture.storage, "url_window_start", None)
+    return url_window_start() if url_window_start else None
+
+
+def user_info_etag(view, request):
+    return updated_at_etag(
+        request.user,
+        view.serializer_class.__name__,
+        profile_picture_url_window(request.user),
+    )
+
+
+def user_info_last_modified(view, request):
+    window = profile_picture_url_window(request.user)
+    if window is None:
+        return request.user.updated_at
+    return max(request.user.updated_at, datetime.fromtimestamp(window, UTC))
+
+
 class UserInfoView(APIView):
     """View for retrieving authenticated user information"""
 
-    serializer_class = UserAccountSerializer
+    serializer_class = UserProfileSerializer
 
+    @conditional_get(
+        etag_func=user_info_etag, last_modified_func=user_info_last_modified
+    )
     def get(self, request):
         """Get authenticated user information"""
         serializer = self.serializer_class(request.user)
@@ -236,17 +295,32 @@ class ResendOTPView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
 
-        # Generate new OTP
-        otp = str(random.randint(100000, 999999))
-        user.otp = otp
-        user.otp_expiry = timezone.now() + timedelta(
-            minutes=10
-        )  # OTP valid for 10 minutes
-        user.otp_sent_at = timezone.now()
-        user.save()
-
-        # Send OTP email asynchronously using Celery
-        send_otp_email.delay(user.email, otp)
+        now = timezone.now()
+        resend_window = timedelta(seconds=send_otp_email.idempotency_window)
+        with transaction.atomic():
+            if (
+                user.otp
+                and user.otp_sent_at
+                and user.otp_expiry
+                and now - user.otp_sent_at < resend_window
+                and user.otp_expiry > now
+            ):
+                # Repeated clicks resend the same OTP, so the duplicate emails
+                # are collapsed by send_otp_email instead of each one carrying
+                # a different code
+                otp = user.otp
+            else:
+                # Generate new OTP
+                otp = str(random.randint(100000, 999999))
+                user.otp = otp
+                # OTP valid for 10 minutes
+                user.otp_expiry = now + timedelta(minutes=10)
+                user.otp_sent_at = now
+                user.save()
+
+            # Send OTP email asynchronously using Celery, once the new OTP is
+            # committed (see common.outbox)
+            dispatch(send_otp_email, args=(user.email, otp), ordering_key=user.email)
         return Response(
             {
                 "message": "OTP resent successfully",
@@ -254,3 +328,71 @@ class ResendOTPView(APIView):
             },
             status=status.HTTP_200_OK,
         )
+
+
+class ProfilePictureUploadView(APIView):
+    """
+    Issue a presigned POST for uploading a profile picture straight to S3.
+
+    The client sends the returned ``fields`` plus the file as a multipart
+    POST to ``url``, then calls the confirm endpoint with ``token``. The file
+    never passes through the API servers.
+    """
+
+    serializer_class = ProfilePictureUploadSerializer
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        content_type = serializer.validated_data["content_type"]
+        size = serializer.validated_data["size"]
+        extension, _ = PROFILE_PICTURE_CONTENT_TYPES[content_type]
+
+        key = dynamic_upload_path(request.user, f"{uuid.uuid4().hex}.{extension}")
+        storage = UserAccount._meta.get_field("profile_picture").storage
+        # S3 rejects a file larger than declared
+        target = storage.presigned_post(
+            key, content_type, size, expire=settings.PROFILE_PICTURE_UPLOAD_EXPIRE
+        )
+        token = signing.dumps(
+            {
+                "user": str(request.user.pk),
+                "key": key,
+                "content_type": content_type,
+                "size": size,
+            },
+            salt=PROFILE_PICTURE_UPLOAD_SALT,
+        )
+        return Response(
+            {
+                "message": "Upload target created successfully",
+                "url": target["url"],
+                "fields": target["fields"],
+                "token": token,
+                "expiresIn": settings.PROFILE_PICTURE_UPLOAD_EXPIRE,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ProfilePictureConfirmView(APIView):
+    """Attach a profile picture uploaded through ``ProfilePictureUploadView``."""
+
+    serializer_class = ProfilePictureConfirmSerializer
+
+    def post(self, request):
+        serializer = self.serializer_class(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        user = request.user
+        user.profile_picture.name = serializer.validated_data["key"]
+        user.save()
+        return Response(
+            {
+                "message": "Profile picture updated successfully",
+                "user": UserProfileSerializer(user).data,
+            },
+            status=status.HTTP_200_OK,
+        )